@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Benchmark do motor da Máquina de Turing
+
+Mede parse_spec, reset, step, run, window_cells e to_dict/from_dict em todos os
+exemplos de core/examples.py com entradas de tamanho crescente, além de
+máquinas busy beaver conhecidas. O relatório sai em JSON e pode ser comparado
+com um baseline salvo:
+
+    python benchmark.py --json resultado.json
+    python benchmark.py --save-baseline
+    python benchmark.py --sizes 10 1000 100000 1000000 --full
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from core.examples import EXAMPLES
+from core.turing_machine import TuringMachine, parse_spec
+
+DEFAULT_SIZES = (10, 1000, 100000)
+DEFAULT_MAX_STEPS = 2_000_000
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+# Variação relativa de passos/s considerada regressão
+REGRESSION_THRESHOLD = 0.10
+# Abaixo deste tempo de run() (o menor entre as repetições) a variação é ruído
+# de relógio: o caso só conta como regressão se o atual ou o baseline passar dele
+MIN_RUNTIME_S = 0.005
+
+
+def _busy_beaver(rules: str) -> str:
+    states = sorted(set(r[0] for r in rules.split()) | {'H'})
+    lines = ["states: " + ','.join(states), "blank: 0", "start: A", "accept: H", "reject: R",
+             "transitions:"]
+    for rule in rules.split():
+        # Formato compacto: A0:1RB -> estado, leitura, escrita, movimento, novo estado
+        state, read, write, move, new_state = rule[0], rule[1], rule[3], rule[4], rule[5]
+        lines.append(f"{state},{read} -> {new_state},{write},{move}")
+    return '\n'.join(lines)
+
+
+# Campeões conhecidos de 2 símbolos: (especificação, movimentos até a parada, 1s na fita)
+BUSY_BEAVERS = {
+    "BB(2)": (_busy_beaver("A0:1RB A1:1LB B0:1LA B1:1RH"), 6, 4),
+    "BB(3)": (_busy_beaver("A0:1RB A1:1RH B0:1LB B1:0RC C0:1LC C1:1LA"), 21, 5),
+    "BB(4)": (_busy_beaver("A0:1RB A1:1LB B0:1LA B1:0LC C0:1RH C1:1LD D0:1RD D1:0RA"), 107, 13),
+    "BB(5)": (_busy_beaver("A0:1RB A1:1LC B0:1RC B1:1RB C0:1RD C1:0LE D0:1LA D1:1LD "
+                           "E0:1RH E1:0LA"), 47_176_870, 4098),
+}
+
+
+def make_input(name: str, n: int) -> str:
+    """Entrada de `n` símbolos que exercita o pior caso de cada exemplo"""
+    number = name.split('.', 1)[0]
+    half = n // 2
+    if number == '2':        # palíndromo
+        return ('01' * n)[:half] + ('01' * n)[:n - half][::-1]
+    if number == '5':        # 0^n1^n
+        return '0' * half + '1' * (n - half)
+    if number == '6':        # 0*1*
+        return '0' * half + '1' * (n - half)
+    if number == '7':        # soma unária
+        return '1' * half + '+' + '1' * max(0, n - half - 1)
+    if number == '10':       # 1*0*1*
+        third = n // 3
+        return '1' * third + '0' * third + '1' * (n - 2 * third)
+    return ('0110' * (n // 4 + 1))[:n]
+
+
+def _timed(fn, repeat: int):
+    """Menor tempo de `repeat` execuções de fn() e o último resultado"""
+    best = float('inf')
+    value = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, value
+
+
+def _peak_memory(fn) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _rate(count: int, seconds: float) -> float:
+    return count / seconds if seconds > 0 else 0.0
+
+
+def bench_machine(spec: str, input_string: str, max_steps: int, step_budget: int, repeat: int):
+    """Mede as operações da API em uma máquina e entrada"""
+    tm, err = parse_spec(spec)
+    if err:
+        raise ValueError(err)
+    n = len(input_string)
+    entry = {'input_size': n}
+
+    seconds, _ = _timed(lambda: tm.reset(input_string), repeat)
+    entry['reset_s'] = seconds
+
+    def run():
+        tm.reset(input_string)
+        return tm.run(max_steps)
+
+    tm.compile()  # fora da medição
+    seconds, steps = _timed(run, repeat)
+    entry.update(steps=steps, result=tm.result, run_s=seconds,
+                 run_steps_per_s=_rate(steps, seconds))
+    entry['peak_bytes'] = _peak_memory(run)
+    entry['ones'] = sum(1 for sym in tm.tape.values() if sym == '1')
+
+    final = tm
+    seconds, _ = _timed(lambda: final.window_cells(25), repeat)
+    entry['window_cells_s'] = seconds
+    seconds, data = _timed(final.to_dict, repeat)
+    entry['to_dict_s'] = seconds
+    seconds, _ = _timed(lambda: TuringMachine.from_dict(data), repeat)
+    entry['from_dict_s'] = seconds
+
+    def step():
+        tm.reset(input_string)
+        count = 0
+        while not tm.halted and count < step_budget:
+            tm.step()
+            count += 1
+        return count
+
+    seconds, count = _timed(step, repeat)
+    entry.update(step_count=count, step_s=seconds, step_steps_per_s=_rate(count, seconds))
+    return entry
+
+
+def run_suite(sizes=DEFAULT_SIZES, max_steps: int = DEFAULT_MAX_STEPS, step_budget: int = 100_000,
+              repeat: int = 3, full: bool = False, log=None):
+    """Executa o benchmark completo e retorna o relatório como dicionário"""
+    def say(msg):
+        if log:
+            print(msg, file=log, flush=True)
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'sizes': list(sizes),
+        'max_steps': max_steps,
+        'parse_spec': {},
+        'examples': {},
+        'busy_beavers': {},
+    }
+
+    for name, spec in EXAMPLES.items():
+        seconds, _ = _timed(lambda: parse_spec(spec), max(repeat, 20))
+        report['parse_spec'][name] = seconds
+
+    for name, spec in EXAMPLES.items():
+        curve = []
+        for n in sizes:
+            entry = bench_machine(spec, make_input(name, n), max_steps, step_budget, repeat)
+            curve.append(entry)
+            say(f"{name[:40]:<40} n={n:<8} {entry['steps']:>10} passos "
+                f"{entry['run_steps_per_s']:>14,.0f} passos/s  {entry['result']}")
+        report['examples'][name] = curve
+
+    for name, (spec, shifts, ones) in BUSY_BEAVERS.items():
+        budget = shifts + 1 if full else min(shifts + 1, max_steps)
+        entry = bench_machine(spec, "", budget, min(step_budget, budget), 1 if shifts > 1000 else repeat)
+        entry['expected_steps'] = shifts + 1
+        entry['expected_ones'] = ones
+        report['busy_beavers'][name] = entry
+        say(f"{name:<40} {entry['steps']:>10} passos "
+            f"{entry['run_steps_per_s']:>14,.0f} passos/s  {entry['result']}")
+    return report
+
+
+def _rates(report):
+    """`(passos/s, segundos)` de run() por caso, indexados por nome legível"""
+    rates = {}
+    for name, curve in report.get('examples', {}).items():
+        for entry in curve:
+            rates[f"{name} n={entry['input_size']}"] = (entry['run_steps_per_s'], entry['run_s'])
+    for name, entry in report.get('busy_beavers', {}).items():
+        rates[name] = (entry['run_steps_per_s'], entry['run_s'])
+    return rates
+
+
+def compare(report, baseline, threshold: float = REGRESSION_THRESHOLD,
+            min_runtime: float = MIN_RUNTIME_S):
+    """Compara passos/s com o baseline: `{caso: razão}` e a lista de regressões.
+
+    Só é regressão o caso em que o mais lento dos dois tempos chega a
+    `min_runtime`; abaixo disso a razão é informada, mas não marcada.
+    """
+    current, previous = _rates(report), _rates(baseline)
+    ratios = {}
+    regressions = []
+    for key, (rate, seconds) in current.items():
+        old, old_seconds = previous.get(key, (0, 0))
+        if not old or not rate:
+            continue
+        ratios[key] = rate / old
+        if ratios[key] < 1 - threshold and max(seconds, old_seconds) >= min_runtime:
+            regressions.append(key)
+    return ratios, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark do motor da Máquina de Turing")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help="tamanhos das entradas geradas")
+    parser.add_argument('--max-steps', type=int, default=DEFAULT_MAX_STEPS,
+                        help="limite de passos de run() por caso")
+    parser.add_argument('--repeat', type=int, default=3, help="repetições (vale o menor tempo)")
+    parser.add_argument('--full', action='store_true',
+                        help="executa os busy beavers até a parada, ignorando --max-steps")
+    parser.add_argument('--min-runtime', type=float, default=MIN_RUNTIME_S,
+                        help="segundos de run() abaixo dos quais um caso não conta como regressão")
+    parser.add_argument('--json', help="arquivo onde salvar o relatório JSON")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="relatório de referência")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="grava este relatório como novo baseline")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.sizes, args.max_steps, repeat=args.repeat, full=args.full,
+                       log=sys.stderr)
+
+    status = 0
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            ratios, regressions = compare(report, json.load(f), min_runtime=args.min_runtime)
+        report['baseline'] = {'path': args.baseline, 'ratios': ratios, 'regressions': regressions}
+        print(f"\nComparação com {args.baseline}:", file=sys.stderr)
+        for key, ratio in ratios.items():
+            flag = "  ⚠️ regressão" if key in regressions else ""
+            print(f"  {key[:60]:<60} {ratio:6.2f}x{flag}", file=sys.stderr)
+        if regressions:
+            status = 1
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+        print(f"Baseline salvo em {args.baseline}", file=sys.stderr)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    elif not args.save_baseline:
+        print(text)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+# Análise estática e poda da especificação
+from dataclasses import dataclass, field
+from typing import Dict, List, Set, Tuple
+
+from .multitape import MultiTapeMachine
+
+
+def _cells(symbols) -> Tuple[str, ...]:
+    # Uma fita lê um símbolo; várias fitas leem uma tupla
+    return (symbols,) if isinstance(symbols, str) else tuple(symbols)
+
+
+@dataclass
+class AnalysisReport:
+    """Resultado de analyze(): grafo de estados e o que pode ser descartado"""
+    reachable: Set[str]
+    # Estados declarados ou usados que o estado inicial nunca alcança
+    unreachable: Set[str]
+    # Estados de aceitação/rejeição (não entram nos avisos de inalcançáveis)
+    final: Set[str]
+    # Estados usados nas transições ou no cabeçalho mas ausentes de `states`
+    undeclared: Set[str]
+    # Transições que nunca disparam: saem de estados de parada ou inalcançáveis
+    dead_transitions: List[Tuple[str, object]]
+    # Estados (não finais) dos quais toda execução para em poucos passos
+    halting_only: Set[str]
+    # Símbolos que podem aparecer na fita (branco, leituras e escritas vivas)
+    symbols: Set[str]
+    # Pares (estado, símbolo) alcançáveis sem transição: param em NO_TRANSITION
+    no_transition: Set[Tuple[str, str]] = field(default_factory=set)
+    # Sucessores de cada estado alcançável pelas transições vivas
+    graph: Dict[str, Set[str]] = field(default_factory=dict, repr=False)
+
+    def warnings(self) -> List[str]:
+        """Avisos legíveis para o autor da especificação"""
+        out = []
+        if self.undeclared:
+            out.append(f"Estados não declarados em 'states': {', '.join(sorted(self.undeclared))}")
+        unreachable = self.unreachable - self.final
+        if unreachable:
+            out.append(f"Estados inalcançáveis: {', '.join(sorted(unreachable))}")
+        if self.dead_transitions:
+            out.append(f"{len(self.dead_transitions)} transição(ões) nunca disparam "
+                       f"(saem de estados de parada ou inalcançáveis)")
+        return out
+
+    def to_dict(self):
+        return {
+            'reachable': sorted(self.reachable),
+            'unreachable': sorted(self.unreachable),
+            'undeclared': sorted(self.undeclared),
+            'dead_transitions': [[s, a] for s, a in self.dead_transitions],
+            'halting_only': sorted(self.halting_only),
+            'symbols': sorted(self.symbols),
+            'no_transition': sorted([s, a] for s, a in self.no_transition),
+            'warnings': self.warnings(),
+        }
+
+
+def analyze(tm) -> AnalysisReport:
+    """Analisa uma máquina determinística (uma ou várias fitas) a partir de `start_state`"""
+    final = set(tm.accept_states) | set(tm.reject_states)
+    outgoing: Dict[str, List[Tuple[object, tuple]]] = {}
+    for (s, reads), transition in tm.transitions.items():
+        outgoing.setdefault(s, []).append((reads, transition))
+
+    # Busca a partir do estado inicial; estados finais não disparam transições
+    reachable = {tm.start_state}
+    frontier = [tm.start_state]
+    graph: Dict[str, Set[str]] = {}
+    while frontier:
+        s = frontier.pop()
+        if s in final:
+            continue
+        succ = graph.setdefault(s, set())
+        for _, (ns, _, _) in outgoing.get(s, ()):
+            succ.add(ns)
+            if ns not in reachable:
+                reachable.add(ns)
+                frontier.append(ns)
+
+    used = {tm.start_state} | final
+    for (s, _), (ns, _, _) in tm.transitions.items():
+        used.update((s, ns))
+    dead = [key for key in tm.transitions if key[0] in final or key[0] not in reachable]
+    dead_keys = set(dead)
+
+    symbols = {tm.blank}
+    for key, (_, writes, _) in tm.transitions.items():
+        if key not in dead_keys:
+            symbols.update(_cells(key[1]))
+            symbols.update(_cells(writes))
+
+    # Estados que não alcançam ciclo: remove repetidamente os sem sucessor vivo
+    pending = {s: {ns for ns in succ if ns not in final} for s, succ in graph.items()}
+    halting_only: Set[str] = set()
+    changed = True
+    while changed:
+        changed = False
+        for s, succ in pending.items():
+            if s not in halting_only and succ <= halting_only:
+                halting_only.add(s)
+                changed = True
+
+    no_transition: Set[Tuple[str, str]] = set()
+    if getattr(tm, 'n_tapes', 1) == 1:
+        for s in graph:
+            for a in symbols:
+                if (s, a) not in tm.transitions:
+                    no_transition.add((s, a))
+
+    return AnalysisReport(
+        reachable=reachable,
+        unreachable=(set(tm.states) | used) - reachable,
+        final=final,
+        undeclared=used - set(tm.states),
+        dead_transitions=dead,
+        halting_only=halting_only,
+        symbols=symbols,
+        no_transition=no_transition,
+        graph=graph,
+    )
+
+
+def prune(tm, report: AnalysisReport = None):
+    """Nova máquina só com estados alcançáveis e transições vivas.
+
+    A execução a partir de reset() é idêntica (mesmos resultados e passos);
+    estados usados mas não declarados passam a constar em `states`.
+    """
+    report = report or analyze(tm)
+    dead = set(report.dead_transitions)
+    transitions = {k: v for k, v in tm.transitions.items() if k not in dead}
+    input_symbols = set()
+    for _, reads in transitions:
+        input_symbols.update(a for a in _cells(reads) if a != tm.blank)
+    kwargs = dict(
+        states=set(report.reachable),
+        input_symbols=input_symbols or set(tm.input_symbols),
+        tape_symbols=set(report.symbols),
+        blank=tm.blank,
+        transitions=transitions,
+        start_state=tm.start_state,
+        accept_states=set(tm.accept_states) & report.reachable,
+        reject_states=set(tm.reject_states) & report.reachable,
+    )
+    if isinstance(tm, MultiTapeMachine):
+        kwargs['n_tapes'] = tm.n_tapes
+    return type(tm)(**kwargs)
+
+
+@dataclass
+class MinimizeReport:
+    """Resultado de minimize(): tamanhos antes/depois e a classe de cada estado"""
+    states_before: int
+    states_after: int
+    transitions_before: int
+    transitions_after: int
+    # Estado original -> representante na máquina minimizada (só alcançáveis)
+    merged: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def states_removed(self) -> int:
+        return self.states_before - self.states_after
+
+    @property
+    def transitions_removed(self) -> int:
+        return self.transitions_before - self.transitions_after
+
+    def to_dict(self):
+        return {
+            'states_before': self.states_before,
+            'states_after': self.states_after,
+            'states_removed': self.states_removed,
+            'transitions_before': self.transitions_before,
+            'transitions_after': self.transitions_after,
+            'transitions_removed': self.transitions_removed,
+            'merged': {s: r for s, r in self.merged.items() if s != r},
+        }
+
+
+def _all_states(tm) -> Set[str]:
+    states = set(tm.states) | set(tm.accept_states) | set(tm.reject_states)
+    states.add(tm.start_state)
+    for (s, _), (ns, _, _) in tm.transitions.items():
+        states.update((s, ns))
+    return states
+
+
+def minimize(tm):
+    """Funde estados equivalentes por refinamento de partições.
+
+    Primeiro aplica prune(); depois parte de {aceitação}, {rejeição} e
+    {demais estados} e separa os blocos cujos estados diferem, para algum
+    símbolo, na escrita, no movimento ou no bloco do próximo estado (ou na
+    ausência de transição). Aceitação e rejeição nunca se misturam, e run()
+    produz o mesmo resultado, passos, cabeça e fita. Retorna `(máquina,
+    MinimizeReport)`; o representante de cada bloco é o estado inicial ou o
+    menor nome.
+    """
+    pruned = prune(tm)
+    accept = set(pruned.accept_states)
+    # Um estado de aceitação e rejeição ao mesmo tempo aceita (como em compile_machine)
+    reject = set(pruned.reject_states) - accept
+    states = sorted(_all_states(pruned))
+    reads = sorted({a for _, a in pruned.transitions}, key=repr)
+
+    block = {s: 0 if s in accept else 1 if s in reject else 2 for s in states}
+    n_blocks = len(set(block.values()))
+    while True:
+        signatures: Dict[tuple, int] = {}
+        refined = {}
+        for s in states:
+            if s in accept or s in reject:
+                row = ()
+            else:
+                row = []
+                for a in reads:
+                    t = pruned.transitions.get((s, a))
+                    row.append(None if t is None else (t[1], t[2], block[t[0]]))
+                row = tuple(row)
+            refined[s] = signatures.setdefault((block[s], row), len(signatures))
+        block = refined
+        if len(signatures) == n_blocks:
+            break
+        n_blocks = len(signatures)
+
+    members: Dict[int, List[str]] = {}
+    for s in states:
+        members.setdefault(block[s], []).append(s)
+    rep = {}
+    for group in members.values():
+        head = pruned.start_state if pruned.start_state in group else group[0]
+        for s in group:
+            rep[s] = head
+
+    transitions = {}
+    for (s, a), (ns, w, mv) in pruned.transitions.items():
+        if rep[s] == s:
+            transitions[(s, a)] = (rep[ns], w, mv)
+    kwargs = dict(
+        states={rep[s] for s in pruned.states},
+        input_symbols=set(pruned.input_symbols),
+        tape_symbols=set(pruned.tape_symbols),
+        blank=pruned.blank,
+        transitions=transitions,
+        start_state=pruned.start_state,
+        accept_states={rep[s] for s in accept},
+        reject_states={rep[s] for s in reject},
+    )
+    if isinstance(tm, MultiTapeMachine):
+        kwargs['n_tapes'] = tm.n_tapes
+    minimized = type(tm)(**kwargs)
+    report = MinimizeReport(
+        states_before=len(_all_states(tm)),
+        states_after=len(_all_states(minimized)),
+        transitions_before=len(tm.transitions),
+        transitions_after=len(transitions),
+        merged=rep,
+    )
+    return minimized, report
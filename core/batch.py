@@ -0,0 +1,149 @@
+# Execução em lote de uma especificação sobre muitas entradas
+import copy
+import json
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Union
+
+from .result_cache import ResultCache, machine_digest, result_key
+from .turing_machine import TuringMachine, parse_spec
+
+
+class BatchRecord(NamedTuple):
+    input: str
+    result: str
+    steps: int
+    tape_output: str
+
+
+# Máquina compilada recebida por cada processo do pool
+_worker_tm: Optional[TuringMachine] = None
+
+# Tipos de opção de run() que entram na chave do cache
+_SCALAR_OPTIONS = (bool, int, float, str, type(None))
+
+
+def _tape_output(tm: TuringMachine) -> str:
+    # Da primeira à última célula não branca, com os brancos internos
+    return tm.tape_string()
+
+
+def _options_key(run_options: dict) -> Optional[str]:
+    # Forma canônica das opções; None se alguma não for escalar (objetos não têm chave estável)
+    if not all(isinstance(v, _SCALAR_OPTIONS) for v in run_options.values()):
+        return None
+    return json.dumps(sorted(run_options.items()), separators=(',', ':'))
+
+
+def _init_worker(tm: TuringMachine) -> None:
+    global _worker_tm
+    _worker_tm = tm
+
+
+def _run_chunk(inputs: List[str], max_steps: int, run_options: dict,
+               tm: Optional[TuringMachine] = None) -> List[BatchRecord]:
+    tm = tm or _worker_tm
+    records = []
+    for input_string in inputs:
+        tm.reset(input_string)
+        steps = tm.run(max_steps, **run_options)
+        records.append(BatchRecord(input_string, tm.result, steps, _tape_output(tm)))
+    return records
+
+
+def _chunks(inputs: Iterable[str], size: int) -> Iterator[List[str]]:
+    it = iter(inputs)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_batch(spec_or_machine: Union[str, TuringMachine], inputs: Iterable[str],
+              max_steps: int = 1000, workers: Optional[int] = None,
+              chunk_size: int = 256, cache: Optional[ResultCache] = None,
+              **run_options) -> Iterator[BatchRecord]:
+    """Executa a mesma máquina sobre cada entrada de `inputs`.
+
+    A máquina é compilada uma vez e enviada a cada processo do pool na
+    inicialização; as entradas seguem em blocos de `chunk_size`. Os registros
+    `(input, result, steps, tape_output)` são produzidos conforme os blocos
+    terminam, portanto fora da ordem original; `tape_output` é tape_string(),
+    com os brancos internos. Com `workers=1` tudo roda no processo atual.
+    Opções extras (`rle`, `detect_loops`) vão para run().
+
+    Com `cache` cada entrada é procurada no ResultCache antes de simular;
+    só as faltas vão para os processos, e seus resultados são gravados. A
+    chave usa só opções escalares; com alguma opção objeto (`macro`, `trace`)
+    o cache é ignorado.
+    """
+    if isinstance(spec_or_machine, str):
+        tm, err = parse_spec(spec_or_machine)
+        if err:
+            raise ValueError(err)
+    else:
+        tm = copy.deepcopy(spec_or_machine)
+    tm.reset('')
+    tm.compile()
+    options = _options_key(run_options)
+    if cache is None or options is None:
+        yield from _simulate(tm, inputs, max_steps, workers, chunk_size, run_options)
+        return
+
+    digest = machine_digest(tm)
+    hits: 'deque[BatchRecord]' = deque()
+
+    def misses() -> Iterator[str]:
+        # Os acertos ficam em `hits` e saem entre os registros simulados
+        for chunk in _chunks(inputs, chunk_size):
+            keys = [result_key(digest, s, max_steps, options) for s in chunk]
+            found = cache.get_many(keys)
+            for s, key in zip(chunk, keys):
+                entry = found.get(key)
+                if entry is None:
+                    yield s
+                else:
+                    hits.append(BatchRecord(s, *entry))
+
+    pending = []
+    try:
+        for record in _simulate(tm, misses(), max_steps, workers, chunk_size, run_options):
+            while hits:
+                yield hits.popleft()
+            pending.append((result_key(digest, record.input, max_steps, options), record[1:]))
+            if len(pending) >= chunk_size:
+                cache.put_many(pending)
+                pending = []
+            yield record
+        while hits:
+            yield hits.popleft()
+    finally:
+        cache.put_many(pending)
+
+
+def _simulate(tm: TuringMachine, inputs: Iterable[str], max_steps: int,
+              workers: Optional[int], chunk_size: int,
+              run_options: dict) -> Iterator[BatchRecord]:
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for chunk in _chunks(inputs, chunk_size):
+            yield from _run_chunk(chunk, max_steps, run_options, tm)
+        return
+
+    chunks = _chunks(inputs, chunk_size)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(tm,)) as pool:
+        pending = set()
+        # Mantém no máximo dois blocos por processo em andamento
+        for chunk in islice(chunks, 2 * workers):
+            pending.add(pool.submit(_run_chunk, chunk, max_steps, run_options))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    pending.add(pool.submit(_run_chunk, chunk, max_steps, run_options))
@@ -0,0 +1,102 @@
+# Detecção exata de ciclos de configuração (algoritmo de Brent)
+from typing import Iterator, Optional, Tuple
+
+from .engine import HALT_RESULTS, CompiledMachine
+
+_MASK = (1 << 64) - 1
+
+
+def _cell(index: int, code: int) -> int:
+    return hash((index, code)) if code else 0
+
+
+def tape_hash(tape) -> int:
+    """Hash da fita somando a contribuição de cada célula não branca"""
+    start, data = tape.span()
+    h = 0
+    for i, c in enumerate(data):
+        if c:
+            h += hash((start + i, c))
+    return h & _MASK
+
+
+def tape_key(tape) -> Tuple[int, bytes]:
+    """Conteúdo normalizado da fita, sem brancos nas pontas"""
+    return tape.span(trim=True)
+
+
+def _configs(cm: CompiledMachine, tape, head: int, base: int, h: int) -> Iterator[Tuple[int, int, int]]:
+    """Gera `(base, cabeça, hash)` após cada passo; para se a máquina parar"""
+    table = cm.table
+    while True:
+        sym = tape.read_code(head)
+        nb, w, mv = table[base + sym]
+        if nb < 0:
+            return
+        if w != sym:
+            tape.write_code(head, w)
+            h = (h + _cell(head, w) - _cell(head, sym)) & _MASK
+        head += mv
+        base = nb
+        yield base, head, h
+
+
+def _cycle_start(cm: CompiledMachine, tape, head: int, base: int, period: int) -> int:
+    """Menor passo `mu` com configuração(mu) == configuração(mu + period)"""
+    lead_tape = tape.copy()
+    h = tape_hash(tape)
+    lead = _configs(cm, lead_tape, head, base, h)
+    trail = _configs(cm, tape, head, base, h)
+    a = (base, head, h)
+    for _ in range(period):
+        a = next(lead)
+    b = (base, head, h)
+    mu = 0
+    while a != b or tape_key(lead_tape) != tape_key(tape):
+        a, b = next(lead), next(trail)
+        mu += 1
+    return mu
+
+
+def execute_detect(cm: CompiledMachine, tape, head: int, state: int,
+                   max_steps: int) -> Tuple[int, int, int, Optional[str], Optional[int], Optional[int]]:
+    """Executa como `execute`, parando com 'LOOP' ao repetir uma configuração.
+
+    Um checkpoint (estado, cabeça, hash da fita) é salvo em passos de potência
+    de dois; o hash é atualizado a cada escrita. Quando a configuração atual
+    coincide com o checkpoint o período é exato e o início do ciclo é obtido
+    reexecutando a partir da configuração inicial. Retorna `(passos, estado,
+    cabeça, resultado, início do ciclo, período)`.
+    """
+    table = cm.table
+    n = cm.n_symbols
+    base = state * n
+    origin = (tape.copy(), head, base)
+    h = tape_hash(tape)
+    cp = (base, head, h)
+    cp_key = tape_key(tape)
+    power = lam = 1
+    steps = 0
+    result = None
+    while steps < max_steps:
+        sym = tape.read_code(head)
+        nb, w, mv = table[base + sym]
+        steps += 1
+        if nb < 0:
+            result = HALT_RESULTS[nb]
+            break
+        if w != sym:
+            tape.write_code(head, w)
+            h = (h + _cell(head, w) - _cell(head, sym)) & _MASK
+        head += mv
+        base = nb
+        if base == cp[0] and head == cp[1] and h == cp[2] and tape_key(tape) == cp_key:
+            start = _cycle_start(cm, *origin, lam) if steps > lam else 0
+            return steps, base // n, head, 'LOOP', start, lam
+        if lam == power:
+            cp = (base, head, h)
+            cp_key = tape_key(tape)
+            power *= 2
+            lam = 0
+        lam += 1
+    return steps, base // n, head, result, None, None
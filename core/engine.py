@@ -0,0 +1,151 @@
+# Motor compilado da Máquina de Turing
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Códigos de parada gravados na tabela no lugar do próximo estado
+HALT_ACCEPT = -1
+HALT_REJECT = -2
+HALT_NO_TRANSITION = -3
+
+HALT_RESULTS = {
+    HALT_ACCEPT: 'ACCEPT',
+    HALT_REJECT: 'REJECT',
+    HALT_NO_TRANSITION: 'NO_TRANSITION',
+}
+
+MOVES = {'L': -1, 'R': 1, 'N': 0}
+
+
+@dataclass
+class CompiledMachine:
+    """Tabela de transições com estados e símbolos internados como inteiros.
+
+    A linha do estado `q` ocupa as posições `q * n_symbols ... q * n_symbols +
+    n_symbols - 1` dos vetores planos `next_state`, `write` e `move`. Estados de
+    aceitação/rejeição e pares sem transição viram códigos de parada negativos
+    em `next_state`. O símbolo 0 é sempre o branco.
+    """
+    states: List[str]
+    symbols: List[str]
+    next_state: array
+    write: array
+    move: array
+    state_index: Dict[str, int] = field(default_factory=dict)
+    symbol_index: Dict[str, int] = field(default_factory=dict)
+    # Visão da tabela usada no laço quente: (base do próximo estado, escrita, movimento)
+    table: List[Tuple[int, int, int]] = field(default_factory=list, repr=False)
+
+    def __post_init__(self):
+        self.state_index = {s: i for i, s in enumerate(self.states)}
+        self.symbol_index = {s: i for i, s in enumerate(self.symbols)}
+        n = self.n_symbols
+        self.table = [
+            (ns * n if ns >= 0 else ns, w, m)
+            for ns, w, m in zip(self.next_state, self.write, self.move)
+        ]
+
+    @property
+    def n_states(self) -> int:
+        return len(self.states)
+
+    @property
+    def n_symbols(self) -> int:
+        return len(self.symbols)
+
+    def covers(self, states: Iterable[str], symbols: Iterable[str]) -> bool:
+        """Indica se a tabela já conhece todos os estados e símbolos dados"""
+        return (all(s in self.state_index for s in states)
+                and all(s in self.symbol_index for s in symbols))
+
+
+def compile_machine(tm, extra_states: Iterable[str] = (), extra_symbols: Iterable[str] = ()) -> CompiledMachine:
+    """Compila a máquina `tm` para uma `CompiledMachine`.
+
+    Os símbolos de `extra_symbols` ocupam os primeiros códigos, na ordem dada,
+    para que uma fita já codificada possa ser usada sem tradução.
+    """
+    state_set = set(tm.states) | set(tm.accept_states) | set(tm.reject_states)
+    state_set.add(tm.start_state)
+    state_set.update(extra_states)
+    symbols = [tm.blank]
+    for sym in extra_symbols:
+        if sym not in symbols:
+            symbols.append(sym)
+    symbol_set = set(tm.tape_symbols) | set(tm.input_symbols)
+    for (s, a), (ns, w, mv) in tm.transitions.items():
+        if mv not in MOVES:
+            raise ValueError(f"Movimento inválido: {mv}")
+        state_set.update((s, ns))
+        symbol_set.update((a, w))
+    state_set.discard(None)
+    symbol_set.difference_update(symbols)
+
+    states = sorted(state_set)
+    symbols += sorted(symbol_set)
+    s_idx = {s: i for i, s in enumerate(states)}
+    a_idx = {a: i for i, a in enumerate(symbols)}
+    n = len(symbols)
+
+    size = len(states) * n
+    next_state = array('i', [HALT_NO_TRANSITION]) * size
+    write = array('i', [0]) * size
+    move = array('i', [0]) * size
+
+    for (s, a), (ns, w, mv) in tm.transitions.items():
+        pos = s_idx[s] * n + a_idx[a]
+        next_state[pos] = s_idx[ns]
+        write[pos] = a_idx[w]
+        move[pos] = MOVES[mv]
+    # Estados de parada dominam qualquer transição declarada (aceitação primeiro)
+    for halt, group in ((HALT_REJECT, tm.reject_states), (HALT_ACCEPT, tm.accept_states)):
+        for s in group:
+            base = s_idx[s] * n
+            for pos in range(base, base + n):
+                next_state[pos] = halt
+                write[pos] = 0
+                move[pos] = 0
+
+    return CompiledMachine(states=states, symbols=symbols,
+                           next_state=next_state, write=write, move=move)
+
+
+def execute(cm: CompiledMachine, tape, head: int, state: int,
+            max_steps: int) -> Tuple[int, int, int, Optional[str]]:
+    """Executa até `max_steps` passos diretamente sobre os buffers de `tape`.
+
+    A fita deve estar codificada com a tabela de símbolos de `cm`. Retorna
+    `(passos, estado, cabeça, resultado)`; o resultado é `None` se a máquina
+    não parou dentro do limite.
+    """
+    table = cm.table
+    n = cm.n_symbols
+    base = state * n
+    right, left = tape.right, tape.left
+    rlen, llen = len(right), len(left)
+    steps = 0
+    result = None
+    # `for` sobre range evita comparar e incrementar o contador em bytecode a cada passo
+    for steps in range(1, max_steps + 1):
+        if head >= 0:
+            if head >= rlen:
+                right.extend(bytes(max(head + 1, 2 * rlen) - rlen))
+                rlen = len(right)
+            nb, w, mv = table[base + right[head]]
+            if nb < 0:
+                result = HALT_RESULTS[nb]
+                break
+            right[head] = w
+        else:
+            i = ~head
+            if i >= llen:
+                left.extend(bytes(max(i + 1, 2 * llen) - llen))
+                llen = len(left)
+            nb, w, mv = table[base + left[i]]
+            if nb < 0:
+                result = HALT_RESULTS[nb]
+                break
+            left[i] = w
+        head += mv
+        base = nb
+    return steps, base // n, head, result
@@ -0,0 +1,165 @@
+# Enumeração limitada da linguagem aceita, com reaproveitamento de prefixos
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import product
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from .engine import HALT_RESULTS, CompiledMachine, compile_machine, execute
+from .tape import Tape
+from .turing_machine import TuringMachine, parse_spec
+
+# Passos tentados no processo atual antes de enviar uma entrada aos workers
+LOCAL_BUDGET = 256
+
+# (entrada, estado, cabeça, início da fita, códigos, passos já executados)
+_Task = Tuple[str, int, int, int, bytes, int]
+
+_worker_cm: Optional[CompiledMachine] = None
+
+
+@dataclass
+class LanguageResult:
+    """Resultado de enumerate_language(): `(resultado, passos)` por entrada"""
+    records: Dict[str, Tuple[str, int]]
+    # Configurações da trie expandidas (um prefixo cada)
+    nodes: int = 0
+    # Entradas decididas pela subárvore de um prefixo, sem execução própria
+    shared: int = 0
+    # Entradas cuja execução foi para os workers
+    tasks: int = 0
+    alphabet: List[str] = field(default_factory=list)
+
+    def _select(self, results) -> List[str]:
+        return sorted((s for s, (r, _) in self.records.items() if r in results),
+                      key=lambda s: (len(s), s))
+
+    @property
+    def accepted(self) -> List[str]:
+        return self._select(('ACCEPT',))
+
+    @property
+    def rejected(self) -> List[str]:
+        return self._select(('REJECT', 'NO_TRANSITION'))
+
+    @property
+    def undecided(self) -> List[str]:
+        return self._select(('MAX_STEPS',))
+
+
+def _advance(cm: CompiledMachine, tape: Tape, base: int, head: int, steps: int,
+             stop: Optional[int], max_steps: int):
+    """Executa até a cabeça chegar em `stop`, a máquina parar ou o limite acabar.
+
+    Retorna `(base, cabeça, passos, resultado)`; o resultado é None quando a
+    cabeça chegou em `stop`.
+    """
+    table = cm.table
+    while steps < max_steps:
+        if head == stop:
+            return base, head, steps, None
+        nb, w, mv = table[base + tape.read_code(head)]
+        steps += 1
+        if nb < 0:
+            return base, head, steps, HALT_RESULTS[nb]
+        tape.write_code(head, w)
+        head += mv
+        base = nb
+    return base, head, steps, 'MAX_STEPS'
+
+
+def _init_worker(cm: CompiledMachine) -> None:
+    global _worker_cm
+    _worker_cm = cm
+
+
+def _run_tasks(tasks: List[_Task], max_steps: int,
+               cm: Optional[CompiledMachine] = None) -> List[Tuple[str, str, int]]:
+    cm = cm or _worker_cm
+    out = []
+    for s, state, head, start, data, steps in tasks:
+        tape = Tape(cm.symbols[0], symbols=cm.symbols[1:])
+        tape.load_span(start, data)
+        taken, _, _, result = execute(cm, tape, head, state, max_steps - steps)
+        out.append((s, result or 'MAX_STEPS', steps + taken))
+    return out
+
+
+def enumerate_language(spec_or_machine: Union[str, TuringMachine], max_length: int,
+                       max_steps: int = 1000, alphabet: Optional[Sequence[str]] = None,
+                       workers: Optional[int] = None, chunk_size: int = 256) -> LanguageResult:
+    """Executa a máquina sobre todas as palavras de `alphabet` com até `max_length` símbolos.
+
+    As palavras são percorridas como uma trie. A configuração de um prefixo
+    `p` (cabeça recém-chegada à célula `len(p)`) só depende de `p`, então é
+    calculada uma vez e continuada para cada símbolo seguinte. Se a máquina
+    parar (ou esgotar `max_steps`) antes de ler a célula seguinte, o resultado
+    vale para toda a subárvore, sem simular cada palavra. O final de cada
+    palavra (branco na célula `len(p)`) é continuado no processo atual por até
+    LOCAL_BUDGET passos; o que sobra é distribuído em blocos de `chunk_size`
+    entre `workers` processos (`None` usa todos os núcleos).
+
+    Resultados e passos são os mesmos de reset() seguido de run(max_steps).
+    O alfabeto padrão é `input_symbols` da máquina.
+    """
+    if isinstance(spec_or_machine, str):
+        tm, err = parse_spec(spec_or_machine)
+        if err:
+            raise ValueError(err)
+    else:
+        tm = spec_or_machine
+    alphabet = sorted(set(alphabet if alphabet is not None else tm.input_symbols) - {tm.blank})
+    cm = compile_machine(tm, extra_symbols=alphabet)
+    codes = [cm.symbol_index[a] for a in alphabet]
+    n = cm.n_symbols
+
+    records: Dict[str, Tuple[str, int]] = {}
+    out = LanguageResult(records, alphabet=alphabet)
+    tasks: List[_Task] = []
+
+    root = Tape(tm.blank, symbols=cm.symbols[1:])
+    stack = [('', root, cm.state_index[tm.start_state] * n, 0)]
+    while stack:
+        prefix, tape, base, steps = stack.pop()
+        out.nodes += 1
+        depth = len(prefix)
+
+        # A própria palavra: branco na célula `depth`
+        end = tape.copy()
+        budget = min(max_steps, steps + LOCAL_BUDGET)
+        nb, head, taken, result = _advance(cm, end, base, depth, steps, None, budget)
+        if result == 'MAX_STEPS' and taken < max_steps:
+            start, data = end.span()
+            tasks.append((prefix, nb // n, head, start, data, taken))
+        else:
+            records[prefix] = (result, taken)
+
+        if depth == max_length:
+            continue
+        for a, code in zip(alphabet, codes):
+            child = tape.copy()
+            child.write_code(depth, code)
+            nb, head, taken, result = _advance(cm, child, base, depth, steps, depth + 1, max_steps)
+            if result is None:
+                stack.append((prefix + a, child, nb, taken))
+                continue
+            # Parou sem ler além de `prefix + a`: a subárvore inteira tem o mesmo resultado
+            word = prefix + a
+            for length in range(max_length - depth):
+                for rest in product(alphabet, repeat=length):
+                    records[word + ''.join(rest)] = (result, taken)
+                    out.shared += 1
+
+    out.tasks = len(tasks)
+    chunks = [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(chunks) <= 1:
+        done = [_run_tasks(chunk, max_steps, cm) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(cm,)) as pool:
+            done = list(pool.map(_run_tasks, chunks, [max_steps] * len(chunks)))
+    for part in done:
+        for s, result, steps in part:
+            records[s] = (result, steps)
+    return out
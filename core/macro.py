@@ -0,0 +1,211 @@
+# Simulação em blocos (macro máquina) para execuções muito longas
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from .engine import HALT_RESULTS, CompiledMachine
+
+# Resultado de um trecho simulado dentro de um bloco:
+# (passos, estado, bloco, posição, resultado); posição -1 ou k indica saída
+_Run = Tuple[int, int, bytes, int, Optional[str]]
+
+
+def _simulate(cm: CompiledMachine, state: int, block: bytes, pos: int,
+              budget: Optional[int]) -> _Run:
+    """Executa dentro de um bloco até a cabeça sair, a máquina parar ou o limite acabar.
+
+    Com `budget=None` não há limite; um ciclo preso dentro do bloco retorna
+    resultado 'CYCLE' sem avançar. Com limite, o ciclo é saltado por módulo.
+    """
+    table = cm.table
+    n = cm.n_symbols
+    k = len(block)
+    cells = bytearray(block)
+    base = state * n
+    steps = 0
+    seen = {}
+    while budget is None or steps < budget:
+        config = (base, pos, bytes(cells))
+        first = seen.get(config)
+        if first is not None:
+            if budget is None:
+                return 0, state, block, -2, 'CYCLE'
+            period = steps - first
+            steps += (budget - steps) // period * period
+            seen.clear()
+            if steps >= budget:
+                break
+        else:
+            seen[config] = steps
+        sym = cells[pos]
+        nb, w, mv = table[base + sym]
+        steps += 1
+        if nb < 0:
+            return steps, base // n, bytes(cells), pos, HALT_RESULTS[nb]
+        cells[pos] = w
+        pos += mv
+        base = nb
+        if pos < 0 or pos >= k:
+            break
+    return steps, base // n, bytes(cells), pos, None
+
+
+class MacroSimulator:
+    """Executa run() em blocos de `block_size` células com memoização.
+
+    O memo guarda `(estado, bloco, posição de entrada) -> (passos, estado,
+    bloco novo, posição de saída, resultado)`; a entrada é 0 (vindo da
+    esquerda) ou `block_size - 1` (vindo da direita), exceto no bloco inicial.
+    Blocos iguais vizinhos ficam agrupados em corridas, e uma corrida
+    atravessada sem mudar de estado é saltada de uma vez. O memo é limitado a
+    `maxsize` entradas, com descarte LRU. Passos e fita finais são exatos.
+    """
+
+    def __init__(self, block_size: int = 8, maxsize: int = 100000):
+        if block_size < 1:
+            raise ValueError("block_size deve ser positivo")
+        self.block_size = block_size
+        self.maxsize = maxsize
+        self.compiled: Optional[CompiledMachine] = None
+        self._memo: 'OrderedDict[Tuple[int, bytes, int], _Run]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.jumps = 0
+
+    def _lookup(self, state: int, block: bytes, pos: int) -> _Run:
+        key = (state, block, pos)
+        entry = self._memo.get(key)
+        if entry is not None:
+            self._memo.move_to_end(key)
+            self.hits += 1
+            return entry
+        self.misses += 1
+        entry = _simulate(self.compiled, state, block, pos, None)
+        self._memo[key] = entry
+        if len(self._memo) > self.maxsize:
+            self._memo.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'block_size': self.block_size,
+            'size': len(self._memo),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / total if total else 0.0,
+            'run_jumps': self.jumps,
+        }
+
+    def clear(self) -> None:
+        self._memo.clear()
+        self.hits = self.misses = self.evictions = self.jumps = 0
+
+    def execute(self, cm: CompiledMachine, tape, head: int, state: int,
+                max_steps: int) -> Tuple[int, int, int, Optional[str]]:
+        """Executa como engine.execute(), simulando bloco a bloco"""
+        if self.compiled is not cm:
+            self._memo.clear()
+            self.compiled = cm
+        k = self.block_size
+        blank = bytes(k)
+
+        # Blocos alinhados em múltiplos de k; corridas [bloco, quantidade] nas
+        # pilhas, com o topo de cada pilha vizinho ao bloco da cabeça
+        start, data = tape.span(trim=True)
+        block_index = head // k
+        first = min(start // k, block_index) if data else block_index
+        data = bytes(start - first * k) + data if data else b''
+        data += bytes(-len(data) % k)
+        blocks = [data[i:i + k] for i in range(0, len(data), k)]
+        index = block_index - first
+        blocks += [blank] * (index + 1 - len(blocks))
+        left: List[list] = []
+        right: List[list] = []
+        for b in blocks[:index]:
+            _push(left, b, 1, blank)
+        for b in reversed(blocks[index + 1:]):
+            _push(right, b, 1, blank)
+        cur = blocks[index]
+        pos = head % k
+
+        steps = 0
+        result = None
+        while steps < max_steps:
+            remaining = max_steps - steps
+            taken, new_state, new_block, new_pos, res = self._lookup(state, cur, pos)
+            if res is not None or taken > remaining:
+                # Parada, ciclo interno ou limite: simula exatamente o restante
+                taken, state, cur, pos, result = _simulate(cm, state, cur, pos, remaining)
+                steps += taken
+                if result is not None or 0 <= pos < k:
+                    break
+            else:
+                steps += taken
+                state, cur, pos = new_state, new_block, new_pos
+            if pos >= k:
+                behind, ahead, entry, direction = left, right, 0, 1
+            else:
+                behind, ahead, entry, direction = right, left, k - 1, -1
+            _push(behind, cur, 1, blank)
+            block_index += direction
+            # Além da última corrida a fita é branca sem fim
+            run = ahead[-1] if ahead else [blank, max_steps]
+            n_blocks, out_block, jump_steps = self._jump(state, run, entry, direction,
+                                                        max_steps - steps)
+            if n_blocks:
+                _push(behind, out_block, n_blocks, blank)
+                block_index += direction * n_blocks
+                steps += jump_steps
+                if ahead and not run[1]:
+                    ahead.pop()
+            cur = _pop(ahead, blank)
+            pos = entry
+
+        # Reconstrói a fita densa
+        cells = bytearray()
+        for b, c in left:
+            cells += b * c
+        left_len = len(cells)
+        cells += cur
+        for b, c in reversed(right):
+            cells += b * c
+        tape.load_span(block_index * k - left_len, bytes(cells))
+        return steps, state, block_index * k + pos, result
+
+    def _jump(self, state: int, run: list, entry: int, direction: int, budget: int):
+        """Atravessa de uma vez os blocos de `run` cruzados sem mudar de estado.
+
+        Retorna `(blocos saltados, bloco resultante, passos)`.
+        """
+        block, count = run
+        taken, new_state, new_block, new_pos, res = self._lookup(state, block, entry)
+        crosses = new_pos >= self.block_size if direction > 0 else new_pos < 0
+        if res is not None or new_state != state or not crosses:
+            return 0, None, 0
+        n_blocks = min(count, budget // taken)
+        if n_blocks < 2:
+            return 0, None, 0
+        run[1] -= n_blocks
+        self.jumps += 1
+        return n_blocks, new_block, n_blocks * taken
+
+
+def _push(stack: List[list], block: bytes, count: int, blank: bytes) -> None:
+    if stack and stack[-1][0] == block:
+        stack[-1][1] += count
+    elif block != blank or stack:
+        stack.append([block, count])
+
+
+def _pop(stack: List[list], blank: bytes) -> bytes:
+    if not stack:
+        return blank
+    top = stack[-1]
+    top[1] -= 1
+    if top[1] <= 0:
+        stack.pop()
+    return top[0]
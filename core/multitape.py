@@ -0,0 +1,292 @@
+# Máquina de Turing com várias fitas
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .engine import HALT_ACCEPT, HALT_REJECT, HALT_RESULTS, MOVES
+from .tape import Tape
+
+Symbols = Tuple[str, ...]
+# (novo estado, símbolos escritos, movimentos), um símbolo/movimento por fita
+MultiTransition = Tuple[str, Symbols, Tuple[str, ...]]
+
+
+@dataclass
+class CompiledMultiTape:
+    """Tabela de transições de k fitas com estados e símbolos internados.
+
+    A chave de um par `(estado, leituras)` é `estado * n_symbols**k + c0 +
+    c1 * n_symbols + ...`, onde `ci` é o código lido na fita `i`. Como a
+    tabela completa cresce com `n_symbols**k`, só as transições declaradas
+    são guardadas, num dicionário. `halts[estado]` é o código de parada
+    (negativo) dos estados de aceitação/rejeição, ou 0.
+    """
+    n_tapes: int
+    states: List[str]
+    symbols: List[str]
+    table: Dict[int, Tuple[int, Tuple[int, ...], Tuple[int, ...]]]
+    halts: List[int]
+    state_index: Dict[str, int] = field(default_factory=dict)
+    symbol_index: Dict[str, int] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self.state_index = {s: i for i, s in enumerate(self.states)}
+        self.symbol_index = {s: i for i, s in enumerate(self.symbols)}
+
+    @property
+    def n_symbols(self) -> int:
+        return len(self.symbols)
+
+    @property
+    def stride(self) -> int:
+        return self.n_symbols ** self.n_tapes
+
+    def covers(self, states: Iterable[str], symbols: Iterable[str]) -> bool:
+        """Indica se a tabela já conhece todos os estados e símbolos dados"""
+        return (all(s in self.state_index for s in states)
+                and all(s in self.symbol_index for s in symbols))
+
+
+def compile_multitape(tm, extra_states: Iterable[str] = (),
+                      extra_symbols: Iterable[str] = ()) -> CompiledMultiTape:
+    """Compila a máquina de várias fitas `tm`, como engine.compile_machine()"""
+    k = tm.n_tapes
+    state_set = set(tm.states) | set(tm.accept_states) | set(tm.reject_states)
+    state_set.add(tm.start_state)
+    state_set.update(extra_states)
+    symbols = [tm.blank]
+    for sym in extra_symbols:
+        if sym not in symbols:
+            symbols.append(sym)
+    symbol_set = set(tm.tape_symbols) | set(tm.input_symbols)
+    for (s, reads), (ns, writes, moves) in tm.transitions.items():
+        if len(reads) != k or len(writes) != k or len(moves) != k:
+            raise ValueError(f"Transição com número de fitas diferente de {k}: {s},{','.join(reads)}")
+        for mv in moves:
+            if mv not in MOVES:
+                raise ValueError(f"Movimento inválido: {mv}")
+        state_set.update((s, ns))
+        symbol_set.update(reads)
+        symbol_set.update(writes)
+    state_set.discard(None)
+    symbol_set.difference_update(symbols)
+
+    states = sorted(state_set)
+    symbols += sorted(symbol_set)
+    s_idx = {s: i for i, s in enumerate(states)}
+    a_idx = {a: i for i, a in enumerate(symbols)}
+    n = len(symbols)
+    stride = n ** k
+
+    table = {}
+    for (s, reads), (ns, writes, moves) in tm.transitions.items():
+        code = sum(a_idx[a] * n ** i for i, a in enumerate(reads))
+        table[s_idx[s] * stride + code] = (
+            s_idx[ns], tuple(a_idx[w] for w in writes), tuple(MOVES[mv] for mv in moves))
+    halts = [0] * len(states)
+    # Estados de parada dominam qualquer transição declarada (aceitação primeiro)
+    for halt, group in ((HALT_REJECT, tm.reject_states), (HALT_ACCEPT, tm.accept_states)):
+        for s in group:
+            halts[s_idx[s]] = halt
+
+    return CompiledMultiTape(n_tapes=k, states=states, symbols=symbols, table=table, halts=halts)
+
+
+def execute_multitape(cm: CompiledMultiTape, tapes: List[Tape], heads: List[int], state: int,
+                      max_steps: int) -> Tuple[int, int, Optional[str]]:
+    """Executa até `max_steps` passos sobre os buffers das fitas.
+
+    As fitas devem estar codificadas com a tabela de símbolos de `cm`; `heads`
+    é atualizada no lugar. Retorna `(passos, estado, resultado)`, contando os
+    passos como em engine.execute().
+    """
+    table = cm.table
+    halts = cm.halts
+    n = cm.n_symbols
+    stride = cm.stride
+    lanes = list(enumerate(tapes))
+    steps = 0
+    result = None
+    while steps < max_steps:
+        steps += 1
+        if halts[state]:
+            result = HALT_RESULTS[halts[state]]
+            break
+        code = 0
+        mul = 1
+        for i, tape in lanes:
+            code += tape.read_code(heads[i]) * mul
+            mul *= n
+        entry = table.get(state * stride + code)
+        if entry is None:
+            result = 'NO_TRANSITION'
+            break
+        state, writes, moves = entry
+        for i, tape in lanes:
+            tape.write_code(heads[i], writes[i])
+            heads[i] += moves[i]
+    return steps, state, result
+
+
+@dataclass
+class MultiTapeMachine:
+    """Máquina de Turing com `n_tapes` fitas e uma cabeça por fita.
+
+    A entrada é escrita na fita 0, que também é a fita de saída exposta por
+    `tape`/`head`. As transições são indexadas por `(estado, leituras)`.
+    """
+    n_tapes: int
+    states: Set[str]
+    input_symbols: Set[str]
+    tape_symbols: Set[str]
+    blank: str
+    transitions: Dict[Tuple[str, Symbols], MultiTransition]
+    start_state: str
+    accept_states: Set[str]
+    reject_states: Set[str]
+    tapes: List[Tape] = field(default_factory=list)
+    heads: List[int] = field(default_factory=list)
+    current_state: Optional[str] = None
+    halted: bool = False
+    # 'ACCEPT' | 'REJECT' | 'NO_TRANSITION' | 'MAX_STEPS'
+    result: Optional[str] = None
+    _compiled: Optional[CompiledMultiTape] = field(
+        default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.tapes = [t if isinstance(t, Tape) else Tape(self.blank, t) for t in self.tapes]
+        self.tapes += [Tape(self.blank) for _ in range(self.n_tapes - len(self.tapes))]
+        self.heads = list(self.heads) + [0] * (self.n_tapes - len(self.heads))
+
+    @property
+    def tape(self) -> Tape:
+        return self.tapes[0]
+
+    @property
+    def head(self) -> int:
+        return self.heads[0]
+
+    def reset(self, input_string: str):
+        symbols = self._compiled.symbols[1:] if self._compiled else None
+        self.tapes = [Tape.from_string(self.blank, input_string, symbols)]
+        self.tapes += [Tape(self.blank, symbols=symbols) for _ in range(self.n_tapes - 1)]
+        self.heads = [0] * self.n_tapes
+        self.current_state = self.start_state
+        self.halted = False
+        self.result = None
+
+    def read(self) -> Symbols:
+        return tuple(t.get(h, self.blank) for t, h in zip(self.tapes, self.heads))
+
+    def step(self) -> None:
+        if self.halted:
+            return
+        if self.current_state in self.accept_states:
+            self.halted, self.result = True, 'ACCEPT'
+            return
+        if self.current_state in self.reject_states:
+            self.halted, self.result = True, 'REJECT'
+            return
+
+        key = (self.current_state, self.read())
+        if key not in self.transitions:
+            self.halted = True
+            self.result = 'NO_TRANSITION'
+            return
+        new_state, writes, moves = self.transitions[key]
+        for i, (sym, move) in enumerate(zip(writes, moves)):
+            if move not in MOVES:
+                raise ValueError(f"Movimento inválido: {move}")
+            self.tapes[i][self.heads[i]] = sym
+            self.heads[i] += MOVES[move]
+        self.current_state = new_state
+
+    def compile(self) -> CompiledMultiTape:
+        """Compila as transições para a tabela usada por run()"""
+        symbols = [s for t in self.tapes for s in t.symbols]
+        self._compiled = compile_multitape(
+            self, extra_states=[self.current_state], extra_symbols=symbols)
+        return self._compiled
+
+    def _compiled_for_tapes(self) -> CompiledMultiTape:
+        cm = self._compiled
+        symbols = [s for t in self.tapes for s in t.symbols]
+        if cm is None or not cm.covers([self.current_state], symbols):
+            cm = self.compile()
+        for t in self.tapes:
+            if t.symbols != cm.symbols:
+                t.recode(cm.symbols)
+        return cm
+
+    def run(self, max_steps: int = 1000, halt_on_limit: bool = True):
+        """Executa até parar ou até `max_steps` passos, como TuringMachine.run()"""
+        if self.halted:
+            return 0
+        steps = 0
+        if max_steps > 0 and self.current_state is None:
+            self.step()
+            steps = 1
+        elif max_steps > 0:
+            cm = self._compiled_for_tapes()
+            steps, state, result = execute_multitape(
+                cm, self.tapes, self.heads, cm.state_index[self.current_state], max_steps)
+            self.current_state = cm.states[state]
+            if result is not None:
+                self.halted, self.result = True, result
+        if halt_on_limit and not self.halted and steps >= max_steps:
+            self.halted = True
+            self.result = 'MAX_STEPS'
+        return steps
+
+    def window_cells(self, span: int = 25):
+        """Janela `(índice, símbolo, é_cabeça)` em torno da cabeça de cada fita"""
+        return [
+            [(i, tape.get(i, self.blank), i == head) for i in range(head - span, head + span + 1)]
+            for tape, head in zip(self.tapes, self.heads)
+        ]
+
+    def to_dict(self):
+        """Converte para dicionário serializável"""
+        return {
+            'n_tapes': self.n_tapes,
+            'states': list(self.states),
+            'input_symbols': list(self.input_symbols),
+            'tape_symbols': list(self.tape_symbols),
+            'blank': self.blank,
+            'transitions': {f"{s},{','.join(reads)}": [ns, *writes, *moves]
+                            for (s, reads), (ns, writes, moves) in self.transitions.items()},
+            'start_state': self.start_state,
+            'accept_states': list(self.accept_states),
+            'reject_states': list(self.reject_states),
+            'tapes': [{str(k): v for k, v in t.items()} for t in self.tapes],
+            'heads': list(self.heads),
+            'current_state': self.current_state,
+            'halted': self.halted,
+            'result': self.result
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Cria instância a partir de dicionário"""
+        k = data['n_tapes']
+        transitions = {}
+        for key, v in data['transitions'].items():
+            parts = key.split(',')
+            transitions[(','.join(parts[:-k]), tuple(parts[-k:]))] = (
+                v[0], tuple(v[1:1 + k]), tuple(v[1 + k:]))
+
+        return cls(
+            n_tapes=k,
+            states=set(data['states']),
+            input_symbols=set(data['input_symbols']),
+            tape_symbols=set(data['tape_symbols']),
+            blank=data['blank'],
+            transitions=transitions,
+            start_state=data['start_state'],
+            accept_states=set(data['accept_states']),
+            reject_states=set(data['reject_states']),
+            tapes=[{int(i): v for i, v in t.items()} for t in data['tapes']],
+            heads=data['heads'],
+            current_state=data['current_state'],
+            halted=data['halted'],
+            result=data['result']
+        )
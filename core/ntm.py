@@ -0,0 +1,175 @@
+# Simulação de Máquina de Turing não determinística
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from .engine import HALT_ACCEPT, HALT_REJECT, MOVES
+from .tape import Tape
+
+Transition = Tuple[str, str, str]
+# (estado, cabeça, símbolo sob a cabeça, pilha à esquerda, pilha à direita)
+Config = Tuple[int, int, int, int, int]
+
+
+class _Stacks:
+    """Pilhas persistentes de símbolos com nós internados (hash-consing).
+
+    O nó 0 é a pilha vazia. Como cada par `(símbolo, resto)` existe uma única
+    vez, duas pilhas com o mesmo conteúdo têm o mesmo id: as configurações
+    compartilham a fita e podem ser comparadas por igualdade de inteiros.
+    Brancos no fundo da pilha não são guardados.
+    """
+
+    def __init__(self):
+        self.symbols = [0]
+        self.rests = [0]
+        self.index: Dict[Tuple[int, int], int] = {}
+
+    def push(self, sym: int, rest: int) -> int:
+        if not sym and not rest:
+            return 0
+        key = (sym, rest)
+        node = self.index.get(key)
+        if node is None:
+            node = self.index[key] = len(self.symbols)
+            self.symbols.append(sym)
+            self.rests.append(rest)
+        return node
+
+    def pop(self, node: int) -> Tuple[int, int]:
+        return self.symbols[node], self.rests[node]
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+
+@dataclass
+class NTMResult:
+    """Resultado de NondeterministicMachine.explore()"""
+    # 'ACCEPT' | 'REJECT' | 'MAX_STEPS' | 'MAX_CONFIGS'
+    result: str
+    # Níveis da busca processados, contados como em TuringMachine.run()
+    steps: int
+    # Configurações distintas geradas
+    configs: int
+    # Transições `((estado, lido), (novo estado, escrito, movimento))` até a aceitação
+    path: List[Tuple[Tuple[str, str], Transition]] = field(default_factory=list)
+    tape: Optional[Tape] = None
+    head: Optional[int] = None
+
+    @property
+    def accepted(self) -> bool:
+        return self.result == 'ACCEPT'
+
+
+@dataclass
+class NondeterministicMachine:
+    """Máquina de Turing de uma fita com várias transições por par (estado, símbolo)"""
+    states: Set[str]
+    input_symbols: Set[str]
+    tape_symbols: Set[str]
+    blank: str
+    transitions: Dict[Tuple[str, str], List[Transition]]
+    start_state: str
+    accept_states: Set[str]
+    reject_states: Set[str]
+
+    def _compile(self, input_string: str):
+        state_set = set(self.states) | self.accept_states | self.reject_states | {self.start_state}
+        symbol_set = set(self.tape_symbols) | set(self.input_symbols) | set(input_string)
+        for (s, a), options in self.transitions.items():
+            for ns, w, mv in options:
+                if mv not in MOVES:
+                    raise ValueError(f"Movimento inválido: {mv}")
+                state_set.update((s, ns))
+                symbol_set.update((a, w))
+        symbol_set.discard(self.blank)
+        states = sorted(state_set)
+        symbols = [self.blank] + sorted(symbol_set)
+        s_idx = {s: i for i, s in enumerate(states)}
+        a_idx = {a: i for i, a in enumerate(symbols)}
+        n = len(symbols)
+        table = [()] * (len(states) * n)
+        for (s, a), options in self.transitions.items():
+            table[s_idx[s] * n + a_idx[a]] = tuple(
+                (s_idx[ns], a_idx[w], MOVES[mv], i) for i, (ns, w, mv) in enumerate(options))
+        halts = [0] * len(states)
+        # Estados de parada dominam qualquer transição declarada (aceitação primeiro)
+        for halt, group in ((HALT_REJECT, self.reject_states), (HALT_ACCEPT, self.accept_states)):
+            for s in group:
+                halts[s_idx[s]] = halt
+        return states, symbols, a_idx, table, halts
+
+    def explore(self, input_string: str, max_steps: int = 1000,
+                max_configs: int = 100000) -> NTMResult:
+        """Busca em largura por uma configuração de aceitação.
+
+        Configurações repetidas (mesmo estado, cabeça e fita) são descartadas.
+        A busca para ao aceitar, quando nenhum ramo continua ('REJECT'), após
+        `max_steps` níveis ('MAX_STEPS') ou ao ultrapassar `max_configs`
+        configurações distintas ('MAX_CONFIGS').
+        """
+        states, symbols, a_idx, table, halts = self._compile(input_string)
+        n = len(symbols)
+        stacks = _Stacks()
+        right = 0
+        for ch in reversed(input_string[1:]):
+            right = stacks.push(a_idx[ch], right)
+        cur = a_idx[input_string[0]] if input_string else 0
+        start: Config = (states.index(self.start_state), 0, cur, 0, right)
+
+        # Configuração -> (configuração anterior, transição usada)
+        parents: Dict[Config, Optional[Tuple[Config, int]]] = {start: None}
+        frontier = [start]
+        steps = 0
+        while frontier:
+            if steps >= max_steps:
+                return NTMResult('MAX_STEPS', steps, len(parents))
+            steps += 1
+            level = []
+            for config in frontier:
+                state, head, cur, left, right = config
+                halt = halts[state]
+                if halt == HALT_ACCEPT:
+                    return self._accepted(config, parents, steps, states, symbols, stacks)
+                if halt:
+                    continue
+                for ns, w, mv, choice in table[state * n + cur]:
+                    if mv > 0:
+                        left2 = stacks.push(w, left)
+                        cur2, right2 = stacks.pop(right)
+                    elif mv < 0:
+                        right2 = stacks.push(w, right)
+                        cur2, left2 = stacks.pop(left)
+                    else:
+                        cur2, left2, right2 = w, left, right
+                    child = (ns, head + mv, cur2, left2, right2)
+                    if child in parents:
+                        continue
+                    parents[child] = (config, choice)
+                    if len(parents) > max_configs:
+                        return NTMResult('MAX_CONFIGS', steps, len(parents))
+                    level.append(child)
+            frontier = level
+        return NTMResult('REJECT', steps, len(parents))
+
+    def _accepted(self, config: Config, parents, steps: int, states, symbols,
+                  stacks: _Stacks) -> NTMResult:
+        path = []
+        child = config
+        while parents[child] is not None:
+            parent, choice = parents[child]
+            state, sym = states[parent[0]], symbols[parent[2]]
+            path.append(((state, sym), self.transitions[(state, sym)][choice]))
+            child = parent
+        path.reverse()
+
+        _, head, cur, left, right = config
+        tape = Tape(self.blank, symbols=symbols[1:])
+        tape.write_code(head, cur)
+        for step_dir, node in ((-1, left), (1, right)):
+            i = head + step_dir
+            while node:
+                sym, node = stacks.pop(node)
+                tape.write_code(i, sym)
+                i += step_dir
+        return NTMResult('ACCEPT', steps, len(parents), path, tape, head)
@@ -0,0 +1,211 @@
+# Cache persistente de resultados de execução (memória + SQLite)
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# (resultado, passos, fita de saída)
+Entry = Tuple[str, int, str]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    result TEXT NOT NULL,
+    steps INTEGER NOT NULL,
+    tape TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    used INTEGER NOT NULL
+)
+"""
+
+
+def machine_digest(tm) -> str:
+    """Hash da definição da máquina (independe de espaços, comentários e ordem das linhas)"""
+    h = hashlib.sha256()
+    h.update(repr((
+        tm.blank,
+        tm.start_state,
+        sorted(tm.accept_states),
+        sorted(tm.reject_states),
+        sorted(tm.transitions.items()),
+    )).encode('utf-8'))
+    return h.hexdigest()
+
+
+def result_key(digest: str, input_string: str, max_steps: int, options: str = '') -> str:
+    """Chave de um resultado: máquina, entrada, limite de passos e opções de run()"""
+    h = hashlib.sha256(digest.encode('ascii'))
+    h.update(f"\0{max_steps}\0{options}\0".encode('utf-8'))
+    h.update(input_string.encode('utf-8'))
+    return h.hexdigest()
+
+
+def _size(key: str, entry: Entry) -> int:
+    return len(key) + len(entry[0]) + len(entry[2]) + 16
+
+
+class ResultCache:
+    """Resultados de run() indexados por result_key().
+
+    Um LRU em memória de até `memory_size` entradas e `memory_bytes` bytes
+    estimados fica na frente de uma tabela SQLite em `path` (sem `path`, só a
+    memória é usada). No disco os registros guardam um contador de último
+    uso e, quando o total estimado passa de `max_bytes`, os menos usados são
+    apagados até sobrar 90% do limite. `stats()` traz acertos por camada e a
+    taxa de acerto.
+    """
+
+    def __init__(self, path: Optional[str] = None, memory_size: int = 10000,
+                 max_bytes: int = 512 * 1024 * 1024, memory_bytes: int = 64 * 1024 * 1024):
+        self.path = path
+        self.memory_size = memory_size
+        self.memory_bytes = memory_bytes
+        self.max_bytes = max_bytes
+        self._memory: 'OrderedDict[str, Entry]' = OrderedDict()
+        self._memory_used = 0
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._clock = 0
+        self.bytes = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(_SCHEMA)
+            self._db.execute("CREATE INDEX IF NOT EXISTS results_used ON results(used)")
+            row = self._db.execute("SELECT COALESCE(SUM(size), 0), COALESCE(MAX(used), 0) "
+                                   "FROM results").fetchone()
+            self.bytes, self._clock = row
+            self._db.commit()
+
+    def _remember(self, key: str, entry: Entry) -> None:
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_used -= _size(key, old)
+        self._memory[key] = entry
+        self._memory_used += _size(key, entry)
+        while self._memory and (len(self._memory) > self.memory_size
+                                or self._memory_used > self.memory_bytes):
+            k, e = self._memory.popitem(last=False)
+            self._memory_used -= _size(k, e)
+
+    def get(self, key: str) -> Optional[Entry]:
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Entry]:
+        """Entradas encontradas entre `keys`; a ausência conta como falta"""
+        found: Dict[str, Entry] = {}
+        with self._lock:
+            missing = []
+            for key in keys:
+                entry = self._memory.get(key)
+                if entry is not None:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    found[key] = entry
+                else:
+                    missing.append(key)
+            if missing and self._db is not None:
+                self._clock += 1
+                for lo in range(0, len(missing), 500):
+                    part = missing[lo:lo + 500]
+                    marks = ','.join('?' * len(part))
+                    rows = self._db.execute(
+                        f"SELECT key, result, steps, tape FROM results WHERE key IN ({marks})",
+                        part).fetchall()
+                    for key, result, steps, tape in rows:
+                        entry = (result, steps, tape)
+                        found[key] = entry
+                        self._remember(key, entry)
+                    if rows:
+                        self._db.executemany("UPDATE results SET used = ? WHERE key = ?",
+                                             [(self._clock, row[0]) for row in rows])
+                self.disk_hits += sum(k in found for k in missing)
+                self._db.commit()
+            self.misses += sum(k not in found for k in missing)
+        return found
+
+    def put(self, key: str, result: str, steps: int, tape: str) -> None:
+        self.put_many([(key, (result, steps, tape))])
+
+    def put_many(self, items: Iterable[Tuple[str, Entry]]) -> None:
+        items = list(dict(items).items())
+        with self._lock:
+            for key, entry in items:
+                self._remember(key, entry)
+            if self._db is None or not items:
+                return
+            self._clock += 1
+            keys = [key for key, _ in items]
+            for lo in range(0, len(keys), 500):
+                part = keys[lo:lo + 500]
+                marks = ','.join('?' * len(part))
+                self.bytes -= self._db.execute(
+                    f"SELECT COALESCE(SUM(size), 0) FROM results WHERE key IN ({marks})",
+                    part).fetchone()[0]
+            rows = [(key, result, steps, tape, _size(key, (result, steps, tape)), self._clock)
+                    for key, (result, steps, tape) in items]
+            self._db.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self.bytes += sum(row[4] for row in rows)
+            if self.bytes > self.max_bytes:
+                self._evict()
+            self._db.commit()
+
+    def _evict(self) -> None:
+        target = self.max_bytes * 9 // 10
+        while self.bytes > target:
+            rows = self._db.execute(
+                "SELECT key, size FROM results ORDER BY used LIMIT 1000").fetchall()
+            if not rows:
+                break
+            drop: List[str] = []
+            for key, size in rows:
+                drop.append(key)
+                self.bytes -= size
+                if self.bytes <= target:
+                    break
+            self._db.executemany("DELETE FROM results WHERE key = ?", [(k,) for k in drop])
+            self.evictions += len(drop)
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._db is None:
+                return len(self._memory)
+            return self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def stats(self):
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            total = hits + self.misses
+            return {
+                'memory_size': len(self._memory),
+                'memory_maxsize': self.memory_size,
+                'memory_bytes': self._memory_used,
+                'memory_max_bytes': self.memory_bytes,
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': hits / total if total else 0.0,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._memory_used = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
+            self.bytes = 0
+            self.memory_hits = self.disk_hits = self.misses = self.evictions = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,176 @@
+# Fita em run-length com aceleração de varreduras
+import re
+from typing import List, Optional, Tuple
+
+from .engine import HALT_RESULTS, CompiledMachine
+
+# Comprimento das corridas de branco que limitam a fita dos dois lados
+EDGE = 1 << 62
+
+_RUNS = re.compile(rb'(.)\1*', re.S)
+
+
+class RunLengthTape:
+    """Fita como sequência de corridas `(símbolo, comprimento)`.
+
+    `syms[r]`/`lens[r]` descrevem a corrida `r`. A cabeça fica na corrida
+    `run`, deslocamento `offset`. A primeira e a última corridas são brancos de
+    comprimento `EDGE`, de modo que a cabeça nunca sai da lista.
+    """
+
+    __slots__ = ('syms', 'lens', 'run', 'offset')
+
+    def __init__(self, syms: List[int], lens: List[int], run: int, offset: int):
+        self.syms = syms
+        self.lens = lens
+        self.run = run
+        self.offset = offset
+
+    @classmethod
+    def from_tape(cls, tape, head: int) -> 'RunLengthTape':
+        start, data = tape.span()
+        syms, lens = [0], [EDGE]
+        for m in _RUNS.finditer(data):
+            syms.append(data[m.start()])
+            lens.append(m.end() - m.start())
+        syms.append(0)
+        lens.append(EDGE)
+        rt = cls(syms, lens, 0, 0)
+        rt._merge_blanks()
+        # Localiza a corrida da cabeça
+        pos = start - EDGE
+        for r, length in enumerate(rt.lens):
+            if head < pos + length:
+                rt.run, rt.offset = r, head - pos
+                break
+            pos += length
+        return rt
+
+    def _merge_blanks(self) -> None:
+        syms, lens = self.syms, self.lens
+        if len(syms) > 2 and syms[1] == 0:
+            lens[0] += lens.pop(1)
+            syms.pop(1)
+        if len(syms) > 2 and syms[-2] == 0:
+            lens[-1] += lens.pop(-2)
+            syms.pop(-2)
+
+    def store(self, tape, head: int) -> None:
+        """Grava o conteúdo de volta na fita densa `tape`"""
+        syms, lens = self.syms, self.lens
+        if len(syms) <= 2:
+            tape.clear()
+            return
+        start = head - self.offset
+        for r in range(self.run - 1, 0, -1):
+            start -= lens[r]
+        if self.run == 0:
+            start += lens[0]
+        data = b''.join(bytes((syms[r],)) * lens[r] for r in range(1, len(syms) - 1))
+        tape.load_span(start, data)
+
+
+def self_loops(cm: CompiledMachine) -> List[int]:
+    """Movimento de cada entrada que é laço no mesmo estado sem alterar o símbolo.
+
+    Entradas que não são varreduras ficam com `None`.
+    """
+    n = cm.n_symbols
+    loops = [None] * len(cm.next_state)
+    for pos, (ns, w, mv) in enumerate(zip(cm.next_state, cm.write, cm.move)):
+        if ns == pos // n and w == pos % n:
+            loops[pos] = mv
+    return loops
+
+
+def execute_rle(cm: CompiledMachine, rt: RunLengthTape, head: int, state: int,
+                max_steps: int) -> Tuple[int, int, int, Optional[str]]:
+    """Executa sobre `rt`, saltando cada corrida varrida por um laço próprio.
+
+    Retorna `(passos, estado, cabeça, resultado)` exatamente como `execute`.
+    """
+    table = cm.table
+    loops = self_loops(cm)
+    n = cm.n_symbols
+    base = state * n
+    syms, lens = rt.syms, rt.lens
+    r, o = rt.run, rt.offset
+    steps = 0
+    result = None
+    while steps < max_steps:
+        sym = syms[r]
+        nb, w, mv = table[base + sym]
+        if nb < 0:
+            steps += 1
+            result = HALT_RESULTS[nb]
+            break
+        sweep = loops[base + sym]
+        if sweep is not None:
+            budget = max_steps - steps
+            if sweep == 1:
+                k = min(lens[r] - o, budget)
+                o += k
+                if o == lens[r]:
+                    r += 1
+                    o = 0
+            elif sweep == -1:
+                k = min(o + 1, budget)
+                o -= k
+                if o < 0:
+                    r -= 1
+                    o = lens[r] - 1
+            else:
+                # Laço parado: nada muda até o limite de passos
+                k = budget
+            steps += k
+            head += k * sweep
+            continue
+
+        steps += 1
+        if w != sym:
+            length = lens[r]
+            if length == 1:
+                syms[r] = w
+                if syms[r + 1] == w:
+                    lens[r] += lens.pop(r + 1)
+                    syms.pop(r + 1)
+                if syms[r - 1] == w:
+                    o = lens[r - 1]
+                    lens[r - 1] += lens.pop(r)
+                    syms.pop(r)
+                    r -= 1
+            elif o == 0:
+                lens[r] -= 1
+                if syms[r - 1] == w:
+                    r -= 1
+                    o = lens[r]
+                    lens[r] += 1
+                else:
+                    syms.insert(r, w)
+                    lens.insert(r, 1)
+            elif o == length - 1:
+                lens[r] -= 1
+                r += 1
+                o = 0
+                if syms[r] == w:
+                    lens[r] += 1
+                else:
+                    syms.insert(r, w)
+                    lens.insert(r, 1)
+            else:
+                lens[r] = o
+                syms[r + 1:r + 1] = (w, sym)
+                lens[r + 1:r + 1] = (1, length - o - 1)
+                r += 1
+                o = 0
+        o += mv
+        if o >= lens[r]:
+            r += 1
+            o = 0
+        elif o < 0:
+            r -= 1
+            o = lens[r] - 1
+        head += mv
+        base = nb
+    rt.run, rt.offset = r, o
+    return steps, base // n, head, result
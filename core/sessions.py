@@ -0,0 +1,148 @@
+# Sessões de máquinas mantidas no servidor
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from .turing_machine import TuringMachine
+
+
+class SessionNotFound(KeyError):
+    """Sessão inexistente, expirada ou descartada"""
+
+
+# Custos aproximados (medidos com tracemalloc) das estruturas de uma máquina
+TRANSITION_BYTES = 200
+# Entrada célula -> versão de track_changes(): dois int e o slot do dicionário
+DIRTY_ENTRY_BYTES = 100
+# Posição da tabela compilada: três array('i') mais a tupla do laço quente
+TABLE_ENTRY_BYTES = 100
+
+
+def machine_size(tm: TuringMachine) -> int:
+    """Estimativa em bytes da memória ocupada por uma máquina.
+
+    Inclui a fita, as transições, o mapa de alterações de track_changes(), a
+    tabela compilada e os contadores de run(collect_stats=True).
+    """
+    size = 1024 + TRANSITION_BYTES * len(tm.transitions)
+    size += len(tm.tape.right) + len(tm.tape.left)
+    if tm._dirty is not None:
+        size += DIRTY_ENTRY_BYTES * len(tm._dirty)
+    if tm._compiled is not None:
+        size += TABLE_ENTRY_BYTES * len(tm._compiled.table)
+    if tm.stats is not None:
+        changed = tm.stats.changed
+        size += tm.stats.transition_hits.itemsize * len(tm.stats.transition_hits)
+        size += len(changed.right) + len(changed.left)
+    return size
+
+
+class _Session:
+    __slots__ = ('machine', 'lock', 'last_used', 'size')
+
+    def __init__(self, machine: TuringMachine, now: float):
+        self.machine = machine
+        self.lock = threading.Lock()
+        self.last_used = now
+        self.size = machine_size(machine)
+
+
+class SessionStore:
+    """Máquinas indexadas por id de sessão, com descarte LRU, TTL e limite de memória.
+
+    Sessões sem uso há mais de `ttl` segundos expiram. Acima de `max_sessions`
+    sessões ou de `max_bytes` estimados, as menos usadas recentemente são
+    descartadas (a sessão em uso nunca é descartada).
+    """
+
+    def __init__(self, ttl: float = 900.0, max_sessions: int = 1000,
+                 max_bytes: int = 256 * 1024 * 1024, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self._sessions: 'OrderedDict[str, _Session]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def create(self, machine: TuringMachine) -> str:
+        session_id = secrets.token_urlsafe(16)
+        session = _Session(machine, self.clock())
+        with self._lock:
+            self._expire()
+            self._sessions[session_id] = session
+            self.bytes += session.size
+            self._enforce(keep=session_id)
+        return session_id
+
+    @contextmanager
+    def use(self, session_id: str) -> Iterator[TuringMachine]:
+        """Empresta a máquina da sessão com acesso exclusivo; mede o tamanho ao devolver"""
+        with self._lock:
+            self._expire()
+            session = self._sessions.get(session_id)
+            if session is None:
+                raise SessionNotFound(session_id)
+            self._sessions.move_to_end(session_id)
+            session.last_used = self.clock()
+        with session.lock:
+            try:
+                yield session.machine
+            finally:
+                size = machine_size(session.machine)
+                with self._lock:
+                    if self._sessions.get(session_id) is session:
+                        self.bytes += size - session.size
+                        session.size = size
+                        session.last_used = self.clock()
+                        self._enforce(keep=session_id)
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is None:
+                return False
+            self.bytes -= session.size
+            return True
+
+    def _expire(self) -> None:
+        # A ordem LRU também é a ordem de último uso: as expiradas ficam no início
+        limit = self.clock() - self.ttl
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if session.last_used > limit:
+                break
+            del self._sessions[session_id]
+            self.bytes -= session.size
+            self.expired += 1
+
+    def _enforce(self, keep: str) -> None:
+        while (len(self._sessions) > self.max_sessions or self.bytes > self.max_bytes) \
+                and len(self._sessions) > 1:
+            session_id = next(iter(self._sessions))
+            if session_id == keep:
+                self._sessions.move_to_end(keep)
+                session_id = next(iter(self._sessions))
+            session = self._sessions.pop(session_id)
+            self.bytes -= session.size
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def stats(self):
+        with self._lock:
+            self._expire()
+            return {
+                'sessions': len(self._sessions),
+                'max_sessions': self.max_sessions,
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+                'expired': self.expired,
+                'evictions': self.evictions,
+            }
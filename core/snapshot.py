@@ -0,0 +1,221 @@
+# Formato binário versionado para salvar e restaurar máquinas
+import struct
+import sys
+import zlib
+from array import array
+from typing import Dict, List
+
+from .engine import MOVES
+from .stats import RunStats
+from .tape import Tape
+
+MAGIC = b'TMSN'
+VERSION = 2
+FLAG_ZLIB = 0x01
+
+_NONE = 0xFFFFFFFF
+_RESULTS = [None, 'ACCEPT', 'REJECT', 'NO_TRANSITION', 'MAX_STEPS', 'LOOP']
+_MOVE_CODES = list(MOVES)
+
+# Cabeçalho: magic, versão, flags
+_PREFIX = struct.Struct('<4sBB')
+# blank, start, estado atual, cabeça, halted, resultado, loop_start, loop_period
+_SCALARS = struct.Struct('<IIIqBBqq')
+# início da fita, número de bytes da fita
+_TAPE = struct.Struct('<qQ')
+# Versão 2: versão de delta() e presença de estatísticas
+_EXTRA = struct.Struct('<qB')
+# Estatísticas: head_min, head_max, reversals, last_move
+_STATS = struct.Struct('<qqqb')
+
+
+class SnapshotError(ValueError):
+    """Snapshot inválido ou de versão desconhecida"""
+
+
+def _u32(values) -> bytes:
+    arr = array('I', values)
+    if sys.byteorder == 'big':
+        arr.byteswap()
+    return struct.pack('<I', len(arr)) + arr.tobytes()
+
+
+def _i64(values) -> bytes:
+    arr = array('q', values)
+    if sys.byteorder == 'big':
+        arr.byteswap()
+    return struct.pack('<I', len(arr)) + arr.tobytes()
+
+
+class _Reader:
+    def __init__(self, data: bytes):
+        self.data = memoryview(data)
+        self.pos = 0
+
+    def take(self, n: int) -> memoryview:
+        if self.pos + n > len(self.data):
+            raise SnapshotError("Snapshot truncado")
+        chunk = self.data[self.pos:self.pos + n]
+        self.pos += n
+        return chunk
+
+    def unpack(self, fmt: struct.Struct):
+        return fmt.unpack(self.take(fmt.size))
+
+    def u32(self) -> List[int]:
+        return self._array('I')
+
+    def i64(self) -> List[int]:
+        return self._array('q')
+
+    def _array(self, code: str) -> List[int]:
+        (count,) = struct.unpack('<I', self.take(4))
+        arr = array(code)
+        arr.frombytes(self.take(arr.itemsize * count))
+        if sys.byteorder == 'big':
+            arr.byteswap()
+        return arr.tolist()
+
+
+def to_bytes(tm, compress: bool = False) -> bytes:
+    """Serializa a máquina: tabela de strings, transições empacotadas e fita em bytes.
+
+    Desde a versão 2 também guarda `version` e `stats`. O mapa de alterações
+    de track_changes() não é salvo: a máquina restaurada responde delta()
+    com `full=True` até voltar a rastrear.
+    """
+    strings: List[str] = []
+    index: Dict[str, int] = {}
+
+    def ref(s) -> int:
+        if s is None:
+            return _NONE
+        i = index.get(s)
+        if i is None:
+            i = index[s] = len(strings)
+            strings.append(s)
+        return i
+
+    parts = []
+    for group in (tm.states, tm.input_symbols, tm.tape_symbols, tm.accept_states, tm.reject_states):
+        parts.append(_u32(ref(s) for s in sorted(group)))
+    packed = array('I')
+    for (s, a), (ns, w, mv) in tm.transitions.items():
+        packed.extend((ref(s), ref(a), ref(ns), ref(w), _MOVE_CODES.index(mv)))
+    parts.append(_u32(packed))
+    parts.append(_u32(ref(s) for s in tm.tape.symbols))
+    start, cells = tm.tape.span(trim=True)
+    parts.append(_TAPE.pack(start, len(cells)))
+    parts.append(cells)
+
+    stats = tm.stats
+    parts.append(_EXTRA.pack(tm.version, stats is not None))
+    if stats is not None:
+        # Contagens por nome: a tabela compilada ao restaurar pode ter outra ordem
+        hits = stats.by_transition()
+        parts.append(_STATS.pack(stats.head_min, stats.head_max, stats.reversals, stats.last_move))
+        parts.append(_u32(ref(x) for key in hits for x in key))
+        parts.append(_i64(hits.values()))
+        start, cells = stats.changed.span(trim=True)
+        parts.append(_TAPE.pack(start, len(cells)))
+        parts.append(cells)
+
+    scalars = _SCALARS.pack(
+        ref(tm.blank), ref(tm.start_state), ref(tm.current_state), tm.head,
+        int(tm.halted), _RESULTS.index(tm.result),
+        -1 if tm.loop_start is None else tm.loop_start,
+        -1 if tm.loop_period is None else tm.loop_period)
+    table = [struct.pack('<I', len(strings))]
+    for s in strings:
+        raw = s.encode('utf-8')
+        table.append(struct.pack('<I', len(raw)) + raw)
+
+    payload = b''.join(table) + scalars + b''.join(parts)
+    flags = 0
+    if compress:
+        payload = zlib.compress(payload)
+        flags |= FLAG_ZLIB
+    return _PREFIX.pack(MAGIC, VERSION, flags) + payload
+
+
+def from_bytes(cls, data: bytes):
+    """Reconstrói uma instância de `cls` a partir de to_bytes()"""
+    if len(data) < _PREFIX.size:
+        raise SnapshotError("Snapshot truncado")
+    magic, version, flags = _PREFIX.unpack_from(data)
+    if magic != MAGIC:
+        raise SnapshotError("Cabeçalho de snapshot inválido")
+    if version not in (1, VERSION):
+        raise SnapshotError(f"Versão de snapshot não suportada: {version}")
+    payload = data[_PREFIX.size:]
+    if flags & FLAG_ZLIB:
+        payload = zlib.decompress(payload)
+
+    r = _Reader(payload)
+    (count,) = struct.unpack('<I', r.take(4))
+    strings = []
+    for _ in range(count):
+        (size,) = struct.unpack('<I', r.take(4))
+        strings.append(str(r.take(size), 'utf-8'))
+
+    def name(i):
+        return None if i == _NONE else strings[i]
+
+    blank, start_state, current, head, halted, result, loop_start, loop_period = r.unpack(_SCALARS)
+    states, input_symbols, tape_symbols, accept, reject = (
+        set(strings[i] for i in r.u32()) for _ in range(5))
+    packed = r.u32()
+    transitions = {}
+    for k in range(0, len(packed), 5):
+        s, a, ns, w, mv = packed[k:k + 5]
+        transitions[(strings[s], strings[a])] = (strings[ns], strings[w], _MOVE_CODES[mv])
+    tape = Tape(strings[blank], symbols=[strings[i] for i in r.u32()[1:]])
+    tape_start, size = r.unpack(_TAPE)
+    tape.load_span(tape_start, bytes(r.take(size)))
+
+    # A versão 1 não guarda versão nem estatísticas
+    delta_version, has_stats = r.unpack(_EXTRA) if version >= 2 else (0, False)
+    stats = None
+    if has_stats:
+        head_min, head_max, reversals, last_move = r.unpack(_STATS)
+        refs = r.u32()
+        hits = dict(zip(((strings[refs[k]], strings[refs[k + 1]])
+                         for k in range(0, len(refs), 2)), r.i64()))
+        changed_start, size = r.unpack(_TAPE)
+        stats = (head_min, head_max, reversals, last_move, hits,
+                 changed_start, bytes(r.take(size)))
+
+    tm = cls(
+        states=states,
+        input_symbols=input_symbols,
+        tape_symbols=tape_symbols,
+        blank=strings[blank],
+        transitions=transitions,
+        start_state=strings[start_state],
+        accept_states=accept,
+        reject_states=reject,
+        tape=tape,
+        head=head,
+        current_state=name(current),
+        halted=bool(halted),
+        result=_RESULTS[result],
+        loop_start=None if loop_start < 0 else loop_start,
+        loop_period=None if loop_period < 0 else loop_period,
+        version=delta_version,
+    )
+    if stats is not None:
+        _restore_stats(tm, *stats)
+    return tm
+
+
+def _restore_stats(tm, head_min, head_max, reversals, last_move, hits, changed_start, changed):
+    """Recria `tm.stats` sobre a tabela compilada da máquina restaurada"""
+    cm = tm._compiled_for_tape()
+    stats = RunStats(cm)
+    n = cm.n_symbols
+    for (s, a), count in hits.items():
+        stats.transition_hits[cm.state_index[s] * n + cm.symbol_index[a]] = count
+    stats.head_min, stats.head_max = head_min, head_max
+    stats.reversals, stats.last_move = reversals, last_move
+    stats.changed.load_span(changed_start, changed)
+    tm.stats = stats
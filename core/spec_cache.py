@@ -0,0 +1,151 @@
+# Cache LRU de especificações já parseadas
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import FrozenSet, Iterable, Mapping, Optional, Tuple, Union
+
+from .engine import CompiledMachine
+from .examples import EXAMPLES
+from .multitape import CompiledMultiTape, MultiTapeMachine
+from .turing_machine import Transition, TuringMachine, parse_spec
+
+
+def normalize_spec(spec_text: str) -> str:
+    """Remove comentários, linhas vazias e espaços nas pontas, como parse_spec()"""
+    lines = []
+    for raw in spec_text.splitlines():
+        s = raw.strip()
+        if s and not s.startswith('#'):
+            lines.append(s)
+    return '\n'.join(lines)
+
+
+def spec_digest(spec_text: str) -> str:
+    """Hash do conteúdo normalizado da especificação"""
+    return hashlib.sha256(normalize_spec(spec_text).encode('utf-8')).hexdigest()
+
+
+@dataclass(frozen=True)
+class SpecDefinition:
+    """Definição imutável de uma máquina, compartilhada entre os chamadores"""
+    digest: str
+    states: FrozenSet[str]
+    input_symbols: FrozenSet[str]
+    tape_symbols: FrozenSet[str]
+    blank: str
+    transitions: Mapping[Tuple[str, str], Transition]
+    start_state: str
+    accept_states: FrozenSet[str]
+    reject_states: FrozenSet[str]
+    compiled: Union[CompiledMachine, CompiledMultiTape]
+    n_tapes: int = 1
+
+    @classmethod
+    def from_machine(cls, digest: str, tm: Union[TuringMachine, MultiTapeMachine]) -> 'SpecDefinition':
+        return cls(
+            digest=digest,
+            states=frozenset(tm.states),
+            input_symbols=frozenset(tm.input_symbols),
+            tape_symbols=frozenset(tm.tape_symbols),
+            blank=tm.blank,
+            transitions=MappingProxyType(dict(tm.transitions)),
+            start_state=tm.start_state,
+            accept_states=frozenset(tm.accept_states),
+            reject_states=frozenset(tm.reject_states),
+            compiled=tm.compile(),
+            n_tapes=tm.n_tapes,
+        )
+
+    def new_machine(self) -> Union[TuringMachine, MultiTapeMachine]:
+        """Cria uma máquina nova (não inicializada) a partir da definição"""
+        kwargs = dict(
+            states=set(self.states),
+            input_symbols=set(self.input_symbols),
+            tape_symbols=set(self.tape_symbols),
+            blank=self.blank,
+            transitions=dict(self.transitions),
+            start_state=self.start_state,
+            accept_states=set(self.accept_states),
+            reject_states=set(self.reject_states),
+        )
+        if self.n_tapes > 1:
+            tm = MultiTapeMachine(n_tapes=self.n_tapes, **kwargs)
+        else:
+            tm = TuringMachine(**kwargs)
+        tm._compiled = self.compiled
+        return tm
+
+
+class SpecCache:
+    """Cache LRU limitado de `parse_spec`, indexado pelo hash da especificação.
+
+    Especificações inválidas também são guardadas, com sua mensagem de erro.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._entries: 'OrderedDict[str, Tuple[Optional[SpecDefinition], Optional[str]]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, spec_text: str) -> Tuple[Optional[SpecDefinition], Optional[str]]:
+        """Retorna `(definição, erro)` da especificação, parseando só na primeira vez"""
+        digest = spec_digest(spec_text)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None:
+                self._entries.move_to_end(digest)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        tm, err = parse_spec(spec_text)
+        entry = (SpecDefinition.from_machine(digest, tm) if tm else None, err)
+
+        with self._lock:
+            self._entries[digest] = entry
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    def parse(self, spec_text: str) -> Tuple[Optional[TuringMachine], Optional[str]]:
+        """Mesmo contrato de parse_spec(), devolvendo uma máquina nova a cada chamada"""
+        definition, err = self.lookup(spec_text)
+        if err:
+            return None, err
+        return definition.new_machine(), None
+
+    def warm(self, specs: Iterable[str]) -> None:
+        """Pré-compila as especificações dadas"""
+        for spec_text in specs:
+            self.lookup(spec_text)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+
+spec_cache = SpecCache()
+spec_cache.warm(EXAMPLES.values())
+
+
+def parse_spec_cached(spec_text: str) -> Tuple[Optional[TuringMachine], Optional[str]]:
+    """parse_spec() com o cache compartilhado do módulo"""
+    return spec_cache.parse(spec_text)
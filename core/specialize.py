@@ -0,0 +1,191 @@
+# Gera código Python especializado para uma máquina compilada
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+
+from .engine import HALT_RESULTS, CompiledMachine
+
+
+class SpecializedRun:
+    """Função `run(tape, head, max_steps, state)` gerada para uma tabela compilada.
+
+    A fita deve estar codificada com `compiled.symbols`. O retorno é o mesmo
+    `(passos, estado, cabeça, resultado)` de engine.execute(); `state` é o
+    índice compilado e começa, por padrão, no estado inicial.
+    """
+
+    def __init__(self, compiled: CompiledMachine, source: str, fn: Callable):
+        self.compiled = compiled
+        self.source = source
+        self._fn = fn
+
+    def __call__(self, tape, head: int, max_steps: int,
+                 state: Optional[int] = None) -> Tuple[int, int, int, Optional[str]]:
+        return self._fn(tape, head, max_steps, state)
+
+
+def table_digest(cm: CompiledMachine) -> str:
+    """Hash do conteúdo da tabela compilada"""
+    h = hashlib.sha256()
+    h.update(repr((cm.states, cm.symbols)).encode('utf-8'))
+    for arr in (cm.next_state, cm.write, cm.move):
+        h.update(arr.tobytes())
+    return h.hexdigest()
+
+
+# Cada lado da fita: (buffer, tamanho, movimento que afasta da célula 0)
+_SIDES = (('right', 'rlen', 1), ('left', 'llen', -1))
+
+
+def _move(side: int, mv: int, other: int) -> List[str]:
+    """Linhas que movem a cabeça; `other` é o bloco do mesmo estado no outro lado"""
+    buf, size, outward = _SIDES[side]
+    if not mv:
+        return []
+    if mv == outward:
+        return ["pos += 1",
+                f"if pos == {size}:",
+                f"    {buf}.extend(bytes({size}))",
+                f"    {size} += {size}"]
+    return ["pos -= 1",
+            "if pos < 0:",
+            "    pos = 0",
+            f"    at = {other}",
+            "    break"]
+
+
+def _block(cm: CompiledMachine, q: int, side: int) -> List[str]:
+    """Laço do estado `q` com a cabeça no lado `side` (0: células >= 0, 1: < 0)"""
+    n = cm.n_symbols
+    buf = _SIDES[side][0]
+    head = "pos" if side == 0 else "~pos"
+    row = range(q * n, q * n + n)
+    halts = {cm.next_state[pos] for pos in row}
+    if len(halts) == 1 and min(halts) < 0:
+        # Nenhum símbolo continua: o passo atual encerra
+        return ["for steps in it:",
+                f"    return steps, {q}, {head}, {HALT_RESULTS[min(halts)]!r}",
+                f"return steps, {q}, {head}, None"]
+    out = ["for steps in it:", f"    sym = {buf}[pos]"]
+    for pos in row:
+        sym = pos - q * n
+        ns = cm.next_state[pos]
+        if pos == row[-1] and n > 1:
+            test = "else:"
+        else:
+            test = f"{'if' if pos == row[0] else 'elif'} sym == {sym}:"
+        out.append(f"    {test}  # {cm.symbols[sym]!r}")
+        if ns < 0:
+            body = [f"return steps, {q}, {head}, {HALT_RESULTS[ns]!r}"]
+        else:
+            w, mv = cm.write[pos], cm.move[pos]
+            body = [f"{buf}[pos] = {w}"] if w != sym else []
+            if ns == q and not mv and w == sym:
+                # Laço parado sem efeito: repete até esgotar o limite
+                body.append(f"return max_steps, {q}, {head}, None")
+            else:
+                moved = _move(side, mv, 2 * ns + 1 - side)
+                body.extend(moved)
+                if ns != q:
+                    body.extend((f"at = {2 * ns + side}", "break"))
+                elif not body:
+                    body.append("pass")
+        out.extend("        " + line for line in body)
+    out.append("else:")
+    out.append(f"    return steps, {q}, {head}, None")
+    return out
+
+
+def _dispatch(cm: CompiledMachine, lo: int, hi: int, indent: str) -> List[str]:
+    # Árvore binária de `if` sobre `at = 2 * estado + lado`: log2 comparações por troca de estado
+    if hi - lo == 1:
+        q, side = divmod(lo, 2)
+        out = [f"{indent}# {cm.states[q]!r}, {'direita' if side == 0 else 'esquerda'}"]
+        return out + [indent + line for line in _block(cm, q, side)]
+    mid = (lo + hi) // 2
+    return ([f"{indent}if at < {mid}:"] + _dispatch(cm, lo, mid, indent + "    ")
+            + [f"{indent}else:"] + _dispatch(cm, mid, hi, indent + "    "))
+
+
+def generate_source(cm: CompiledMachine, start: int = 0) -> str:
+    """Código-fonte de `run()` com um laço por estado e despacho de símbolo embutido.
+
+    A função trabalha direto nos buffers `right` e `left` da fita, sem cópia:
+    cada estado tem um bloco para cada lado, em que `pos` cresce para longe
+    da célula 0, de modo que o teste de limite só é feito ao se afastar dela.
+    Os passos são contados por um único iterador de range() compartilhado
+    pelos blocos.
+    """
+    out: List[str] = [
+        "def run(tape, head, max_steps, state=None):",
+        "    if state is None:",
+        f"        state = {start}",
+        "    right, left = tape.right, tape.left",
+        "    if not right:",
+        "        right.append(0)",
+        "    if not left:",
+        "        left.append(0)",
+        "    at, pos = (2 * state, head) if head >= 0 else (2 * state + 1, ~head)",
+        "    buf = right if head >= 0 else left",
+        "    if pos >= len(buf):",
+        "        buf.extend(bytes(max(pos + 1, 2 * len(buf)) - len(buf)))",
+        "    rlen, llen = len(right), len(left)",
+        "    steps = 0",
+        "    it = iter(range(1, max_steps + 1))",
+        "    while True:",
+    ]
+    out.extend(_dispatch(cm, 0, 2 * cm.n_states, "        "))
+    return '\n'.join(out) + '\n'
+
+
+class SpecializedCache:
+    """Cache LRU das funções geradas, indexado pelo hash da tabela compilada.
+
+    O hash é calculado só na primeira consulta de cada CompiledMachine; as
+    seguintes encontram a função pelo objeto da tabela.
+    """
+
+    def __init__(self, maxsize: int = 64):
+        self.maxsize = maxsize
+        self._entries: 'OrderedDict[str, SpecializedRun]' = OrderedDict()
+        # (id da tabela, estado inicial) -> (tabela, função); a referência à
+        # tabela impede que o id seja reaproveitado enquanto estiver aqui
+        self._recent: 'OrderedDict[Tuple[int, int], Tuple[CompiledMachine, SpecializedRun]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, cm: CompiledMachine, start: int = 0) -> SpecializedRun:
+        with self._lock:
+            hit = self._recent.get((id(cm), start))
+            if hit is not None:
+                self._recent.move_to_end((id(cm), start))
+                return hit[1]
+        key = f"{table_digest(cm)}:{start}"
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None:
+            source = generate_source(cm, start)
+            namespace = {}
+            exec(compile(source, f"<tm-specialized {key[:12]}>", 'exec'), namespace)
+            entry = SpecializedRun(cm, source, namespace['run'])
+        with self._lock:
+            self._entries[key] = entry
+            self._recent[(id(cm), start)] = (cm, entry)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            while len(self._recent) > self.maxsize:
+                self._recent.popitem(last=False)
+        return entry
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._recent.clear()
+
+
+specialized_cache = SpecializedCache()
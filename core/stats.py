@@ -0,0 +1,111 @@
+# Contadores de cobertura e estatísticas de execução
+from array import array
+from typing import Dict, Optional, Tuple
+
+from .engine import HALT_RESULTS, CompiledMachine
+from .tape import Tape
+
+
+class RunStats:
+    """Estatísticas acumuladas por run(collect_stats=True).
+
+    `transition_hits[id]` conta quantas vezes cada posição `estado * n_symbols
+    + símbolo` da tabela compilada foi usada, inclusive no passo em que a
+    máquina para. Também guarda a extensão percorrida pela cabeça, o número de
+    inversões de sentido (movimentos 'N' são ignorados) e as células cujo
+    símbolo foi alterado alguma vez (`changed`; escritas do mesmo símbolo
+    não contam).
+    """
+
+    def __init__(self, compiled: CompiledMachine, head: int = 0):
+        self.compiled = compiled
+        self.transition_hits = array('q', [0]) * (compiled.n_states * compiled.n_symbols)
+        self.head_min = head
+        self.head_max = head
+        self.reversals = 0
+        self.last_move = 0
+        self.changed = Tape()
+
+    @property
+    def steps(self) -> int:
+        return sum(self.transition_hits)
+
+    @property
+    def state_hits(self) -> array:
+        """Passos executados em cada estado, indexados pelo id compilado"""
+        n = self.compiled.n_symbols
+        hits = self.transition_hits
+        return array('q', (sum(hits[q * n:q * n + n]) for q in range(self.compiled.n_states)))
+
+    @property
+    def cells_changed(self) -> int:
+        """Células distintas cujo símbolo mudou pelo menos uma vez"""
+        return len(self.changed)
+
+    def by_transition(self) -> Dict[Tuple[str, str], int]:
+        """Contagem por par `(estado, símbolo)`, só dos pares usados"""
+        cm = self.compiled
+        n = cm.n_symbols
+        return {(cm.states[pos // n], cm.symbols[pos % n]): hits
+                for pos, hits in enumerate(self.transition_hits) if hits}
+
+    def by_state(self) -> Dict[str, int]:
+        """Contagem por estado, só dos estados visitados"""
+        return {self.compiled.states[q]: hits
+                for q, hits in enumerate(self.state_hits) if hits}
+
+    def to_dict(self):
+        """Converte para dicionário serializável"""
+        return {
+            'steps': self.steps,
+            'transitions': {f"{s},{a}": hits for (s, a), hits in self.by_transition().items()},
+            'states': self.by_state(),
+            'head_min': self.head_min,
+            'head_max': self.head_max,
+            'reversals': self.reversals,
+            'cells_changed': self.cells_changed,
+        }
+
+
+def execute_stats(cm: CompiledMachine, tape, head: int, state: int, max_steps: int,
+                  stats: RunStats) -> Tuple[int, int, int, Optional[str]]:
+    """Executa como `execute`, acumulando os contadores em `stats`"""
+    if stats.compiled is not cm:
+        raise ValueError("A tabela compilada mudou durante a coleta de estatísticas")
+    table = cm.table
+    n = cm.n_symbols
+    base = state * n
+    hits = stats.transition_hits
+    changed = stats.changed
+    lo, hi = stats.head_min, stats.head_max
+    last = stats.last_move
+    reversals = stats.reversals
+    steps = 0
+    result = None
+    while steps < max_steps:
+        sym = tape.read_code(head)
+        pos = base + sym
+        nb, w, mv = table[pos]
+        steps += 1
+        hits[pos] += 1
+        if nb < 0:
+            result = HALT_RESULTS[nb]
+            break
+        if w != sym:
+            tape.write_code(head, w)
+            changed.write_code(head, 1)
+        if mv:
+            if mv != last:
+                if last:
+                    reversals += 1
+                last = mv
+            head += mv
+            if head < lo:
+                lo = head
+            elif head > hi:
+                hi = head
+        base = nb
+    stats.head_min, stats.head_max = lo, hi
+    stats.last_move = last
+    stats.reversals = reversals
+    return steps, base // n, head, result
@@ -0,0 +1,263 @@
+# Fita densa de dois lados para a Máquina de Turing
+import re
+from collections.abc import MutableMapping
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+MAX_SYMBOLS = 256
+
+_NON_BLANK = re.compile(b'[^\x00]')
+
+
+class Tape(MutableMapping):
+    """Fita infinita nos dois sentidos, guardada em dois `bytearray`.
+
+    `right[i]` guarda a célula `i >= 0` e `left[i]` guarda a célula `-1 - i`.
+    Cada célula ocupa um byte com o código do símbolo em `symbols`; o código 0
+    é sempre o branco. Os buffers crescem dobrando de tamanho.
+
+    Como mapeamento `int -> str` a fita se comporta como o antigo dicionário
+    esparso: células em branco são tratadas como ausentes.
+    """
+
+    __slots__ = ('blank', 'symbols', 'codes', 'right', 'left')
+
+    def __init__(self, blank: str = '_', cells: Optional[Mapping[int, str]] = None,
+                 symbols: Optional[Iterable[str]] = None):
+        self.blank = blank
+        self.symbols: List[str] = [blank]
+        self.codes: Dict[str, int] = {blank: 0}
+        for sym in symbols or ():
+            self.code(sym)
+        self.right = bytearray()
+        self.left = bytearray()
+        if cells:
+            for i, sym in cells.items():
+                self[i] = sym
+
+    @classmethod
+    def from_string(cls, blank: str, input_string: str,
+                    symbols: Optional[Iterable[str]] = None) -> 'Tape':
+        """Cria a fita com `input_string` a partir da célula 0"""
+        tape = cls(blank, symbols=symbols)
+        for ch in set(input_string):
+            tape.code(ch)
+        if input_string:
+            table = {ord(s): c for s, c in tape.codes.items() if len(s) == 1}
+            tape.right = bytearray(input_string.translate(table), 'latin-1')
+        return tape
+
+    def code(self, symbol: str) -> int:
+        """Retorna o código do símbolo, registrando-o se for novo"""
+        c = self.codes.get(symbol)
+        if c is None:
+            c = len(self.symbols)
+            if c >= MAX_SYMBOLS:
+                raise ValueError(
+                    f"A fita suporta no máximo {MAX_SYMBOLS} símbolos distintos")
+            self.symbols.append(symbol)
+            self.codes[symbol] = c
+        return c
+
+    def recode(self, symbols: List[str]) -> None:
+        """Adota a tabela `symbols` (branco primeiro), traduzindo as células"""
+        if symbols[:len(self.symbols)] == self.symbols:
+            self.symbols = list(symbols)
+        else:
+            codes = {s: i for i, s in enumerate(symbols)}
+            table = bytearray(range(MAX_SYMBOLS))
+            for old, sym in enumerate(self.symbols):
+                table[old] = codes[sym]
+            self.right = self.right.translate(table)
+            self.left = self.left.translate(table)
+            self.symbols = list(symbols)
+        if len(self.symbols) > MAX_SYMBOLS:
+            raise ValueError(
+                f"A fita suporta no máximo {MAX_SYMBOLS} símbolos distintos")
+        self.codes = {s: i for i, s in enumerate(self.symbols)}
+
+    def read_code(self, index: int) -> int:
+        if index >= 0:
+            return self.right[index] if index < len(self.right) else 0
+        index = -1 - index
+        return self.left[index] if index < len(self.left) else 0
+
+    def write_code(self, index: int, code: int) -> None:
+        if index >= 0:
+            buf = self.right
+        else:
+            buf, index = self.left, -1 - index
+        if index >= len(buf):
+            if not code:
+                return
+            buf.extend(bytes(max(index + 1, 2 * len(buf)) - len(buf)))
+        buf[index] = code
+
+    def get(self, index: int, default: Optional[str] = None) -> Optional[str]:
+        c = self.read_code(index)
+        return self.symbols[c] if c else default
+
+    def __getitem__(self, index: int) -> str:
+        c = self.read_code(index)
+        if not c:
+            raise KeyError(index)
+        return self.symbols[c]
+
+    def __setitem__(self, index: int, symbol: str) -> None:
+        self.write_code(index, self.code(symbol))
+
+    def __delitem__(self, index: int) -> None:
+        if not self.read_code(index):
+            raise KeyError(index)
+        self.write_code(index, 0)
+
+    def __contains__(self, index) -> bool:
+        return isinstance(index, int) and self.read_code(index) != 0
+
+    def __iter__(self) -> Iterator[int]:
+        left = [-1 - m.start() for m in _NON_BLANK.finditer(self.left)]
+        yield from reversed(left)
+        for m in _NON_BLANK.finditer(self.right):
+            yield m.start()
+
+    def __len__(self) -> int:
+        return (len(self.right) - self.right.count(0)
+                + len(self.left) - self.left.count(0))
+
+    def span(self, trim: bool = False) -> Tuple[int, bytes]:
+        """Retorna `(início, códigos)` do trecho contíguo que cobre os buffers.
+
+        Com `trim=True` os brancos das pontas são removidos; a fita toda em
+        branco resulta sempre em `(0, b'')`, independente do tamanho dos buffers.
+        """
+        start, data = -len(self.left), bytes(self.left[::-1] + self.right)
+        if trim:
+            trimmed = data.lstrip(b'\x00')
+            if not trimmed:
+                return 0, b''
+            start += len(data) - len(trimmed)
+            data = trimmed.rstrip(b'\x00')
+        return start, data
+
+    def load_span(self, start: int, data: bytes) -> None:
+        """Substitui o conteúdo da fita por `data` a partir da célula `start`"""
+        if start >= 0:
+            self.left = bytearray()
+            self.right = bytearray(start) + data
+        else:
+            cut = min(-start, len(data))
+            self.left = bytearray(-start - cut) + bytes(data[:cut])[::-1]
+            self.right = bytearray(data[cut:])
+
+    def bounds(self) -> Optional[Tuple[int, int]]:
+        """`(primeira, última)` célula não branca, ou None se a fita estiver vazia.
+
+        Cada símbolo é procurado com find()/rfind() direto nos buffers, sem
+        copiá-los, em janelas que crescem a partir das pontas; o custo
+        acompanha as margens em branco, não o tamanho da fita.
+        """
+        codes = range(1, len(self.symbols))
+        right = _last_code(self.right, codes)
+        left = _last_code(self.left, codes)
+        if right < 0 and left < 0:
+            return None
+        lo = -1 - left if left >= 0 else _first_code(self.right, codes)
+        hi = right if right >= 0 else -1 - _first_code(self.left, codes)
+        return lo, hi
+
+    def read_span(self, start: int, end: int) -> bytes:
+        """Códigos das células `start..end` (inclusive) em uma única cópia"""
+        if end < start:
+            return b''
+        out = bytearray()
+        if start < 0:
+            lo, hi = -1 - min(end, -1), -1 - start
+            chunk = self.left[lo:hi + 1]
+            out += bytes(hi + 1 - lo - len(chunk)) + chunk[::-1]
+        if end >= 0:
+            lo = max(start, 0)
+            chunk = self.right[lo:end + 1]
+            out += chunk + bytes(end + 1 - lo - len(chunk))
+        return bytes(out)
+
+    def decode(self, codes: bytes) -> str:
+        """Converte códigos em texto, com o símbolo branco nas células vazias"""
+        return codes.decode('latin-1').translate(dict(enumerate(self.symbols)))
+
+    def iter_cells(self, start: int, end: int, chunk: int = 4096) -> Iterator[Tuple[int, str]]:
+        """Gera `(célula, símbolo)` de `start` a `end`, lendo a fita em blocos"""
+        symbols = self.symbols
+        for lo in range(start, end + 1, chunk):
+            for i, c in enumerate(self.read_span(lo, min(lo + chunk - 1, end)), lo):
+                yield i, symbols[c]
+
+    def snapshot(self, lo: int, hi: int) -> Tuple[int, bytes]:
+        """Cópia das células `lo..hi` presentes nos buffers: `(início, códigos)`"""
+        lo = max(lo, -len(self.left))
+        hi = min(hi, len(self.right) - 1)
+        return lo, self.read_span(lo, hi)
+
+    def changed(self, old: Tuple[int, bytes], lo: int, hi: int) -> Iterator[int]:
+        """Células de `lo..hi` que diferem de `old` (de snapshot(); fora dele, branco).
+
+        Só o intervalo pedido é lido e comparado, em blocos; os blocos
+        diferentes são percorridos célula a célula.
+        """
+        start, data = old
+        a, b = max(lo, start), min(hi, start + len(data) - 1)
+        prev = bytes(a - lo) + data[a - start:b - start + 1] if a <= b else b''
+        for i in _diff(self.read_span(lo, hi), prev):
+            yield lo + i
+
+    def clear(self) -> None:
+        self.right = bytearray()
+        self.left = bytearray()
+
+    def copy(self) -> 'Tape':
+        tape = Tape(self.blank, symbols=self.symbols[1:])
+        tape.right = bytearray(self.right)
+        tape.left = bytearray(self.left)
+        return tape
+
+    def __repr__(self) -> str:
+        return f"Tape({dict(self.items())!r})"
+
+
+_CHUNK = 4096
+
+
+def _diff(a: bytearray, b: bytearray) -> Iterator[int]:
+    """Índices em que `a` e `b` diferem, tratando o excedente como branco"""
+    size = max(len(a), len(b))
+    for lo in range(0, size, _CHUNK):
+        hi = min(lo + _CHUNK, size)
+        x = bytes(a[lo:hi]).ljust(hi - lo, b'\x00')
+        y = bytes(b[lo:hi]).ljust(hi - lo, b'\x00')
+        if x != y:
+            for i in range(hi - lo):
+                if x[i] != y[i]:
+                    yield lo + i
+
+
+def _first_code(buf: bytearray, codes: range) -> int:
+    """Índice do primeiro byte de `buf` com algum código de `codes`, ou -1"""
+    lo, size = 0, _CHUNK
+    # Janelas crescentes a partir do início: o custo acompanha a margem em branco
+    while lo < len(buf):
+        hi = min(len(buf), lo + size)
+        found = [i for i in (buf.find(c, lo, hi) for c in codes) if i >= 0]
+        if found:
+            return min(found)
+        lo, size = hi, size * 2
+    return -1
+
+
+def _last_code(buf: bytearray, codes: range) -> int:
+    """Índice do último byte de `buf` com algum código de `codes`, ou -1"""
+    hi, size = len(buf), _CHUNK
+    while hi > 0:
+        lo = max(0, hi - size)
+        found = max((buf.rfind(c, lo, hi) for c in codes), default=-1)
+        if found >= 0:
+            return found
+        hi, size = lo, size * 2
+    return -1
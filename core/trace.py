@@ -0,0 +1,156 @@
+# Gravação compacta do histórico de execução
+import ast
+import struct
+import sys
+import zipfile
+from array import array
+from typing import Dict, Optional, Tuple
+
+from .engine import HALT_RESULTS, CompiledMachine
+
+# Tipos de array -> descrição de dtype do formato .npy
+_DESCR = {'b': '|i1', 'B': '|u1', 'i': '<i4', 'q': '<i8'}
+_TYPECODE = {v: k for k, v in _DESCR.items()}
+
+
+class TraceRecorder:
+    """Registra cada passo de run() como `(id da transição, deslocamento da cabeça)`.
+
+    O id da transição é a posição `estado * n_symbols + símbolo` na tabela
+    compilada, inclusive no passo em que a máquina para. Com `snapshot_every`
+    > 0, uma configuração completa (estado, cabeça e fita) é guardada a cada
+    tantos passos; a configuração inicial é sempre guardada.
+    """
+
+    def __init__(self, snapshot_every: int = 0):
+        self.snapshot_every = snapshot_every
+        self.compiled: Optional[CompiledMachine] = None
+        self.transition_ids = array('i')
+        self.head_deltas = array('b')
+        self.snapshot_steps = array('q')
+        self.snapshot_states = array('i')
+        self.snapshot_heads = array('q')
+        self.snapshot_starts = array('q')
+        self.snapshot_offsets = array('q', [0])
+        self.snapshot_cells = bytearray()
+
+    @property
+    def steps(self) -> int:
+        return len(self.transition_ids)
+
+    def snapshot(self, state: int, head: int, tape) -> None:
+        start, cells = tape.span(trim=True)
+        self.snapshot_steps.append(self.steps)
+        self.snapshot_states.append(state)
+        self.snapshot_heads.append(head)
+        self.snapshot_starts.append(start)
+        self.snapshot_cells += cells
+        self.snapshot_offsets.append(len(self.snapshot_cells))
+
+    def columns(self) -> Dict[str, array]:
+        """Colunas do traço, no formato exportado por save()"""
+        cm = self.compiled
+        cols = {
+            'transition_id': self.transition_ids,
+            'head_delta': self.head_deltas,
+            'snapshot_step': self.snapshot_steps,
+            'snapshot_state': self.snapshot_states,
+            'snapshot_head': self.snapshot_heads,
+            'snapshot_start': self.snapshot_starts,
+            'snapshot_offset': self.snapshot_offsets,
+            'snapshot_cells': array('B', self.snapshot_cells),
+        }
+        if cm is not None:
+            cols.update({
+                'next_state': cm.next_state,
+                'write': cm.write,
+                'move': cm.move,
+                'states': cm.states,
+                'symbols': cm.symbols,
+            })
+        return cols
+
+    def save(self, path: str) -> None:
+        """Exporta o traço como `.npz` comprimido (carregável com numpy.load)"""
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+            for name, values in self.columns().items():
+                zf.writestr(name + '.npy', _npy(values))
+
+
+def _npy(values) -> bytes:
+    if isinstance(values, list):
+        width = max((len(s) for s in values), default=1) or 1
+        descr = f'<U{width}'
+        data = ''.join(s.ljust(width, '\0') for s in values).encode('utf-32-le')
+    else:
+        descr = _DESCR[values.typecode]
+        if sys.byteorder == 'big' and values.itemsize > 1:
+            values = array(values.typecode, values)
+            values.byteswap()
+        data = values.tobytes()
+    header = f"{{'descr': '{descr}', 'fortran_order': False, 'shape': ({len(values)},), }}"
+    pad = 64 - (10 + len(header) + 1) % 64
+    header = (header + ' ' * pad + '\n').encode('latin-1')
+    return b'\x93NUMPY\x01\x00' + struct.pack('<H', len(header)) + header + data
+
+
+def load_trace(path: str) -> Dict[str, object]:
+    """Lê um traço salvo por TraceRecorder.save() sem depender do numpy"""
+    cols = {}
+    with zipfile.ZipFile(path) as zf:
+        for name in zf.namelist():
+            raw = zf.read(name)
+            (size,) = struct.unpack_from('<H', raw, 8)
+            header = ast.literal_eval(raw[10:10 + size].decode('latin-1'))
+            data = raw[10 + size:]
+            descr = header['descr']
+            if descr.startswith('<U'):
+                width = int(descr[2:])
+                text = data.decode('utf-32-le')
+                values = [text[i:i + width].rstrip('\0') for i in range(0, len(text), width)]
+            else:
+                values = array(_TYPECODE[descr])
+                values.frombytes(data)
+                if sys.byteorder == 'big' and values.itemsize > 1:
+                    values.byteswap()
+            cols[name[:-4]] = values
+    return cols
+
+
+def execute_trace(cm: CompiledMachine, tape, head: int, state: int, max_steps: int,
+                  recorder: TraceRecorder) -> Tuple[int, int, int, Optional[str]]:
+    """Executa como `execute`, registrando cada passo em `recorder`"""
+    if recorder.compiled is None:
+        recorder.compiled = cm
+    elif recorder.compiled is not cm:
+        raise ValueError("A tabela compilada mudou durante a gravação do traço")
+    if not recorder.snapshot_steps:
+        recorder.snapshot(state, head, tape)
+    table = cm.table
+    n = cm.n_symbols
+    base = state * n
+    tids = recorder.transition_ids
+    deltas = recorder.head_deltas
+    every = recorder.snapshot_every
+    next_snapshot = (recorder.steps // every + 1) * every if every > 0 else -1
+    steps = 0
+    result = None
+    while steps < max_steps:
+        sym = tape.read_code(head)
+        pos = base + sym
+        nb, w, mv = table[pos]
+        steps += 1
+        tids.append(pos)
+        if nb < 0:
+            deltas.append(0)
+            result = HALT_RESULTS[nb]
+            break
+        deltas.append(mv)
+        if w != sym:
+            tape.write_code(head, w)
+        head += mv
+        base = nb
+        if len(tids) == next_snapshot:
+            recorder.snapshot(base // n, head, tape)
+            next_snapshot += every
+    return steps, base // n, head, result
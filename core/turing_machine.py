@@ -1,12 +1,29 @@
 from dataclasses import dataclass, field
-from typing import Dict, Tuple, Set, Optional
+from typing import Dict, Iterable, List, Optional, Set, TextIO, Tuple, Union
+
+from .analysis import MinimizeReport, minimize as minimize_machine, prune as prune_machine
+from .cycles import execute_detect
+from .engine import CompiledMachine, compile_machine, execute
+from .macro import MacroSimulator
+from .multitape import MultiTapeMachine
+from .ntm import NondeterministicMachine
+from .rle import RunLengthTape, execute_rle
+from .specialize import SpecializedRun, specialized_cache
+from . import snapshot
+from .stats import RunStats, execute_stats
+from .tape import Tape
+from .trace import TraceRecorder, execute_trace
 
 Move = str  # 'L' | 'R' | 'N'
+# Células guardadas por track_changes() antes de descartar as alterações mais antigas
+MAX_TRACKED_CELLS = 16384
 Transition = Tuple[str, str, Move]
 
 
 @dataclass
 class TuringMachine:
+    n_tapes = 1
+
     states: Set[str]
     input_symbols: Set[str]
     tape_symbols: Set[str]
@@ -15,40 +32,85 @@ class TuringMachine:
     start_state: str
     accept_states: Set[str]
     reject_states: Set[str]
-    tape: Dict[int, str] = field(default_factory=dict)
+    tape: Optional[Tape] = None
     head: int = 0
     current_state: Optional[str] = None
     halted: bool = False
-    # 'ACCEPT' | 'REJECT' | 'NO_TRANSITION' | 'MAX_STEPS'
+    # 'ACCEPT' | 'REJECT' | 'NO_TRANSITION' | 'MAX_STEPS' | 'LOOP'
     result: Optional[str] = None
+    # Preenchidos quando result == 'LOOP' (passos contados desde o início do run())
+    loop_start: Optional[int] = None
+    loop_period: Optional[int] = None
+    # Preenchido por run(collect_stats=True); zerado em reset()
+    stats: Optional[RunStats] = field(default=None, repr=False, compare=False)
+    # Incrementado a cada alteração da máquina (veja delta())
+    version: int = field(default=0, compare=False)
+    _compiled: Optional[CompiledMachine] = field(
+        default=None, init=False, repr=False, compare=False)
+    # Célula -> versão da última escrita, em ordem de versão; None até o primeiro delta()
+    _dirty: Optional[Dict[int, int]] = field(
+        default=None, init=False, repr=False, compare=False)
+    _tracked_since: int = field(default=0, init=False, repr=False, compare=False)
+    _dirty_limit: int = field(default=MAX_TRACKED_CELLS, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if not isinstance(self.tape, Tape):
+            self.tape = Tape(self.blank, self.tape or {})
 
     def reset(self, input_string: str):
-        self.tape = {}
-        for i, ch in enumerate(input_string):
-            self.tape[i] = ch
+        symbols = self._compiled.symbols[1:] if self._compiled else None
+        self.tape = Tape.from_string(self.blank, input_string, symbols)
         self.head = 0
         self.current_state = self.start_state
         self.halted = False
         self.result = None
+        self.loop_start = self.loop_period = None
+        self.stats = None
+        self.version += 1
+        if self._dirty is not None:
+            # A fita foi trocada: versões anteriores recebem o estado completo
+            self._dirty.clear()
+            self._tracked_since = self.version
+
+    def _touch(self, cells: Iterable[int] = ()) -> None:
+        """Avança a versão e marca as células alteradas"""
+        self.version += 1
+        dirty = self._dirty
+        if dirty is not None:
+            for i in cells:
+                dirty.pop(i, None)
+                dirty[i] = self.version
+            if len(dirty) > self._dirty_limit:
+                self._compact()
+
+    def _compact(self) -> None:
+        """Descarta as alterações mais antigas, ficando com metade do limite.
+
+        A versão da última célula descartada passa a ser o piso de delta():
+        um `since` anterior a ele recebe a resposta completa.
+        """
+        items = list(self._dirty.items())
+        drop = len(items) - self._dirty_limit // 2
+        self._tracked_since = max(self._tracked_since, items[drop - 1][1])
+        self._dirty = dict(items[drop:])
 
     def read(self) -> str:
         return self.tape.get(self.head, self.blank)
 
     def write(self, symbol: str):
-        if symbol == self.blank:
-            if self.head in self.tape:
-                del self.tape[self.head]
-        else:
-            self.tape[self.head] = symbol
+        self.tape[self.head] = symbol
+        self._touch((self.head,))
 
     def step(self) -> None:
         if self.halted:
             return
         if self.current_state in self.accept_states:
             self.halted, self.result = True, 'ACCEPT'
+            self._touch()
             return
         if self.current_state in self.reject_states:
             self.halted, self.result = True, 'REJECT'
+            self._touch()
             return
 
         sym = self.read()
@@ -56,6 +118,7 @@ class TuringMachine:
         if key not in self.transitions:
             self.halted = True
             self.result = 'NO_TRANSITION'
+            self._touch()
             return
         new_state, write_sym, move = self.transitions[key]
         self.write(write_sym)
@@ -69,20 +132,212 @@ class TuringMachine:
             raise ValueError(f"Movimento inválido: {move}")
         self.current_state = new_state
 
-    def run(self, max_steps: int = 1000):
+    def compile(self) -> CompiledMachine:
+        """Compila as transições para a tabela indexada usada por run().
+
+        A tabela fica em cache na instância; chame compile() de novo depois de
+        alterar `transitions`, `accept_states` ou `reject_states`.
+        """
+        self._compiled = compile_machine(
+            self, extra_states=[self.current_state],
+            extra_symbols=self.tape.symbols)
+        return self._compiled
+
+    def _compiled_for_tape(self) -> CompiledMachine:
+        cm = self._compiled
+        if cm is None or not cm.covers([self.current_state], self.tape.symbols):
+            cm = self.compile()
+        if self.tape.symbols != cm.symbols:
+            self.tape.recode(cm.symbols)
+        return cm
+
+    def run(self, max_steps: int = 1000, rle: bool = False, detect_loops: bool = False,
+            trace: Optional[TraceRecorder] = None, halt_on_limit: bool = True,
+            collect_stats: bool = False, specialized: bool = False,
+            macro: Optional[MacroSimulator] = None):
+        """Executa até parar ou até `max_steps` passos.
+
+        Com `rle=True` a fita é tratada em run-length e cada corrida varrida por
+        um laço `q,a -> q,a,L/R` é saltada de uma vez, mantendo a contagem exata
+        de passos.
+
+        Com `detect_loops=True` a execução para com result='LOOP' assim que uma
+        configuração (estado, cabeça, fita) se repete; `loop_start` e
+        `loop_period` indicam onde o ciclo começa e seu comprimento.
+
+        Com `trace` cada passo é registrado no `TraceRecorder` informado.
+
+        Com `collect_stats=True` os contadores de cobertura são acumulados em
+        `self.stats` (veja core.stats.RunStats) até o próximo reset().
+
+        Com `specialized=True` a execução usa a função gerada por specialize().
+
+        Com `macro` a fita é simulada em blocos pelo `MacroSimulator` informado,
+        que memoiza o efeito de cada bloco (útil para execuções muito longas).
+
+        Com `halt_on_limit=False` atingir `max_steps` não encerra a máquina com
+        'MAX_STEPS', permitindo continuar a execução em fatias.
+        """
+        options = (rle, detect_loops, trace is not None, collect_stats, specialized,
+                   macro is not None)
+        if sum(options) > 1:
+            raise ValueError("As opções rle, detect_loops, trace, collect_stats, specialized "
+                             "e macro não podem ser combinadas")
+        if self.halted:
+            return 0
         steps = 0
-        while not self.halted and steps < max_steps:
+        version = self.version
+        changed = ()
+        if max_steps > 0 and self.current_state is None:
+            # Máquina não inicializada: step() para com NO_TRANSITION
             self.step()
-            steps += 1
-        if not self.halted and steps >= max_steps:
+            steps = 1
+        elif max_steps > 0:
+            cm = self._compiled_for_tape()
+            state = cm.state_index[self.current_state]
+            # A cabeça anda no máximo uma célula por passo: só esse trecho pode mudar
+            start_head = self.head
+            before = (self.tape.snapshot(start_head - max_steps, start_head + max_steps)
+                      if self._dirty is not None else None)
+            if rle:
+                rt = RunLengthTape.from_tape(self.tape, self.head)
+                steps, state, head, result = execute_rle(
+                    cm, rt, self.head, state, max_steps)
+                rt.store(self.tape, head)
+                self.head = head
+            elif detect_loops:
+                steps, state, self.head, result, self.loop_start, self.loop_period = \
+                    execute_detect(cm, self.tape, self.head, state, max_steps)
+            elif macro is not None:
+                steps, state, self.head, result = macro.execute(
+                    cm, self.tape, self.head, state, max_steps)
+            elif specialized:
+                fn = specialized_cache.get(cm, cm.state_index[self.start_state])
+                steps, state, self.head, result = fn(self.tape, self.head, max_steps, state)
+            elif collect_stats:
+                if self.stats is None or self.stats.compiled is not cm:
+                    self.stats = RunStats(cm, self.head)
+                steps, state, self.head, result = execute_stats(
+                    cm, self.tape, self.head, state, max_steps, self.stats)
+            elif trace is not None:
+                steps, state, self.head, result = execute_trace(
+                    cm, self.tape, self.head, state, max_steps, trace)
+            else:
+                steps, state, self.head, result = execute(
+                    cm, self.tape, self.head, state, max_steps)
+            self.current_state = cm.states[state]
+            if result is not None:
+                self.halted, self.result = True, result
+            if before is not None:
+                changed = self.tape.changed(before, start_head - steps, start_head + steps)
+        if halt_on_limit and not self.halted and steps >= max_steps:
             self.halted = True
             self.result = 'MAX_STEPS'
+        if self.version == version and (steps or self.halted):
+            self._touch(changed)
         return steps
 
+    def specialize(self) -> SpecializedRun:
+        """Gera (ou reaproveita do cache) a função Python específica desta máquina.
+
+        A função `run(tape, head, max_steps, state)` tem um laço por estado e
+        lado da fita, com o despacho de símbolos embutido, e trabalha direto
+        nos buffers da fita; o código fica em `.source`. A fita
+        passada deve usar a tabela de símbolos da máquina compilada.
+        """
+        cm = self._compiled_for_tape()
+        return specialized_cache.get(cm, cm.state_index[self.start_state])
+
+    def minimize(self) -> Tuple['TuringMachine', MinimizeReport]:
+        """Máquina equivalente com os estados indistinguíveis fundidos.
+
+        Retorna `(máquina, relatório)`; a nova máquina dá o mesmo resultado e
+        número de passos em run(). Veja core.analysis.minimize().
+        """
+        return minimize_machine(self)
+
     def window_cells(self, span: int = 25):
         left = self.head - span
         right = self.head + span
-        return [(i, self.tape.get(i, self.blank), (i == self.head)) for i in range(left, right + 1)]
+        return [(i, sym, (i == self.head)) for i, sym in self.iter_tape(left, right)]
+
+    def tape_bounds(self) -> Optional[Tuple[int, int]]:
+        """`(primeira, última)` célula não branca, ou None com a fita vazia"""
+        return self.tape.bounds()
+
+    def _tape_range(self, start: Optional[int], end: Optional[int]) -> Optional[Tuple[int, int]]:
+        if start is None or end is None:
+            bounds = self.tape.bounds()
+            if bounds is None:
+                return None
+            start = bounds[0] if start is None else start
+            end = bounds[1] if end is None else end
+        return start, end
+
+    def tape_string(self, start: Optional[int] = None, end: Optional[int] = None) -> str:
+        """Conteúdo da fita de `start` a `end` (padrão: tape_bounds()), brancos incluídos"""
+        cells = self._tape_range(start, end)
+        return self.tape.decode(self.tape.read_span(*cells)) if cells else ''
+
+    def iter_tape(self, start: Optional[int] = None, end: Optional[int] = None):
+        """Gera `(célula, símbolo)` de `start` a `end` sem montar listas intermediárias"""
+        cells = self._tape_range(start, end)
+        return self.tape.iter_cells(*cells) if cells else iter(())
+
+    def track_changes(self, limit: int = MAX_TRACKED_CELLS) -> None:
+        """Passa a registrar as células alteradas a partir da versão atual.
+
+        Guarda no máximo `limit` células; acima disso as alterações mais
+        antigas são descartadas e clientes com versões anteriores a elas
+        recebem a resposta completa em delta().
+        """
+        self._dirty_limit = max(1, limit)
+        if self._dirty is None:
+            self._dirty = {}
+            self._tracked_since = self.version
+
+    def delta(self, since: int, window: Optional[Tuple[int, int]] = None):
+        """Alterações desde a versão `since` de um cliente.
+
+        Retorna as células escritas depois de `since` (com o branco quando a
+        célula foi apagada), cabeça, estado e situação de parada. `window =
+        (início, fim)` limita as células ao intervalo fechado informado.
+
+        O rastreamento começa em track_changes() ou na primeira chamada; se
+        `since` for anterior a ele, a um reset() ou às alterações já
+        descartadas pelo limite de track_changes(), a resposta vem com
+        `full=True` e todas as células não brancas, e o cliente deve descartar
+        a fita que tinha.
+        """
+        full = self._dirty is None or not self._tracked_since <= since <= self.version
+        if self._dirty is None:
+            self.track_changes()
+        if window is None:
+            lo, hi = None, None
+        else:
+            lo, hi = window
+        if full:
+            if window is None:
+                cells = list(self.tape.items())
+            else:
+                cells = [(i, sym) for i, sym in self.iter_tape(lo, hi) if sym != self.blank]
+        else:
+            cells = []
+            for i, v in reversed(self._dirty.items()):
+                if v <= since:
+                    break
+                if window is None or lo <= i <= hi:
+                    cells.append((i, self.tape.get(i, self.blank)))
+            cells.sort()
+        return {
+            'version': self.version,
+            'full': full,
+            'cells': [[i, sym] for i, sym in cells],
+            'head': self.head,
+            'current_state': self.current_state,
+            'halted': self.halted,
+            'result': self.result,
+        }
 
     def to_dict(self):
         """Converte para dicionário serializável"""
@@ -99,7 +354,11 @@ class TuringMachine:
             'head': self.head,
             'current_state': self.current_state,
             'halted': self.halted,
-            'result': self.result
+            'result': self.result,
+            'loop_start': self.loop_start,
+            'loop_period': self.loop_period,
+            'stats': self.stats.to_dict() if self.stats else None,
+            'version': self.version
         }
 
     @classmethod
@@ -123,83 +382,221 @@ class TuringMachine:
             head=data['head'],
             current_state=data['current_state'],
             halted=data['halted'],
-            result=data['result']
+            result=data['result'],
+            loop_start=data.get('loop_start'),
+            loop_period=data.get('loop_period'),
+            version=data.get('version', 0)
         )
 
+    def to_bytes(self, compress: bool = False) -> bytes:
+        """Snapshot binário compacto (veja core.snapshot); `compress` usa zlib"""
+        return snapshot.to_bytes(self, compress)
 
-def parse_spec(spec_text: str):
-    """Parser da DSL para Máquina de Turing"""
-    try:
-        lines = []
-        for raw in spec_text.splitlines():
-            s = raw.strip()
-            if not s or s.startswith('#'):
-                continue
-            lines.append(s)
-        text = '\n'.join(lines)
-
-        if 'transitions:' not in text:
-            return None, "Especificação precisa da seção 'transitions:'"
-        head, body = text.split('transitions:', 1)
-
-        header: Dict[str, str] = {}
-        for line in head.splitlines():
-            if ':' in line:
-                k, v = [x.strip() for x in line.split(':', 1)]
-                v_clean = v.strip()
-                if (v_clean.startswith("'") and v_clean.endswith("'")) or (v_clean.startswith('"') and v_clean.endswith('"')):
-                    v_clean = v_clean[1:-1]
-                header[k.lower()] = v_clean
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        """Cria instância a partir de um snapshot de to_bytes()"""
+        return snapshot.from_bytes(cls, data)
+
+
+class _SpecError(Exception):
+    """Erro de especificação com a mensagem exibida ao usuário"""
+
+
+class _SpecBuilder:
+    """Monta a máquina linha a linha, sem guardar o texto da especificação"""
+
+    def __init__(self, nondeterministic: bool = False):
+        self.nondeterministic = nondeterministic
+        self.header: Dict[str, str] = {}
+        self.in_body = False
+        self.blank = ''
+        self.transitions: Dict[Tuple[str, str], Transition] = {}
+        # Modo não determinístico: todas as transições de cada par, em ordem
+        self.options: Dict[Tuple[str, str], List[Transition]] = {}
+        self.n_tapes: Optional[int] = None
+        self.tape_symbols: Set[str] = set()
+        self.input_symbols: Set[str] = set()
 
+    def feed(self, line: str) -> None:
+        """Processa uma linha já sem espaços nas pontas e sem comentário"""
+        if self.in_body:
+            self._transition(line)
+            return
+        if 'transitions:' not in line:
+            self._header(line)
+            return
+        head, rest = line.split('transitions:', 1)
+        self._header(head)
+        self._begin_body()
+        if rest:
+            self._transition(rest)
+
+    def _header(self, line: str) -> None:
+        if ':' in line:
+            k, v = [x.strip() for x in line.split(':', 1)]
+            v_clean = v.strip()
+            if (v_clean.startswith("'") and v_clean.endswith("'")) or (v_clean.startswith('"') and v_clean.endswith('"')):
+                v_clean = v_clean[1:-1]
+            self.header[k.lower()] = v_clean
+
+    def _begin_body(self) -> None:
+        self.in_body = True
         required = ['states', 'blank', 'start', 'accept', 'reject']
         for r in required:
-            if r not in header:
-                return None, f"Campo obrigatório ausente: {r}"
-
-        states = set([s.strip()
-                     for s in header['states'].split(',') if s.strip()])
-        blank = header['blank']
+            if r not in self.header:
+                raise _SpecError(f"Campo obrigatório ausente: {r}")
+        blank = self.header['blank']
         if blank == "":
             blank = "_"
         if len(blank) != 1:
-            return None, "O campo 'blank' deve conter exatamente 1 caractere (ex.: _ ou espaço)."
+            raise _SpecError(
+                "O campo 'blank' deve conter exatamente 1 caractere (ex.: _ ou espaço).")
+        self.blank = blank
+        self.tape_symbols.add(blank)
 
-        start = header['start']
-        accept = set([s.strip()
-                     for s in header['accept'].split(',') if s.strip()])
-        reject = set([s.strip()
-                     for s in header['reject'].split(',') if s.strip()])
+    def _transition(self, line: str) -> None:
+        if '->' not in line or ',' not in line:
+            raise _SpecError(f"Linha de transição inválida: {line}")
+        left, right = [x.strip() for x in line.split('->', 1)]
+        reads = [x.strip() for x in left.split(',')]
+        k = len(reads) - 1
+        if k > 1 and right.count(',') != 2:
+            self._multitape_transition(line, reads, right)
+            return
+        self._check_tapes(1, line)
+        s_state, s_read = [x.strip() for x in left.split(',', 1)]
+        n_state, s_write, s_move = [x.strip() for x in right.split(',', 2)]
+        if s_move not in ('L', 'R', 'N'):
+            raise _SpecError(f"Movimento inválido em: {line}")
+        transition = (n_state, s_write, s_move)
+        self.transitions[(s_state, s_read)] = transition
+        options = self.options.setdefault((s_state, s_read), [])
+        if transition not in options:
+            options.append(transition)
+        self.tape_symbols.add(s_read)
+        self.tape_symbols.add(s_write)
+        if s_read != self.blank:
+            self.input_symbols.add(s_read)
 
-        transitions: Dict[Tuple[str, str], Transition] = {}
-        tape_symbols: Set[str] = set([blank])
-        input_symbols: Set[str] = set()
+    def _check_tapes(self, k: int, line: str) -> None:
+        if self.n_tapes is None:
+            self.n_tapes = k
+        elif self.n_tapes != k:
+            raise _SpecError(f"Número de fitas inconsistente em: {line}")
 
-        for line in body.splitlines():
-            if not line:
-                continue
-            if '->' not in line or ',' not in line:
-                return None, f"Linha de transição inválida: {line}"
-            left, right = [x.strip() for x in line.split('->', 1)]
-            s_state, s_read = [x.strip() for x in left.split(',', 1)]
-            n_state, s_write, s_move = [x.strip() for x in right.split(',', 2)]
-            if s_move not in ('L', 'R', 'N'):
-                return None, f"Movimento inválido em: {line}"
-            transitions[(s_state, s_read)] = (n_state, s_write, s_move)
-            tape_symbols.add(s_read)
-            tape_symbols.add(s_write)
-            if s_read != blank:
-                input_symbols.add(s_read)
-
-        tm = TuringMachine(
-            states=states,
-            input_symbols=input_symbols or set(['0', '1']),
-            tape_symbols=tape_symbols,
-            blank=blank,
-            transitions=transitions,
-            start_state=start,
-            accept_states=accept,
-            reject_states=reject,
+    def _multitape_transition(self, line: str, reads, right: str) -> None:
+        # q0,a,b -> q1,x,y,R,L: um símbolo lido, escrito e um movimento por fita
+        if self.nondeterministic:
+            raise _SpecError("Máquinas não determinísticas suportam apenas uma fita")
+        k = len(reads) - 1
+        parts = [x.strip() for x in right.split(',')]
+        if len(parts) != 2 * k + 1:
+            raise _SpecError(f"Linha de transição inválida: {line}")
+        self._check_tapes(k, line)
+        s_state, s_reads = reads[0], tuple(reads[1:])
+        n_state, writes, moves = parts[0], tuple(parts[1:k + 1]), tuple(parts[k + 1:])
+        if any(mv not in ('L', 'R', 'N') for mv in moves):
+            raise _SpecError(f"Movimento inválido em: {line}")
+        self.transitions[(s_state, s_reads)] = (n_state, writes, moves)
+        self.tape_symbols.update(s_reads)
+        self.tape_symbols.update(writes)
+        self.input_symbols.update(a for a in s_reads if a != self.blank)
+
+    def build(self) -> TuringMachine:
+        if not self.in_body:
+            raise _SpecError("Especificação precisa da seção 'transitions:'")
+        header = self.header
+
+        def names(field_name):
+            return set([s.strip() for s in header[field_name].split(',') if s.strip()])
+
+        if self.nondeterministic:
+            return NondeterministicMachine(
+                states=names('states'),
+                input_symbols=self.input_symbols or set(['0', '1']),
+                tape_symbols=self.tape_symbols,
+                blank=self.blank,
+                transitions=self.options,
+                start_state=header['start'],
+                accept_states=names('accept'),
+                reject_states=names('reject'),
+            )
+        if self.n_tapes and self.n_tapes > 1:
+            return MultiTapeMachine(
+                n_tapes=self.n_tapes,
+                states=names('states'),
+                input_symbols=self.input_symbols or set(['0', '1']),
+                tape_symbols=self.tape_symbols,
+                blank=self.blank,
+                transitions=self.transitions,
+                start_state=header['start'],
+                accept_states=names('accept'),
+                reject_states=names('reject'),
+            )
+        return TuringMachine(
+            states=names('states'),
+            input_symbols=self.input_symbols or set(['0', '1']),
+            tape_symbols=self.tape_symbols,
+            blank=self.blank,
+            transitions=self.transitions,
+            start_state=header['start'],
+            accept_states=names('accept'),
+            reject_states=names('reject'),
         )
+
+
+def _parse_lines(lines: Iterable[str], with_line_numbers: bool, nondeterministic: bool = False,
+                 prune: bool = False):
+    builder = _SpecBuilder(nondeterministic)
+    number = None
+    try:
+        for number, raw in enumerate(lines, 1):
+            s = raw.strip()
+            if not s or s.startswith('#'):
+                continue
+            builder.feed(s)
+        number = None
+        tm = builder.build()
+        if prune:
+            tm = prune_machine(tm)
         return tm, None
+    except _SpecError as e:
+        msg = str(e)
     except Exception as e:
-        return None, f"Erro ao parsear especificação: {e}"
+        msg = f"Erro ao parsear especificação: {e}"
+    if with_line_numbers and number is not None:
+        msg = f"{msg} (linha {number})"
+    return None, msg
+
+
+def parse_spec(spec_text: str, prune: bool = False):
+    """Parser da DSL para Máquina de Turing.
+
+    Transições com mais de um símbolo lido (`q0,a,b -> q1,x,y,R,L`) produzem
+    uma MultiTapeMachine com uma fita por símbolo.
+
+    Com `prune=True` a máquina passa por core.analysis.prune(): estados
+    inalcançáveis e transições que nunca disparam são descartados.
+    """
+    return _parse_lines(spec_text.splitlines(), with_line_numbers=False, prune=prune)
+
+
+def parse_spec_stream(source: Union[Iterable[str], TextIO]):
+    """Parser da DSL em uma única passada sobre as linhas de `source`.
+
+    Aceita um arquivo aberto ou qualquer iterável de linhas e não guarda o
+    texto da especificação. Retorna o mesmo `(máquina, erro)` de parse_spec();
+    as mensagens de erro indicam a linha onde o problema foi encontrado.
+    """
+    if isinstance(source, str):
+        source = source.splitlines()
+    return _parse_lines(source, with_line_numbers=True)
+
+
+def parse_ntm_spec(spec_text: str):
+    """Parser da DSL para máquina não determinística.
+
+    Pares `(estado, símbolo)` repetidos acumulam transições em vez de
+    sobrescrever a anterior. Retorna `(NondeterministicMachine, erro)`.
+    """
+    return _parse_lines(spec_text.splitlines(), with_line_numbers=False, nondeterministic=True)
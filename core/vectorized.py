@@ -0,0 +1,110 @@
+# Execução vetorizada (numpy) de muitas entradas em paralelo
+from typing import List, NamedTuple, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError:  # numpy é opcional
+    np = None
+
+from .engine import CompiledMachine, compile_machine
+from .turing_machine import TuringMachine, parse_spec
+
+# Código de resultado -> nome; 0 indica uma linha ainda em execução
+RESULT_NAMES = ['', 'ACCEPT', 'REJECT', 'NO_TRANSITION', 'MAX_STEPS']
+_MAX_STEPS = 4
+
+
+class LockstepResult(NamedTuple):
+    results: 'np.ndarray'    # nomes de resultado, um por entrada
+    steps: 'np.ndarray'      # int64
+    states: 'np.ndarray'     # índices em compiled.states
+    heads: 'np.ndarray'      # posição da cabeça (célula 0 = início da entrada)
+    tapes: 'np.ndarray'      # uint8 (N, largura), códigos de compiled.symbols
+    origin: int              # coluna de `tapes` que corresponde à célula 0
+    compiled: CompiledMachine
+
+    def tape_strings(self) -> List[str]:
+        """Conteúdo de cada fita sem os brancos das pontas"""
+        symbols = self.compiled.symbols
+        out = []
+        for row in self.tapes:
+            cells = np.flatnonzero(row)
+            if cells.size == 0:
+                out.append('')
+                continue
+            out.append(''.join(symbols[c] for c in row[cells[0]:cells[-1] + 1]))
+        return out
+
+
+def run_lockstep(spec_or_machine: Union[str, TuringMachine], inputs: Sequence[str],
+                 max_steps: int = 1000) -> LockstepResult:
+    """Executa a mesma máquina sobre todas as entradas, um passo por iteração.
+
+    As N fitas ficam em uma matriz `uint8`, com cabeças e estados em vetores;
+    cada iteração consulta a tabela densa `(estado, símbolo)` por indexação
+    avançada e só atualiza as linhas que ainda não pararam. Passos e
+    resultados seguem a mesma contagem de TuringMachine.run(). Requer numpy.
+    """
+    if np is None:
+        raise ImportError("run_lockstep requer numpy (pip install numpy)")
+    if isinstance(spec_or_machine, str):
+        tm, err = parse_spec(spec_or_machine)
+        if err:
+            raise ValueError(err)
+    else:
+        tm = spec_or_machine
+    alphabet = sorted(set(''.join(inputs)) - {tm.blank})
+    cm = compile_machine(tm, extra_symbols=alphabet)
+    if cm.n_symbols > 256:
+        raise ValueError("A execução vetorizada suporta no máximo 256 símbolos distintos")
+    n = cm.n_symbols
+    next_state = np.frombuffer(cm.next_state, dtype=np.int32)
+    write = np.frombuffer(cm.write, dtype=np.int32).astype(np.uint8)
+    move = np.frombuffer(cm.move, dtype=np.int32).astype(np.int64)
+
+    count = len(inputs)
+    length = max((len(s) for s in inputs), default=0)
+    origin = 16
+    tapes = np.zeros((count, origin + length + 16), dtype=np.uint8)
+    codes = {ord(s): c for s, c in cm.symbol_index.items() if len(s) == 1}
+    for i, s in enumerate(inputs):
+        if s:
+            row = np.frombuffer(s.translate(codes).encode('latin-1'), dtype=np.uint8)
+            tapes[i, origin:origin + len(s)] = row
+
+    states = np.full(count, cm.state_index[tm.start_state], dtype=np.int64)
+    heads = np.full(count, origin, dtype=np.int64)
+    steps = np.zeros(count, dtype=np.int64)
+    results = np.zeros(count, dtype=np.int8)
+    active = np.arange(count)
+
+    for step in range(1, max_steps + 1):
+        if active.size == 0:
+            break
+        h = heads[active]
+        pos = states[active] * n + tapes[active, h]
+        ns = next_state[pos]
+        halted = ns < 0
+        if halted.any():
+            results[active[halted]] = -ns[halted]
+            steps[active[halted]] = step
+            keep = ~halted
+            active, h, pos, ns = active[keep], h[keep], pos[keep], ns[keep]
+        tapes[active, h] = write[pos]
+        h = h + move[pos]
+        heads[active] = h
+        states[active] = ns
+        if h.size:
+            # Dobra a largura do lado em que alguma cabeça saiu da matriz
+            width = tapes.shape[1]
+            if h.max() >= width:
+                tapes = np.concatenate([tapes, np.zeros_like(tapes)], axis=1)
+            if h.min() < 0:
+                tapes = np.concatenate([np.zeros_like(tapes), tapes], axis=1)
+                origin += tapes.shape[1] // 2
+                heads += tapes.shape[1] // 2
+    results[active] = _MAX_STEPS
+    steps[active] = max_steps
+
+    names = np.array(RESULT_NAMES)[results]
+    return LockstepResult(names, steps, states, heads - origin, tapes, origin, cm)
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Servidor HTTP com sessões para a Máquina de Turing
+
+As máquinas ficam no servidor; o cliente envia só o id da sessão e quantos
+passos executar, sem reenviar a fita a cada chamada.
+
+    python server.py --port 8001
+
+Rotas (JSON via POST):
+    /api/session  {spec, input}            -> cria a sessão
+    /api/step     {session, steps}         -> executa até `steps` passos
+    /api/run      {session, max_steps}     -> executa até parar
+    /api/state    {session}                -> estado atual
+    /api/close    {session}                -> encerra a sessão
+    /api/stats    (GET)                    -> ocupação do servidor
+Todas as rotas com sessão aceitam `span` (células de cada lado da cabeça,
+até MAX_SPAN).
+Com `since` (a última `version` recebida) a resposta traz só o `delta` das
+alterações, opcionalmente limitado a `window: [início, fim]`.
+"""
+
+import argparse
+import json
+import os
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from core.sessions import SessionNotFound, SessionStore
+from core.spec_cache import spec_cache
+
+# Limite de passos por requisição, para não prender uma thread indefinidamente
+MAX_STEPS_PER_REQUEST = 10_000_000
+DEFAULT_SPAN = 10
+MAX_WINDOW = 100_000
+# `span` é por lado: a janela enviada tem até 2 * MAX_SPAN + 1 células
+MAX_SPAN = MAX_WINDOW // 2
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def machine_state(tm, span: int):
+    """Resumo da máquina com a janela da fita em torno da cabeça"""
+    return {
+        'state': tm.current_state,
+        'head': tm.head,
+        'halted': tm.halted,
+        'result': tm.result,
+        'version': tm.version,
+        'window': [[i, sym] for i, sym, _ in tm.window_cells(span)] if span > 0 else [],
+    }
+
+
+def _int(body, name: str, default: int) -> int:
+    try:
+        return int(body.get(name, default))
+    except (TypeError, ValueError):
+        raise ApiError(400, f"Campo '{name}' deve ser um inteiro")
+
+
+def _span(body) -> int:
+    return max(0, min(_int(body, 'span', DEFAULT_SPAN), MAX_SPAN))
+
+
+def _window(value):
+    if value is None:
+        return None
+    try:
+        start, end = (int(v) for v in value)
+    except (TypeError, ValueError):
+        raise ApiError(400, "Campo 'window' deve ser [início, fim]")
+    if end < start or end - start > MAX_WINDOW:
+        raise ApiError(400, f"Janela inválida (máximo de {MAX_WINDOW} células)")
+    return start, end
+
+
+class TuringApi:
+    """Lógica das rotas, independente do transporte HTTP"""
+
+    def __init__(self, store: SessionStore, max_steps_per_request: int = MAX_STEPS_PER_REQUEST):
+        self.store = store
+        self.max_steps_per_request = max_steps_per_request
+
+    def handle(self, path: str, body: dict):
+        route = getattr(self, 'route_' + path.strip('/').replace('api/', '', 1), None)
+        if route is None:
+            raise ApiError(404, f"Rota desconhecida: {path}")
+        return route(body)
+
+    def route_session(self, body):
+        spec = body.get('spec')
+        if not spec:
+            raise ApiError(400, "Especificação ausente")
+        tm, err = spec_cache.parse(spec)
+        if err:
+            raise ApiError(400, err)
+        if tm.n_tapes > 1:
+            raise ApiError(400, "O servidor suporta apenas máquinas de uma fita")
+        tm.reset(str(body.get('input', '')))
+        tm.track_changes()
+        session_id = self.store.create(tm)
+        return {'session': session_id,
+                'machine': machine_state(tm, _span(body))}
+
+    def _with_session(self, body, action):
+        session_id = body.get('session')
+        if not session_id:
+            raise ApiError(400, "Sessão ausente")
+        span = _span(body)
+        since = _int(body, 'since', 0) if body.get('since') is not None else None
+        window = _window(body.get('window'))
+        try:
+            with self.store.use(session_id) as tm:
+                extra = action(tm)
+                if since is not None:
+                    return dict(extra, session=session_id, delta=tm.delta(since, window))
+                return dict(extra, session=session_id, machine=machine_state(tm, span))
+        except SessionNotFound:
+            raise ApiError(404, "Sessão não encontrada ou expirada")
+
+    def _limit(self, body, name: str, default: int) -> int:
+        return max(0, min(_int(body, name, default), self.max_steps_per_request))
+
+    def route_step(self, body):
+        steps = self._limit(body, 'steps', 1)
+        return self._with_session(body, lambda tm: {
+            'steps_executed': tm.run(steps, halt_on_limit=False)})
+
+    def route_run(self, body):
+        max_steps = self._limit(body, 'max_steps', 1000)
+        return self._with_session(body, lambda tm: {'steps_executed': tm.run(max_steps)})
+
+    def route_state(self, body):
+        return self._with_session(body, lambda tm: {})
+
+    def route_close(self, body):
+        if not self.store.delete(body.get('session') or ''):
+            raise ApiError(404, "Sessão não encontrada ou expirada")
+        return {}
+
+    def route_stats(self, body):
+        return {'stats': self.store.stats()}
+
+
+class Handler(BaseHTTPRequestHandler):
+    api: TuringApi = None
+
+    def _send(self, status: int, payload) -> None:
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _dispatch(self, body) -> None:
+        try:
+            result = self.api.handle(self.path.split('?', 1)[0], body)
+            self._send(200, dict(result, success=True))
+        except ApiError as e:
+            self._send(e.status, {'success': False, 'error': str(e)})
+        except Exception as e:
+            self._send(500, {'success': False, 'error': f"Erro no servidor: {e}"})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            self._send(400, {'success': False, 'error': "JSON inválido"})
+            return
+        if not isinstance(body, dict):
+            self._send(400, {'success': False, 'error': "O corpo deve ser um objeto JSON"})
+            return
+        self._dispatch(body)
+
+    def do_GET(self):
+        self._dispatch({})
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(host: str = '127.0.0.1', port: int = 8001, store: SessionStore = None,
+                max_steps_per_request: int = MAX_STEPS_PER_REQUEST) -> ThreadingHTTPServer:
+    """Cria o servidor (ainda sem iniciar); `port=0` escolhe uma porta livre"""
+    api = TuringApi(store or SessionStore(), max_steps_per_request)
+    handler = type('TuringHandler', (Handler,), {'api': api})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor HTTP com sessões da Máquina de Turing")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--ttl', type=float, default=900.0, help="segundos até uma sessão ociosa expirar")
+    parser.add_argument('--max-sessions', type=int, default=1000)
+    parser.add_argument('--max-mb', type=float, default=256.0, help="memória total estimada das sessões")
+    args = parser.parse_args(argv)
+
+    store = SessionStore(args.ttl, args.max_sessions, int(args.max_mb * 1024 * 1024))
+    server = make_server(args.host, args.port, store)
+    print(f"Servidor em http://{args.host}:{server.server_address[1]}/api/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
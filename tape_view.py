@@ -0,0 +1,163 @@
+# Renderização incremental da fita e ritmo de quadros da interface
+import json
+from typing import Dict, Optional
+
+from core.turing_machine import TuringMachine
+
+RESULT_ICONS = {
+    'ACCEPT': '&#10003;',  # Checkmark
+    'REJECT': '&#10007;',  # Cross mark
+    'NO_TRANSITION': '&#9888;',  # Warning sign
+    'MAX_STEPS': '&#9203;',  # Stopwatch
+    'LOOP': '&#8635;',  # Clockwise arrow
+    None: '&#9654;'  # Play symbol
+}
+
+
+def _state_color(tm: TuringMachine) -> str:
+    # Determina a cor do estado baseado no resultado
+    if tm.result == 'ACCEPT':
+        return "#10b981"
+    if tm.result == 'REJECT':
+        return "#ef4444"
+    if tm.result in ['NO_TRANSITION', 'MAX_STEPS', 'LOOP']:
+        return "#f59e0b"
+    return "#6366f1"  # azul padrão
+
+
+def _display(sym: str, show_invis: bool) -> str:
+    if show_invis and (sym == "" or sym == " " or sym == "\t" or sym == "\n" or sym == "\r"):
+        return "□"
+    return sym
+
+
+def _info_values(tm: TuringMachine) -> Dict[str, str]:
+    return {
+        'state': str(tm.current_state),
+        'head': str(tm.head),
+        'icon': RESULT_ICONS.get(tm.result, '&#9654;'),
+        'status': tm.result if tm.result else "Executando",
+    }
+
+
+def render_tape_html(tm: Optional[TuringMachine], span: int = 25, cell_px: int = 36, show_invis: bool = False) -> str:
+    """Marcação completa da fita; os estilos vêm de TAPE_CSS, enviado uma vez"""
+    if tm is None:
+        return """
+        <div style='text-align:center; padding:60px 20px; background:linear-gradient(135deg, #1e293b 0%, #334155 100%); border-radius:16px; color:white;'>
+            <div style='font-size:48px; margin-bottom:16px; font-weight:bold;'>MT</div>
+            <p style='font-size:18px; margin:0; opacity:0.95;'>Inicialize a máquina para visualizar a fita</p>
+        </div>
+        """
+
+    cells = tm.window_cells(span)
+    cols = len(cells)
+    info = _info_values(tm)
+
+    html = ['<div class="tape-container">']
+    html.append(
+        f'<div class="tape" style="grid-template-columns: repeat({cols}, {cell_px}px);">')
+
+    for i, sym, is_head in cells:
+        cls = "cell head" if is_head else "cell"
+        html.append(f'<div class="{cls}" data-i="{i}">{_display(sym, show_invis)}</div>')
+
+    html.append('</div>')
+
+    # Painel de informações melhorado
+    html.append('<div class="info-panel">')
+    html.append(f'''
+        <div class="info-card state-card" style="border-color: {_state_color(tm)};">
+            <span class="info-label">Estado Atual</span>
+            <span class="info-value" data-field="state">{info['state']}</span>
+        </div>
+        <div class="info-card">
+            <span class="position-icon">&#128205;</span>
+            <span class="info-label">Posição</span>
+            <span class="info-value" data-field="head">{info['head']}</span>
+        </div>
+        <div class="info-card">
+            <span style="font-size:20px" data-field="icon">{info['icon']}</span>
+            <span class="info-label">Status</span>
+            <span class="info-value" data-field="status">{info['status']}</span>
+        </div>
+    ''')
+    html.append('</div>')
+
+    html.append(
+        '<div class="legend">A célula destacada indica a posição atual da cabeça de leitura/escrita</div>')
+    html.append('</div>')
+
+    return '\n'.join(html)
+
+
+class TapeView:
+    """Última janela enviada ao navegador de uma sessão.
+
+    A primeira renderização (ou uma mudança de janela/largura) envia o HTML
+    completo; as seguintes enviam só um patch JSON com as células que
+    mudaram ou entraram na janela, aplicado por APPLY_TAPE_PATCH_JS (app.py).
+    """
+
+    def __init__(self):
+        self.layout = None
+        self.cells: Dict[int, str] = {}
+        self.info: Dict[str, str] = {}
+        self.color = None
+        self.seq = 0
+
+    def update(self, tm: Optional[TuringMachine], span: int, cell_px: int, show_invis: bool = False):
+        """Retorna `(HTML, patch JSON)`; o HTML é None quando só o patch é enviado"""
+        layout = (span, cell_px, show_invis)
+        if tm is None or layout != self.layout:
+            self.layout = layout if tm is not None else None
+            self.seq += 1
+            if tm is not None:
+                self.cells = {i: _display(sym, show_invis) for i, sym, _ in tm.window_cells(span)}
+                self.info = _info_values(tm)
+                self.color = _state_color(tm)
+            return render_tape_html(tm, span, cell_px, show_invis), ""
+
+        cells = {i: _display(sym, show_invis) for i, sym, _ in tm.window_cells(span)}
+        info = _info_values(tm)
+        color = _state_color(tm)
+        self.seq += 1
+        patch = {
+            'seq': self.seq,
+            'left': tm.head - span,
+            'right': tm.head + span,
+            'head': tm.head,
+            'cells': {i: sym for i, sym in cells.items() if self.cells.get(i) != sym},
+            'info': {k: v for k, v in info.items() if self.info.get(k) != v},
+        }
+        if color != self.color:
+            patch['color'] = color
+        self.cells, self.info, self.color = cells, info, color
+        return None, json.dumps(patch, ensure_ascii=False, separators=(',', ':'))
+
+
+class FramePacer:
+    """Agrupa passos em quadros para manter `speed` passos/s a cerca de `fps` quadros/s.
+
+    O custo real de cada quadro (passos, renderização e envio) é medido e
+    suavizado; quando ele passa do intervalo entre quadros, a taxa de quadros
+    cai e cada quadro passa a levar mais passos, mantendo a velocidade pedida.
+    """
+
+    SMOOTHING = 0.3
+
+    def __init__(self, speed: float, fps: float):
+        self.speed = max(1.0, float(speed))
+        # Com `speed` abaixo de `fps` cada quadro leva um passo, em intervalos maiores
+        self.interval = 1.0 / min(max(1.0, float(fps)), self.speed)
+        self.cost: Optional[float] = None
+        self.batch = max(1, round(self.speed * self.interval))
+
+    def frame_done(self, elapsed: float) -> float:
+        """Registra a duração do quadro e retorna quanto esperar até o próximo"""
+        if self.cost is None:
+            self.cost = elapsed
+        else:
+            self.cost += self.SMOOTHING * (elapsed - self.cost)
+        self.batch = max(1, round(self.speed * max(self.interval, self.cost)))
+        return max(0.0, self.interval - elapsed)
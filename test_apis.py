@@ -5,10 +5,16 @@ Execute este script para testar todas as APIs localmente
 """
 
 from core.examples import EXAMPLES
-from core.turing_machine import parse_spec, TuringMachine
+from core.turing_machine import parse_spec, parse_spec_stream, TuringMachine
+from core.tape import Tape
+from core.batch import run_batch
+from core.spec_cache import SpecCache
+from core.trace import TraceRecorder, load_trace
+import io
 import json
 import sys
 import os
+import tempfile
 
 # Adiciona o diretório raiz ao path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -167,6 +173,1208 @@ def test_serialization():
     return True
 
 
+def _run_with_step(tm, max_steps):
+    """Execução de referência, passo a passo"""
+    steps = 0
+    while not tm.halted and steps < max_steps:
+        tm.step()
+        steps += 1
+    if not tm.halted:
+        tm.halted, tm.result = True, 'MAX_STEPS'
+    return steps
+
+
+def _snapshot(tm):
+    tape = {k: v for k, v in tm.tape.items() if v != tm.blank}
+    return (tm.result, tm.head, tm.current_state, tape)
+
+
+def test_run_in_slices():
+    """Testa run() em fatias com halt_on_limit=False"""
+    print("\n=== Testando RUN EM FATIAS ===")
+
+    for name, spec in EXAMPLES.items():
+        for input_string in ["", "0011", "111+11", "1#11"]:
+            whole, _ = parse_spec(spec)
+            sliced, _ = parse_spec(spec)
+            whole.reset(input_string)
+            sliced.reset(input_string)
+            total = whole.run(200)
+            steps = 0
+            while not sliced.halted and steps < 200:
+                steps += sliced.run(min(7, 200 - steps), halt_on_limit=False)
+            assert steps == total, (name, input_string)
+            assert sliced.current_state == whole.current_state
+            assert sliced.head == whole.head
+            assert dict(sliced.tape.items()) == dict(whole.tape.items())
+            if whole.result != 'MAX_STEPS':
+                assert sliced.result == whole.result, (name, input_string)
+            else:
+                assert not sliced.halted and sliced.result is None
+
+    print("✅ Execução em fatias confere com run() único!")
+    return True
+
+
+def test_compiled_run():
+    """Testa se run() compilado equivale a step() em todos os exemplos"""
+    print("\n=== Testando RUN COMPILADO ===")
+
+    inputs = ["", "0", "1", "01", "0011", "0101", "111+11", "1#11", "10x1"]
+    for name, spec in EXAMPLES.items():
+        for input_string in inputs:
+            for max_steps in (1, 5, 200):
+                ref, _ = parse_spec(spec)
+                fast, _ = parse_spec(spec)
+                ref.reset(input_string)
+                fast.reset(input_string)
+                expected = _run_with_step(ref, max_steps)
+                assert fast.run(max_steps) == expected, (name, input_string)
+                assert _snapshot(fast) == _snapshot(ref), (name, input_string)
+
+    tm, _ = parse_spec(list(EXAMPLES.values())[0])
+    cm = tm.compile()
+    print(f"✅ run() compilado confere com step()!")
+    print(f"   Tabela: {cm.n_states} estados x {cm.n_symbols} símbolos")
+    return True
+
+
+def test_tape():
+    """Testa a fita densa de dois lados"""
+    print("\n=== Testando FITA ===")
+
+    tape = Tape('_')
+    tape[3] = 'a'
+    tape[-4] = 'b'
+    tape[0] = '_'
+    assert dict(tape) == {-4: 'b', 3: 'a'}
+    assert tape.get(10, '_') == '_' and tape.get(-4) == 'b'
+    del tape[3]
+    assert 3 not in tape and len(tape) == 1
+
+    tm, _ = parse_spec(list(EXAMPLES.values())[2])
+    tm.reset("0110")
+    tm.run(1000)
+    tm2 = TuringMachine.from_dict(json.loads(json.dumps(tm.to_dict())))
+    assert tm2.tape == tm.tape
+    assert tm2.window_cells(4) == tm.window_cells(4)
+
+    print(f"✅ Fita preservada: {dict(tm.tape)}")
+    return True
+
+
+def test_rle_run():
+    """Testa se o modo run-length conta os mesmos passos que o modo denso"""
+    print("\n=== Testando RUN RLE ===")
+
+    inputs = ["", "0", "0000", "000111", "0110", "1111+11", "1#11", "10x1"]
+    for name, spec in EXAMPLES.items():
+        for input_string in inputs:
+            for max_steps in (1, 7, 500):
+                dense, _ = parse_spec(spec)
+                rle, _ = parse_spec(spec)
+                dense.reset(input_string)
+                rle.reset(input_string)
+                expected = dense.run(max_steps)
+                assert rle.run(max_steps, rle=True) == expected, (name, input_string)
+                assert _snapshot(rle) == _snapshot(dense), (name, input_string)
+
+    tm, _ = parse_spec(EXAMPLES["3. Duplicador (0 -> 00, 1 -> 11)"])
+    tm.reset("0" * 2000)
+    steps = tm.run(10 ** 6, rle=True)
+    print(f"✅ Modo RLE confere com o modo denso!")
+    print(f"   Duplicador em 2000 símbolos: {steps} passos")
+    return True
+
+
+def test_loop_detection():
+    """Testa a detecção de ciclos com resultado LOOP"""
+    print("\n=== Testando DETECÇÃO DE CICLOS ===")
+
+    spec = """
+states: s,a,b,c,qaccept,qreject
+blank: _
+start: s
+accept: qaccept
+reject: qreject
+transitions:
+s,0 -> s,1,R
+s,_ -> a,_,L
+a,1 -> b,0,L
+a,0 -> c,1,R
+b,1 -> a,1,R
+b,_ -> a,_,R
+b,0 -> c,0,R
+c,0 -> a,0,L
+c,1 -> a,1,L
+c,_ -> a,_,L
+"""
+    tm, error = parse_spec(spec)
+    assert error is None
+    tm.reset("00000")
+    steps = tm.run(10 ** 6, detect_loops=True)
+    assert tm.result == 'LOOP'
+    assert (tm.loop_start, tm.loop_period) == (6, 4)
+    assert steps < 100
+
+    # Fita em branco com buffers de tamanhos diferentes: o ciclo começa em 0
+    spec_blank = """
+states: q0,qaccept,qreject
+blank: _
+start: q0
+accept: qaccept
+reject: qreject
+transitions:
+q0,0 -> q0,_,N
+q0,1 -> q0,1,R
+q0,x -> q0,0,L
+q0,_ -> q0,0,N
+"""
+    blank_tm, _ = parse_spec(spec_blank)
+    blank_tm.reset("")
+    blank_tm.run(5, detect_loops=True)
+    assert blank_tm.result == 'LOOP'
+    assert (blank_tm.loop_start, blank_tm.loop_period) == (0, 2)
+
+    # Máquinas que param não são afetadas
+    for spec in EXAMPLES.values():
+        plain, _ = parse_spec(spec)
+        detect, _ = parse_spec(spec)
+        plain.reset("0110")
+        detect.reset("0110")
+        assert detect.run(500, detect_loops=True) == plain.run(500)
+        assert _snapshot(detect) == _snapshot(plain)
+
+    print(f"✅ Ciclo detectado após {steps} passos!")
+    print(f"   Início: {tm.loop_start}, período: {tm.loop_period}")
+    return True
+
+
+def test_run_batch():
+    """Testa a execução em lote com pool de processos"""
+    print("\n=== Testando RUN BATCH ===")
+
+    spec = EXAMPLES["1. Paridade de 1s (Par/Ímpar)"]
+    inputs = [format(i, "b") for i in range(300)]
+    serial = sorted(run_batch(spec, inputs, max_steps=100, workers=1))
+    parallel = sorted(run_batch(spec, inputs, max_steps=100, workers=2, chunk_size=32))
+    assert serial == parallel
+    for record in serial:
+        expected = 'ACCEPT' if record.input.count('1') % 2 == 0 else 'REJECT'
+        assert record.result == expected, record
+
+    # Brancos internos aparecem na saída: "1_1" e "11" são fitas diferentes
+    erase = ("states: q0,qa\nblank: _\nstart: q0\naccept: qa\nreject: qa\ntransitions:\n"
+             "q0,0 -> q0,_,R\nq0,1 -> q0,1,R\nq0,_ -> qa,_,N")
+    outputs = {r.input: r.tape_output for r in run_batch(erase, ["101", "11", "0", "1001"], workers=1)}
+    assert outputs == {"101": "1_1", "11": "11", "0": "", "1001": "1__1"}
+
+    print(f"✅ Lote executado: {len(parallel)} entradas")
+    print(f"   Exemplo: {parallel[0]}")
+    return True
+
+
+def test_result_cache():
+    """Testa o cache de resultados em memória e em SQLite"""
+    print("\n=== Testando CACHE DE RESULTADOS ===")
+
+    from core.result_cache import ResultCache, machine_digest, result_key
+
+    spec = EXAMPLES["5. Aceita 0^n1^n (mesma qtd 0 e 1)"]
+    inputs = [format(i, "b") for i in range(400)]
+    expected = sorted(run_batch(spec, inputs, max_steps=200, workers=1))
+
+    # Espaços, comentários e ordem das linhas não mudam o hash
+    lines = spec.strip().splitlines()
+    shuffled = "# comentário\n" + "\n".join(lines[:6] + list(reversed(lines[6:]))) + "\n\n"
+    assert machine_digest(parse_spec(shuffled)[0]) == machine_digest(parse_spec(spec)[0])
+    assert result_key("d", "01", 10) != result_key("d", "01", 11)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "results.sqlite")
+        cache = ResultCache(path, memory_size=100)
+        first = sorted(run_batch(spec, inputs, max_steps=200, workers=2, chunk_size=64, cache=cache))
+        assert first == expected and cache.stats()['misses'] == len(inputs)
+        again = sorted(run_batch(shuffled, inputs, max_steps=200, workers=1, chunk_size=64, cache=cache))
+        stats = cache.stats()
+        assert again == expected and stats['memory_hits'] + stats['disk_hits'] == len(inputs)
+        assert stats['disk_hits'] > 0 and len(cache) == len(inputs)
+        # Outro limite de passos ou opções de run() não reaproveitam resultados
+        sorted(run_batch(spec, inputs[:10], max_steps=199, workers=1, cache=cache))
+        sorted(run_batch(spec, inputs[:10], max_steps=200, workers=1, cache=cache, rle=True))
+        assert cache.stats()['misses'] == len(inputs) + 20
+        cache.close()
+
+        # Persistência entre instâncias
+        cache = ResultCache(path)
+        assert sorted(run_batch(spec, inputs, max_steps=200, workers=1, cache=cache)) == expected
+        assert cache.stats()['disk_hits'] == len(inputs) and cache.stats()['misses'] == 0
+
+        # Descarte por tamanho no disco
+        limit = cache.bytes // 4
+        cache.max_bytes = limit
+        cache.put("novo", "ACCEPT", 1, "")
+        assert cache.bytes <= limit and cache.stats()['evictions'] > 0
+        assert len(cache) < len(inputs) and cache.get("novo") == ("ACCEPT", 1, "")
+        cache.close()
+
+    # Só memória
+    cache = ResultCache(memory_size=50)
+    assert sorted(run_batch(spec, inputs, max_steps=200, workers=1, cache=cache)) == expected
+    assert len(cache) == 50
+
+    # Memória limitada também em bytes: fitas grandes ocupam mais espaço
+    cache = ResultCache(memory_bytes=10000)
+    for i in range(20):
+        cache.put(f"k{i}", "ACCEPT", i, "1" * 1000)
+    assert cache.stats()['memory_bytes'] <= 10000 and len(cache) < 20
+    assert cache.get("k19") == ("ACCEPT", 19, "1" * 1000) and cache.get("k0") is None
+
+    # Opções objeto (sem representação estável) não usam o cache
+    from core.macro import MacroSimulator
+    cache = ResultCache()
+    records = sorted(run_batch(spec, inputs[:20], max_steps=200, workers=1, cache=cache,
+                               macro=MacroSimulator(4)))
+    assert records == sorted(r for r in expected if r.input in inputs[:20])
+    assert len(cache) == 0 and cache.stats()['misses'] == 0
+
+    print(f"✅ Cache de resultados funcionando!")
+    return True
+
+
+def test_run_stats():
+    """Testa os contadores de run(collect_stats=True) contra step()"""
+    print("\n=== Testando ESTATÍSTICAS DE EXECUÇÃO ===")
+
+    for name, spec in EXAMPLES.items():
+        for input_string in ["", "0110", "0011", "111+11", "1#11"]:
+            ref, _ = parse_spec(spec)
+            tm, _ = parse_spec(spec)
+            ref.reset(input_string)
+            tm.reset(input_string)
+
+            hits = {}
+            lo = hi = 0
+            last = reversals = 0
+            changed = set()
+            for _ in range(150):
+                if ref.halted:
+                    break
+                key = (ref.current_state, ref.read())
+                hits[key] = hits.get(key, 0) + 1
+                before, head = ref.read(), ref.head
+                ref.step()
+                if ref.halted:
+                    break
+                if ref.tape.get(head, ref.blank) != before:
+                    changed.add(head)
+                move = ref.head - head
+                if move:
+                    if last and move != last:
+                        reversals += 1
+                    last = move
+                lo, hi = min(lo, ref.head), max(hi, ref.head)
+
+            steps = 0
+            while not tm.halted and steps < 150:
+                steps += tm.run(min(11, 150 - steps), halt_on_limit=False, collect_stats=True)
+            stats = tm.stats
+            assert stats.by_transition() == hits, (name, input_string)
+            assert stats.steps == steps == sum(hits.values())
+            assert sum(stats.state_hits) == steps
+            assert (stats.head_min, stats.head_max) == (lo, hi), (name, input_string)
+            assert stats.reversals == reversals, (name, input_string)
+            assert stats.cells_changed == len(changed), (name, input_string)
+
+    data = tm.to_dict()
+    json.dumps(data)
+    assert data['stats']['steps'] == tm.stats.steps
+    assert data['stats']['cells_changed'] == tm.stats.cells_changed
+    tm.reset("0")
+    assert tm.stats is None and tm.to_dict()['stats'] is None
+    tm.run(10)
+    assert tm.stats is None
+
+    print("✅ Estatísticas conferem com a execução passo a passo!")
+    return True
+
+
+def test_spec_cache():
+    """Testa o cache LRU de especificações"""
+    print("\n=== Testando CACHE DE ESPECIFICAÇÕES ===")
+
+    cache = SpecCache(maxsize=2)
+    specs = list(EXAMPLES.values())[:3]
+    cache.warm(specs)
+    assert cache.stats()['evictions'] == 1
+
+    tm1, _ = cache.parse("# comentário\n" + specs[2])
+    tm2, _ = cache.parse(specs[2])
+    assert cache.stats()['hits'] == 2
+    assert tm1 is not tm2 and tm1.transitions == tm2.transitions
+    tm1.reset("0110")
+    tm1.run(100)
+    assert tm2.current_state is None
+
+    _, error = cache.parse("states: q0")
+    assert error == parse_spec("states: q0")[1]
+
+    print(f"✅ Cache funcionando: {cache.stats()}")
+    return True
+
+
+def test_parse_spec_stream():
+    """Testa o parser em passada única sobre arquivos e iteráveis de linhas"""
+    print("\n=== Testando PARSER EM STREAMING ===")
+
+    for spec in EXAMPLES.values():
+        tm, _ = parse_spec(spec)
+        streamed, error = parse_spec_stream(io.StringIO(spec))
+        assert error is None
+        assert streamed.transitions == tm.transitions
+        assert streamed.states == tm.states and streamed.blank == tm.blank
+
+    lines = ["states: q0,qaccept,qreject", "blank: _", "start: q0",
+             "accept: qaccept", "reject: qreject", "transitions:",
+             "q0,0 -> q0,0,R", "q0,1 -> q0,1,X"]
+    _, error = parse_spec_stream(iter(lines))
+    assert error == parse_spec("\n".join(lines))[1] + " (linha 8)"
+    _, error = parse_spec_stream(lines[:5])
+    assert error == "Especificação precisa da seção 'transitions:'"
+
+    print(f"✅ Parser em streaming confere com parse_spec!")
+    return True
+
+
+def test_binary_snapshot():
+    """Testa o snapshot binário to_bytes/from_bytes"""
+    print("\n=== Testando SNAPSHOT BINÁRIO ===")
+
+    tm, _ = parse_spec(EXAMPLES["3. Duplicador (0 -> 00, 1 -> 11)"])
+    tm.reset("0110" * 50)
+    tm.run(5000)
+    tm.head, tm.tape[-3] = -7, "1"
+
+    for compress in (False, True):
+        data = tm.to_bytes(compress=compress)
+        tm2 = TuringMachine.from_bytes(data)
+        assert tm2 == tm
+        assert tm2.run(100) == tm.run(100) and tm2 == tm
+
+    try:
+        TuringMachine.from_bytes(b"XXXX" + data[4:])
+        return False
+    except ValueError:
+        pass
+
+    # Versão de delta() e estatísticas sobrevivem ao snapshot
+    from core import snapshot
+    tm.reset("0110" * 5)
+    tm.run(40, halt_on_limit=False, collect_stats=True)
+    tm2 = TuringMachine.from_bytes(tm.to_bytes())
+    assert tm2 == tm and tm2.version == tm.version
+    assert tm2.stats.to_dict() == tm.stats.to_dict()
+    tm.run(30, halt_on_limit=False, collect_stats=True)
+    tm2.run(30, halt_on_limit=False, collect_stats=True)
+    assert tm2.stats.to_dict() == tm.stats.to_dict() and tm2.version == tm.version
+    assert tm2.delta(tm.version - 1)['full']
+
+    # Snapshots da versão 1 (sem esses campos) continuam legíveis
+    tm.stats = None
+    data = tm.to_bytes()
+    old = data[:4] + bytes([1]) + data[5:-snapshot._EXTRA.size]
+    tm1 = TuringMachine.from_bytes(old)
+    assert tm1 == tm and tm1.version == 0 and tm1.stats is None
+
+    print(f"✅ Snapshot: {len(data)} bytes (JSON: {len(json.dumps(tm.to_dict()))})")
+    return True
+
+
+def test_trace_recorder():
+    """Testa a gravação e exportação do traço de execução"""
+    print("\n=== Testando TRAÇO DE EXECUÇÃO ===")
+
+    spec = EXAMPLES["3. Duplicador (0 -> 00, 1 -> 11)"]
+    tm, _ = parse_spec(spec)
+    tm.reset("0110")
+    recorder = TraceRecorder(snapshot_every=10)
+    steps = tm.run(30, trace=recorder)
+    tm.halted = False
+    steps += tm.run(1000, trace=recorder)
+    assert recorder.steps == steps
+
+    path = os.path.join(tempfile.mkdtemp(), "trace.npz")
+    recorder.save(path)
+    cols = load_trace(path)
+    assert list(cols['snapshot_step'])[:4] == [0, 10, 20, 30]
+
+    # O traço permite refazer o caminho da cabeça sem reexecutar run()
+    ref, _ = parse_spec(spec)
+    ref.reset("0110")
+    symbols, n = cols['symbols'], len(cols['symbols'])
+    for tid, delta in zip(cols['transition_id'], cols['head_delta']):
+        assert cols['states'][tid // n] == ref.current_state
+        assert symbols[tid % n] == ref.read()
+        head = ref.head
+        ref.step()
+        assert ref.head - head == delta
+    assert (ref.current_state, ref.head) == (tm.current_state, tm.head)
+
+    print(f"✅ Traço gravado: {steps} passos, {len(cols['snapshot_step'])} snapshots")
+    return True
+
+
+def test_benchmark_suite():
+    """Testa o relatório do benchmark e a comparação com baseline"""
+    print("\n=== Testando BENCHMARK ===")
+
+    import benchmark
+    report = benchmark.run_suite(sizes=(10, 100), max_steps=500, step_budget=100, repeat=1)
+    json.dumps(report)
+    assert set(report['examples']) == set(EXAMPLES)
+    for curve in report['examples'].values():
+        assert [e['input_size'] for e in curve] == [10, 100]
+        assert all(e['run_steps_per_s'] >= 0 and e['peak_bytes'] > 0 for e in curve)
+    for name in ("BB(2)", "BB(3)", "BB(4)"):
+        entry = report['busy_beavers'][name]
+        assert entry['steps'] == entry['expected_steps'], name
+        assert entry['ones'] == entry['expected_ones'], name
+
+    slower = json.loads(json.dumps(report))
+    for entry in slower['busy_beavers'].values():
+        entry['run_steps_per_s'] *= 2
+    ratios, regressions = benchmark.compare(report, slower, min_runtime=0)
+    assert set(regressions) == set(report['busy_beavers'])
+    assert all(abs(ratios[k] - 0.5) < 1e-9 for k in regressions)
+
+    # Casos de microssegundos não são marcados; basta um dos tempos passar do mínimo
+    ratios, regressions = benchmark.compare(report, slower, min_runtime=1.0)
+    assert regressions == [] and abs(ratios["BB(2)"] - 0.5) < 1e-9
+    for entry in report['busy_beavers'].values():
+        entry['run_s'] = 1.0
+    assert set(benchmark.compare(report, slower, min_runtime=1.0)[1]) == set(report['busy_beavers'])
+
+    print("✅ Benchmark gera relatório e detecta regressões!")
+    return True
+
+
+PALINDROME_2_TAPES = """states: copy,back,cmp,qaccept,qreject
+blank: _
+start: copy
+accept: qaccept
+reject: qreject
+transitions:
+copy,0,_ -> copy,0,0,R,R
+copy,1,_ -> copy,1,1,R,R
+copy,_,_ -> back,_,_,L,L
+back,0,0 -> back,0,0,L,N
+back,0,1 -> back,0,1,L,N
+back,1,0 -> back,1,0,L,N
+back,1,1 -> back,1,1,L,N
+back,_,0 -> cmp,_,0,R,N
+back,_,1 -> cmp,_,1,R,N
+back,_,_ -> qaccept,_,_,N,N
+cmp,0,0 -> cmp,0,0,R,L
+cmp,1,1 -> cmp,1,1,R,L
+cmp,0,1 -> qreject,0,1,N,N
+cmp,1,0 -> qreject,1,0,N,N
+cmp,_,_ -> qaccept,_,_,N,N"""
+
+
+def test_multitape():
+    """Testa a máquina de várias fitas e a DSL `q,a,b -> p,x,y,R,L`"""
+    print("\n=== Testando MÚLTIPLAS FITAS ===")
+
+    from core.multitape import MultiTapeMachine
+    tm, err = parse_spec(PALINDROME_2_TAPES)
+    assert err is None, err
+    assert isinstance(tm, MultiTapeMachine) and tm.n_tapes == 2
+
+    for input_string in ["", "0", "01", "0110", "01010", "0111", "1" * 50]:
+        ref, _ = parse_spec(PALINDROME_2_TAPES)
+        ref.reset(input_string)
+        tm.reset(input_string)
+        expected = _run_with_step(ref, 1000)
+        for max_steps in (1, 7, 1000):
+            tm.reset(input_string)
+            assert tm.run(max_steps) == min(expected, max_steps), input_string
+        assert tm.result == ref.result, input_string
+        assert tm.result == ('ACCEPT' if input_string == input_string[::-1] else 'REJECT')
+        assert tm.heads == ref.heads and tm.current_state == ref.current_state
+        assert [dict(t.items()) for t in tm.tapes] == [dict(t.items()) for t in ref.tapes]
+
+    # Passos lineares no tamanho da entrada
+    tm.reset("01" * 500 + "10" * 500)
+    steps = tm.run(100000)
+    assert tm.result == 'ACCEPT' and steps == 3 * 2000 + 4
+
+    windows = tm.window_cells(2)
+    assert len(windows) == 2 and all(len(w) == 5 for w in windows)
+    assert windows[0][2] == (tm.heads[0], tm.tapes[0].get(tm.heads[0], '_'), True)
+
+    data = tm.to_dict()
+    json.dumps(data)
+    copy = MultiTapeMachine.from_dict(data)
+    assert copy == tm
+    assert copy.transitions == tm.transitions
+
+    cached = SpecCache().parse(PALINDROME_2_TAPES)[0]
+    assert isinstance(cached, MultiTapeMachine)
+    cached.reset("0110")
+    cached.run(100)
+    assert cached.result == 'ACCEPT'
+
+    bad = PALINDROME_2_TAPES + "\ncmp,0 -> cmp,0,R"
+    assert "Número de fitas inconsistente" in parse_spec(bad)[1]
+    bad = PALINDROME_2_TAPES + "\ncmp,0,_ -> cmp,0,R,R"
+    assert "Linha de transição inválida" in parse_spec(bad)[1]
+
+    print(f"✅ Máquina de 2 fitas confere com step() ({steps} passos para n=2000)!")
+    return True
+
+
+def test_nondeterministic():
+    """Testa a busca em largura da máquina não determinística"""
+    print("\n=== Testando MÁQUINA NÃO DETERMINÍSTICA ===")
+
+    from core.turing_machine import parse_ntm_spec
+
+    # Máquinas determinísticas: mesmo resultado e contagem de passos de run()
+    for name, spec in EXAMPLES.items():
+        for input_string in ["", "0", "01", "0011", "0110", "111+11"]:
+            tm, _ = parse_spec(spec)
+            tm.reset(input_string)
+            steps = tm.run(300)
+            if tm.result == 'MAX_STEPS':
+                continue
+            ntm, err = parse_ntm_spec(spec)
+            assert err is None, err
+            found = ntm.explore(input_string, max_steps=300)
+            assert found.steps == steps, (name, input_string)
+            assert found.accepted == (tm.result == 'ACCEPT'), (name, input_string)
+            if found.accepted:
+                assert dict(found.tape.items()) == dict(tm.tape.items())
+                assert found.head == tm.head and len(found.path) == steps - 1
+
+    # Adivinha onde começa "11"
+    header = "states: q0,q1,qa,qr\nblank: _\nstart: q0\naccept: qa\nreject: qr\ntransitions:\n"
+    ntm, _ = parse_ntm_spec(header + """q0,0 -> q0,0,R
+q0,1 -> q0,1,R
+q0,1 -> q1,1,R
+q1,1 -> qa,x,N""")
+    assert len(ntm.transitions[('q0', '1')]) == 2
+    found = ntm.explore("0101101")
+    assert found.accepted and found.steps == 6
+    assert [t for _, t in found.path][-2:] == [('q1', '1', 'R'), ('qa', 'x', 'N')]
+    assert found.tape[4] == 'x' and found.head == 4
+    assert not ntm.explore("0101010").accepted
+    assert ntm.explore("0101010").result == 'REJECT'
+
+    # Passeio aleatório: configurações repetidas são descartadas
+    walk, _ = parse_ntm_spec(header + "q0,_ -> q0,_,L\nq0,_ -> q0,_,R")
+    found = walk.explore("", max_steps=200)
+    assert found.result == 'MAX_STEPS' and found.configs == 401
+
+    # 2^n fitas distintas: limitado por max_configs
+    guess, _ = parse_ntm_spec(header + "q0,_ -> q0,0,R\nq0,_ -> q0,1,R")
+    found = guess.explore("", max_steps=100, max_configs=5000)
+    assert found.result == 'MAX_CONFIGS' and found.configs == 5001
+
+    assert "apenas uma fita" in parse_ntm_spec(header + "q0,0,0 -> q0,0,0,R,R")[1]
+
+    print(f"✅ Busca não determinística com deduplicação funcionando!")
+    return True
+
+
+def test_specialize():
+    """Testa a função gerada por specialize() contra run()"""
+    print("\n=== Testando ESPECIALIZAÇÃO ===")
+
+    import benchmark
+    machines = list(EXAMPLES.items()) + [(k, v[0]) for k, v in benchmark.BUSY_BEAVERS.items()]
+    for name, spec in machines:
+        for input_string in ["", "0", "01", "0011", "0110", "111+11", "1#11"]:
+            for max_steps in (1, 5, 300):
+                ref, _ = parse_spec(spec)
+                fast, _ = parse_spec(spec)
+                ref.reset(input_string)
+                fast.reset(input_string)
+                expected = ref.run(max_steps)
+                assert fast.run(max_steps, specialized=True) == expected, (name, input_string)
+                assert _snapshot(fast) == _snapshot(ref), (name, input_string)
+
+            sliced, _ = parse_spec(spec)
+            sliced.reset(input_string)
+            steps = 0
+            while not sliced.halted and steps < 300:
+                steps += sliced.run(min(13, 300 - steps), halt_on_limit=False, specialized=True)
+            assert sliced.current_state == ref.current_state and sliced.head == ref.head
+            assert dict(sliced.tape.items()) == dict(ref.tape.items())
+
+    tm, _ = parse_spec(benchmark.BUSY_BEAVERS["BB(4)"][0])
+    tm.reset("")
+    fn = tm.specialize()
+    assert fn is tm.specialize()
+    assert "def run(tape, head, max_steps, state=None):" in fn.source
+    assert "# 'A'" in fn.source
+    steps, state, head, result = fn(tm.tape, tm.head, 1000)
+    assert (steps, result) == (108, 'ACCEPT') and fn.compiled.states[state] == 'H'
+
+    print(f"✅ Código especializado confere com run()!")
+    print(f"   BB(4): {len(fn.source.splitlines())} linhas geradas")
+    return True
+
+
+def test_lockstep():
+    """Testa a execução vetorizada contra run() em cada entrada"""
+    print("\n=== Testando EXECUÇÃO VETORIZADA ===")
+
+    from core import vectorized
+    if vectorized.np is None:
+        print("⚠️ numpy não instalado, teste ignorado")
+        return True
+
+    inputs = ["", "0", "1", "01", "10", "0011", "0110", "111+11", "1#11", "10x1", "000111"]
+    for name, spec in EXAMPLES.items():
+        for max_steps in (1, 5, 200):
+            found = vectorized.run_lockstep(spec, inputs, max_steps)
+            tapes = found.tape_strings()
+            for i, input_string in enumerate(inputs):
+                tm, _ = parse_spec(spec)
+                tm.reset(input_string)
+                steps = tm.run(max_steps)
+                assert found.steps[i] == steps, (name, input_string, max_steps)
+                assert found.results[i] == tm.result, (name, input_string, max_steps)
+                assert found.heads[i] == tm.head, (name, input_string, max_steps)
+                assert found.compiled.states[found.states[i]] == tm.current_state
+                start, cells = tm.tape.span(trim=True)
+                expected = ''.join(tm.tape.get(j, tm.blank) for j in range(start, start + len(cells)))
+                assert tapes[i] == expected, (name, input_string, max_steps)
+
+    found = vectorized.run_lockstep(list(EXAMPLES.values())[0], [], 10)
+    assert found.steps.shape == (0,)
+
+    print(f"✅ Execução vetorizada confere com run()!")
+    return True
+
+
+def test_macro_machine():
+    """Testa a simulação em blocos contra run()"""
+    print("\n=== Testando MACRO MÁQUINA ===")
+
+    import benchmark
+    from core.macro import MacroSimulator
+    machines = list(EXAMPLES.items()) + [(k, v[0]) for k, v in benchmark.BUSY_BEAVERS.items()]
+    for name, spec in machines:
+        for input_string in ["", "0", "0011", "0110" * 5, "111+11"]:
+            for max_steps in (1, 37, 2000):
+                ref, _ = parse_spec(spec)
+                ref.reset(input_string)
+                expected = ref.run(max_steps)
+                for block_size, maxsize in ((1, 100), (3, 100), (8, 2)):
+                    tm, _ = parse_spec(spec)
+                    tm.reset(input_string)
+                    sim = MacroSimulator(block_size, maxsize)
+                    assert tm.run(max_steps, macro=sim) == expected, (name, input_string, block_size)
+                    assert _snapshot(tm) == _snapshot(ref), (name, input_string, block_size)
+                    assert len(sim._memo) <= maxsize
+
+    # Em fatias, reaproveitando o memo
+    spec, shifts, ones = benchmark.BUSY_BEAVERS["BB(5)"]
+    tm, _ = parse_spec(spec)
+    tm.reset("")
+    sim = MacroSimulator(6)
+    steps = 0
+    while not tm.halted:
+        steps += tm.run(10 ** 7, macro=sim, halt_on_limit=False)
+    assert steps == shifts + 1 and tm.result == 'ACCEPT'
+    assert sum(1 for sym in tm.tape.values() if sym == '1') == ones
+    stats = sim.stats()
+    assert stats['hit_rate'] > 0.99 and stats['hits'] + stats['misses'] < steps // 100
+
+    print(f"✅ Macro máquina confere com run()!")
+    print(f"   BB(5): {steps} passos com {stats['hits'] + stats['misses']} consultas ao memo")
+    return True
+
+
+def test_delta():
+    """Testa as respostas delta contra o estado completo da máquina"""
+    print("\n=== Testando DELTA ===")
+
+    from core.macro import MacroSimulator
+
+    def apply(client, d):
+        if d['full']:
+            client.clear()
+        for i, sym in d['cells']:
+            client[i] = sym
+        return d['version']
+
+    for name, spec in EXAMPLES.items():
+        for options in ({}, {'rle': True}, {'macro': MacroSimulator(4)}, {'specialized': True}):
+            tm, _ = parse_spec(spec)
+            tm.reset("0110+11")
+            client = {}
+            version = apply(client, tm.delta(-1))
+            assert client == dict(tm.tape.items())
+            while not tm.halted:
+                tm.run(3, halt_on_limit=False, **options)
+                tm.step()
+                d = tm.delta(version)
+                assert not d['full'] and len(d['cells']) <= 4
+                version = apply(client, d)
+                cells = {i: sym for i, sym in client.items() if sym != tm.blank}
+                assert cells == dict(tm.tape.items()), (name, options)
+                assert (d['head'], d['current_state'], d['result']) == (tm.head, tm.current_state, tm.result)
+            assert tm.delta(version)['cells'] == [] and tm.run(5) == 0
+
+    # Sem alterações, versão futura, reset e janela
+    tm, _ = parse_spec("states: q0,qa\nblank: _\nstart: q0\naccept: qa\nreject: qa\ntransitions:\nq0,0 -> q0,1,R\nq0,_ -> qa,_,N")
+    tm.reset("0011")
+    v = tm.delta(0)['version']
+    assert tm.delta(v) == dict(tm.delta(v), full=False, cells=[])
+    assert tm.delta(v + 1)['full']
+    tm.run(1, halt_on_limit=False)
+    assert tm.delta(v)['cells'] == [[0, '1']]
+    assert tm.delta(v, window=(1, 3))['cells'] == []
+    tm.reset("1")
+    d = tm.delta(v)
+    assert d['full'] and d['cells'] == [[0, '1']]
+    assert tm.delta(d['version'], window=(5, 9))['cells'] == []
+    assert TuringMachine.from_dict(tm.to_dict()).version == tm.version
+
+    # Mapa de alterações limitado: versões anteriores às descartadas recebem a fita completa
+    tm, _ = parse_spec("states: q0,qa\nblank: _\nstart: q0\naccept: qa\nreject: qa\n"
+                       "transitions:\nq0,_ -> q0,1,R")
+    tm.reset("")
+    tm.track_changes(limit=8)
+    first = tm.version
+    versions = [first]
+    client = {}
+    for _ in range(20):
+        tm.run(3, halt_on_limit=False)
+        d = tm.delta(versions[-1])
+        assert not d['full'] and len(tm._dirty) <= 8
+        apply(client, d)
+        versions.append(d['version'])
+    assert client == dict(tm.tape.items()) and len(client) == 60
+    d = tm.delta(first)
+    assert d['full'] and len(d['cells']) == 60
+    recent = tm.delta(versions[-2])
+    assert not recent['full'] and recent['cells'] == [[i, '1'] for i in range(57, 60)]
+
+    print(f"✅ Deltas reconstroem a fita completa!")
+    return True
+
+
+def test_tape_export():
+    """Testa limites da fita, tape_string() e iter_tape()"""
+    print("\n=== Testando EXPORTAÇÃO DA FITA ===")
+
+    import time
+    import types
+    from core.batch import _tape_output
+
+    for name, spec in EXAMPLES.items():
+        tm, _ = parse_spec(spec)
+        tm.reset("0110+11")
+        tm.run(500)
+        cells = sorted(tm.tape.items())
+        bounds = tm.tape_bounds()
+        assert bounds == ((cells[0][0], cells[-1][0]) if cells else None), name
+        if bounds:
+            expected = ''.join(tm.tape.get(i, tm.blank) for i in range(bounds[0], bounds[1] + 1))
+            assert tm.tape_string() == expected, name
+            assert list(tm.iter_tape()) == list(enumerate(expected, bounds[0]))
+        assert tm.tape_string(-3, 2) == ''.join(tm.tape.get(i, tm.blank) for i in range(-3, 3))
+        assert _tape_output(tm) == tm.tape_string()
+
+    tm, _ = parse_spec(list(EXAMPLES.values())[0])
+    tm.reset("")
+    assert tm.tape_bounds() is None and tm.tape_string() == '' and list(tm.iter_tape()) == []
+    assert tm.tape_string(-1, 1) == tm.blank * 3
+
+    # Limites com margens em branco nos dois buffers e símbolos só de um lado
+    tape = Tape('_', symbols='abc')
+    tape[-7000] = 'c'
+    tape[-3] = 'a'
+    tape.right.extend(bytes(100000))
+    assert tape.bounds() == (-7000, -3)
+    del tape[-7000]
+    tape[90000] = 'b'
+    assert tape.bounds() == (-3, 90000)
+    del tape[-3]
+    assert tape.bounds() == (90000, 90000)
+    del tape[90000]
+    assert tape.bounds() is None
+
+    # Fita de 10^6 células: uma cópia contígua
+    tm.reset("01" * 500000)
+    tm.tape[-5] = '1'
+    start = time.perf_counter()
+    text = tm.tape_string()
+    elapsed = time.perf_counter() - start
+    assert tm.tape_bounds() == (-5, 999999) and text == '1' + tm.blank * 4 + "01" * 500000
+    assert isinstance(tm.iter_tape(), types.GeneratorType)
+    assert next(tm.iter_tape(999998)) == (999998, '0')
+
+    print(f"✅ Fita exportada corretamente!")
+    print(f"   10^6 células em {elapsed * 1000:.1f} ms")
+    return True
+
+
+def test_analysis():
+    """Testa a análise estática e a poda da especificação"""
+    print("\n=== Testando ANÁLISE ESTÁTICA ===")
+
+    from core.analysis import analyze
+
+    spec = """
+states: q0,q1,qdead,qaccept,qreject
+blank: _
+start: q0
+accept: qaccept
+reject: qreject
+transitions:
+q0,0 -> q0,0,R
+q0,1 -> q1,1,R
+q0,_ -> qaccept,_,N
+q1,1 -> qtail,x,R
+qtail,_ -> qreject,_,N
+qdead,0 -> qdead,y,L
+qaccept,0 -> q0,0,R
+"""
+    tm, _ = parse_spec(spec)
+    report = analyze(tm)
+    assert report.reachable == {'q0', 'q1', 'qtail', 'qaccept', 'qreject'}
+    assert report.unreachable == {'qdead'} and report.undeclared == {'qtail'}
+    assert sorted(report.dead_transitions) == [('qaccept', '0'), ('qdead', '0')]
+    assert report.halting_only == {'q1', 'qtail'}
+    assert report.symbols == {'_', '0', '1', 'x'}
+    assert ('q1', '0') in report.no_transition and ('q0', 'x') in report.no_transition
+    assert len(report.warnings()) == 3
+    json.dumps(report.to_dict())
+
+    pruned, _ = parse_spec(spec, prune=True)
+    assert len(pruned.transitions) == 5 and 'qdead' not in pruned.states
+    assert 'y' not in pruned.tape_symbols and 'qtail' in pruned.states
+
+    # Mesmos resultados e passos em todos os exemplos
+    for name, example in list(EXAMPLES.items()) + [("spec", spec)]:
+        tm, _ = parse_spec(example)
+        pruned, _ = parse_spec(example, prune=True)
+        assert analyze(pruned).dead_transitions == []
+        for input_string in ["", "0", "1", "011", "0110", "1010", "111+11", "0011"]:
+            tm.reset(input_string)
+            pruned.reset(input_string)
+            assert tm.run(300) == pruned.run(300), (name, input_string)
+            assert (tm.result, tm.head, dict(tm.tape.items())) == \
+                (pruned.result, pruned.head, dict(pruned.tape.items())), (name, input_string)
+
+    print(f"✅ Análise estática e poda funcionando!")
+    print(f"   Avisos: {report.warnings()}")
+    return True
+
+
+def test_minimize():
+    """Testa a minimização de estados contra a máquina original"""
+    print("\n=== Testando MINIMIZAÇÃO ===")
+
+    import benchmark
+
+    # Paridade com cada estado duplicado: e0/e1 e suas cópias alternam
+    spec = """
+states: e0,e1,f0,f1,ok,ok2,no,no2,lost
+blank: _
+start: e0
+accept: ok,ok2
+reject: no,no2
+transitions:
+e0,0 -> f0,0,R
+e0,1 -> f1,1,R
+e0,_ -> ok,_,N
+f0,0 -> e0,0,R
+f0,1 -> e1,1,R
+f0,_ -> ok2,_,N
+e1,0 -> f1,0,R
+e1,1 -> f0,1,R
+e1,_ -> no,_,N
+f1,0 -> e1,0,R
+f1,1 -> e0,1,R
+f1,_ -> no2,_,N
+lost,0 -> lost,0,R
+"""
+    tm, _ = parse_spec(spec)
+    small, report = tm.minimize()
+    assert small.states == {'e0', 'e1', 'ok', 'no'}
+    assert small.accept_states == {'ok'} and small.reject_states == {'no'}
+    assert (report.states_removed, report.transitions_removed) == (5, 7)
+    assert report.merged['f1'] == 'e1' and report.to_dict()['states_after'] == 4
+
+    machines = list(EXAMPLES.items()) + [(k, v[0]) for k, v in benchmark.BUSY_BEAVERS.items()]
+    for name, example in machines + [("spec", spec)]:
+        tm, _ = parse_spec(example)
+        small, report = tm.minimize()
+        again, second = small.minimize()
+        assert second.states_removed == 0 and second.transitions_removed == 0, name
+        for input_string in ["", "0", "1", "011", "0110", "1010", "111+11", "0011"]:
+            tm.reset(input_string)
+            small.reset(input_string)
+            assert tm.run(2000) == small.run(2000), (name, input_string)
+            assert tm.result == small.result, (name, input_string)
+            assert (tm.head, dict(tm.tape.items())) == (small.head, dict(small.tape.items()))
+            assert report.merged[tm.current_state] == small.current_state
+
+    print(f"✅ Minimização preserva resultados e passos!")
+    return True
+
+
+def test_enumerate_language():
+    """Testa a enumeração da linguagem contra reset()/run() em cada palavra"""
+    print("\n=== Testando ENUMERAÇÃO DA LINGUAGEM ===")
+
+    from itertools import product
+    from core.language import enumerate_language
+
+    for name, spec in EXAMPLES.items():
+        for max_length, max_steps in ((0, 10), (5, 3), (6, 150)):
+            found = enumerate_language(spec, max_length, max_steps, workers=1, chunk_size=16)
+            tm, _ = parse_spec(spec)
+            expected = {}
+            for length in range(max_length + 1):
+                for word in product(found.alphabet, repeat=length):
+                    word = ''.join(word)
+                    tm.reset(word)
+                    steps = tm.run(max_steps)
+                    expected[word] = (tm.result, steps)
+            assert found.records == expected, (name, max_length, max_steps)
+            assert found.accepted == sorted((w for w, r in expected.items() if r[0] == 'ACCEPT'),
+                                            key=lambda w: (len(w), w))
+
+    # Reaproveitamento de prefixos e workers
+    spec = EXAMPLES["5. Aceita 0^n1^n (mesma qtd 0 e 1)"]
+    found = enumerate_language(spec, 10, 400, alphabet="01", workers=1)
+    assert found.accepted == ['', '01', '0101', '010101', '01010101', '0101010101']
+    assert found.nodes == 11 and len(found.records) == 2047
+    spec = EXAMPLES["3. Duplicador (0 -> 00, 1 -> 11)"]
+    serial = enumerate_language(spec, 7, 400, workers=1, chunk_size=8)
+    parallel = enumerate_language(spec, 7, 400, workers=2, chunk_size=8)
+    assert serial.tasks > 0 and serial.records == parallel.records
+    assert enumerate_language(spec, 3, 10, alphabet=['1'], workers=1).alphabet == ['1']
+
+    print(f"✅ Enumeração confere com run()!")
+    print(f"   Exemplo 5 até 10 símbolos: {len(found.records)} palavras, {found.nodes} prefixos simulados")
+    return True
+
+
+def test_sessions():
+    """Testa o armazenamento de sessões e o servidor HTTP"""
+    print("\n=== Testando SESSÕES ===")
+
+    import threading
+    import urllib.error
+    import urllib.request
+    from core.sessions import SessionNotFound, SessionStore, machine_size
+    import server
+
+    spec = list(EXAMPLES.values())[0]
+
+    def new_machine(input_string="0011"):
+        tm, _ = parse_spec(spec)
+        tm.reset(input_string)
+        return tm
+
+    # TTL com relógio controlado
+    now = [0.0]
+    store = SessionStore(ttl=10, clock=lambda: now[0])
+    a = store.create(new_machine())
+    now[0] = 5
+    with store.use(a) as tm:
+        tm.run(1, halt_on_limit=False)
+    now[0] = 14
+    assert store.stats()['sessions'] == 1
+    now[0] = 16
+    try:
+        with store.use(a):
+            pass
+        assert False, "sessão expirada ainda acessível"
+    except SessionNotFound:
+        pass
+    assert store.expired == 1 and store.bytes == 0
+
+    # LRU por número de sessões e por memória estimada
+    store = SessionStore(max_sessions=2)
+    a, b = store.create(new_machine()), store.create(new_machine())
+    with store.use(a):
+        pass
+    c = store.create(new_machine())
+    assert len(store) == 2 and store.evictions == 1
+    assert not store.delete(b) and store.delete(a) and store.delete(c)
+    assert store.bytes == 0
+
+    size = machine_size(new_machine())
+    store = SessionStore(max_bytes=size * 3)
+    ids = [store.create(new_machine()) for _ in range(5)]
+    assert len(store) == 3 and store.bytes <= size * 3
+    with store.use(ids[-1]) as tm:
+        tm.tape[100000] = '1'
+    assert len(store) == 1
+
+    # O mapa de alterações, a tabela compilada e as estatísticas entram na
+    # estimativa, remedida a cada use()
+    from core.sessions import DIRTY_ENTRY_BYTES
+    store = SessionStore(max_bytes=size * 10)
+    a, b = store.create(new_machine()), store.create(new_machine())
+    with store.use(b) as tm:
+        tm.track_changes()
+        for i in range(size // 10):
+            tm.tape[i] = '1'
+        tm._touch(range(size // 10))
+        assert machine_size(tm) >= size + DIRTY_ENTRY_BYTES * (size // 10)
+    assert len(store) == 1 and store.evictions == 1 and store.bytes == machine_size(tm)
+    before = machine_size(tm)
+    with store.use(b) as tm:
+        tm.run(5, collect_stats=True)
+    assert machine_size(tm) > before and store.bytes == machine_size(tm)
+
+    # `span` acima do limite é reduzido a MAX_SPAN
+    api = server.TuringApi(SessionStore())
+    body = api.route_session({'spec': spec, 'input': '0011', 'span': 10 ** 9})
+    assert len(body['machine']['window']) == 2 * server.MAX_SPAN + 1
+    body = api.route_state({'session': body['session'], 'span': 10 ** 12})
+    assert len(body['machine']['window']) == 2 * server.MAX_SPAN + 1
+    assert api.route_state({'session': body['session'], 'span': -5})['machine']['window'] == []
+
+    # Ida e volta pelo HTTP
+    httpd = server.make_server(port=0, max_steps_per_request=50)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{httpd.server_address[1]}/api/"
+
+    def call(route, body=None):
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        try:
+            with urllib.request.urlopen(url + route, data) as resp:
+                return resp.status, json.loads(resp.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    try:
+        status, body = call('session', {'spec': spec, 'input': '0011', 'span': 2})
+        assert status == 200 and body['success'] and len(body['machine']['window']) == 5
+        session = body['session']
+        status, body = call('step', {'session': session, 'steps': 3})
+        assert body['steps_executed'] == 3 and not body['machine']['halted']
+        status, body = call('run', {'session': session, 'max_steps': 10 ** 9})
+        assert body['machine']['halted'] and body['machine']['result'] == 'ACCEPT'
+        ref = new_machine()
+        assert body['steps_executed'] + 3 == ref.run(1000)
+        status, body = call('state', {'session': session, 'since': body['machine']['version']})
+        assert body['delta']['cells'] == [] and body['delta']['halted']
+        assert call('stats')[1]['stats']['sessions'] == 1
+        assert call('close', {'session': session})[0] == 200
+        assert call('step', {'session': session})[0] == 404
+        assert call('session', {'spec': 'states: q0'})[0] == 400
+        assert call('nada', {})[0] == 404
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+    print(f"✅ Sessões e servidor HTTP funcionando!")
+    return True
+
+
+def test_tape_view():
+    """Testa que os patches do TapeView reproduzem a renderização completa"""
+    print("\n=== Testando TAPE VIEW ===")
+
+    import re
+    from tape_view import TapeView, render_tape_html
+
+    def parse_html(html):
+        cells = {int(i): sym for _, i, sym in re.findall(
+            r'<div class="(cell(?: head)?)" data-i="(-?\d+)">(.*?)</div>', html)}
+        head = [int(i) for i in re.findall(r'<div class="cell head" data-i="(-?\d+)">', html)]
+        info = dict(re.findall(r'data-field="(\w+)">(.*?)</span>', html))
+        color = re.search(r'border-color: (#\w+);', html).group(1)
+        return cells, head, info, color
+
+    def apply_patch(client, patch):
+        # Mesmo algoritmo de APPLY_TAPE_PATCH_JS
+        p = json.loads(patch)
+        cells = {i: sym for i, sym in client[0].items() if p['left'] <= i <= p['right']}
+        for i in range(p['left'], p['right'] + 1):
+            cells.setdefault(i, '')
+        cells.update({int(i): sym for i, sym in p['cells'].items()})
+        info = dict(client[2], **p.get('info', {}))
+        return cells, [p['head']], info, p.get('color', client[3])
+
+    tm, err = parse_spec(list(EXAMPLES.values())[1])
+    assert err is None, err
+    tm.reset("0110")
+    view = TapeView()
+    html, patch = view.update(tm, 4, 36)
+    assert patch == "" and html == render_tape_html(tm, 4, 36)
+    client = parse_html(html)
+
+    patches = steps = 0
+    while not tm.halted:
+        steps += tm.run(2, halt_on_limit=False)
+        html, patch = view.update(tm, 4, 36)
+        assert html is None
+        client = apply_patch(client, patch)
+        expected = parse_html(render_tape_html(tm, 4, 36))
+        assert client == expected, (steps, patch, client, expected)
+        patches += 1
+    assert patches > 3 and tm.result == 'ACCEPT'
+
+    # Sem mudanças o patch vem vazio; outra largura volta ao HTML completo
+    assert json.loads(view.update(tm, 4, 36)[1])['cells'] == {}
+    html, patch = view.update(tm, 6, 36)
+    assert patch == "" and html == render_tape_html(tm, 6, 36)
+
+    print(f"✅ Patches incrementais iguais à renderização completa!")
+    return True
+
+
+def test_frame_pacer():
+    """Testa o agrupamento de passos por quadro com um relógio sintético"""
+    print("\n=== Testando FRAME PACER ===")
+
+    from tape_view import FramePacer
+
+    def play(pacer, costs):
+        # Cada quadro leva `pacer.batch` passos e custa `costs[i]` segundos
+        frames, clock = [], 0.0
+        for cost in costs:
+            batch = pacer.batch
+            wait = pacer.frame_done(cost)
+            clock += cost + wait
+            frames.append((batch, round(wait, 6)))
+        return frames, clock
+
+    # Quadros baratos: 10 quadros/s com 100 passos cada, esperando o resto do intervalo
+    frames, clock = play(FramePacer(speed=1000, fps=10), [0.02] * 10)
+    assert frames == [(100, 0.08)] * 10 and abs(clock - 1.0) < 1e-9
+
+    # Quadros de 0.5 s: a taxa cai para 2 quadros/s e cada um leva 500 passos
+    frames, clock = play(FramePacer(speed=1000, fps=10), [0.5] * 10)
+    assert frames[0] == (100, 0.0) and frames[1:] == [(500, 0.0)] * 9
+    assert sum(b for b, _ in frames[1:]) / (clock - 0.5) == 1000
+
+    # Um quadro lento isolado aumenta o lote só até a média suavizada voltar
+    frames, _ = play(FramePacer(speed=1000, fps=10), [0.02, 0.02, 0.4, 0.02, 0.02, 0.02])
+    assert [b for b, _ in frames] == [100, 100, 100, 134, 100, 100]
+    assert [w for _, w in frames] == [0.08, 0.08, 0.0, 0.08, 0.08, 0.08]
+
+    # Velocidade abaixo da taxa de quadros: um passo por quadro, 5 quadros/s
+    frames, clock = play(FramePacer(speed=5, fps=30), [0.01] * 5)
+    assert frames == [(1, 0.19)] * 5 and abs(clock - 1.0) < 1e-9
+
+    print(f"✅ Quadros agrupados na velocidade pedida!")
+    return True
+
+
 def run_all_tests():
     """Executa todos os testes"""
     print("🧪 Iniciando testes das APIs...\n")
@@ -179,6 +1387,32 @@ def run_all_tests():
         ("Run", test_run),
         ("Examples", test_examples),
         ("Serialization", test_serialization),
+        ("Compiled run", test_compiled_run),
+        ("Run in slices", test_run_in_slices),
+        ("Tape", test_tape),
+        ("Tape export", test_tape_export),
+        ("RLE run", test_rle_run),
+        ("Loop detection", test_loop_detection),
+        ("Run batch", test_run_batch),
+        ("Result cache", test_result_cache),
+        ("Run stats", test_run_stats),
+        ("Spec cache", test_spec_cache),
+        ("Analysis", test_analysis),
+        ("Minimize", test_minimize),
+        ("Enumerate language", test_enumerate_language),
+        ("Parse stream", test_parse_spec_stream),
+        ("Binary snapshot", test_binary_snapshot),
+        ("Trace recorder", test_trace_recorder),
+        ("Benchmark", test_benchmark_suite),
+        ("Multi-tape", test_multitape),
+        ("Nondeterministic", test_nondeterministic),
+        ("Specialize", test_specialize),
+        ("Lockstep", test_lockstep),
+        ("Macro machine", test_macro_machine),
+        ("Sessions", test_sessions),
+        ("Delta", test_delta),
+        ("Tape view", test_tape_view),
+        ("Frame pacer", test_frame_pacer),
     ]
 
     results = []